@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.contrib.auth.models import Group, Permission
+
+        from accounts.models import User
+        from accounts.permissions import invalidate
+
+        # Every write that can change what a user may do, including the admin
+        # and the shell, drops the cached permission sets.
+        for through in (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        ):
+            m2m_changed.connect(invalidate, sender=through, dispatch_uid=through.__name__)
+        for model in (Group, Permission):
+            post_save.connect(invalidate, sender=model, dispatch_uid=f"save-{model.__name__}")
+            post_delete.connect(invalidate, sender=model, dispatch_uid=f"delete-{model.__name__}")
+        post_migrate.connect(invalidate, dispatch_uid="permissions-migrate")
@@ -0,0 +1,101 @@
+"""
+Cross-request cache of model permissions.
+
+``ModelBackend`` resolves a user's permissions through the group and
+permission tables on every request, because its cache lives on the user
+instance. ``CachedModelBackend`` keeps each user's permission set in the
+Django cache instead, under a global permission version. Any change to
+groups, permissions or their assignments (connected in
+``AccountsConfig.ready``) calls ``invalidate``, which gives everything a new
+version, so stale sets are never read again and simply expire. It does so
+at once and again when the transaction commits: a request in between still
+reads the old assignments and would otherwise cache them under the new
+version.
+
+The catalog served by ``AccountViewSet.contenttypes``/``groups``/
+``permissions`` is cached under the same version.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+
+VERSION_KEY = "permissions-version"
+
+
+def permissions_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # ``add`` keeps a version another process set meanwhile.
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, timeout=None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def bump():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate(*args, using=DEFAULT_DB_ALIAS, **kwargs):
+    """New permission version; takes any arguments so it can be a signal receiver."""
+    bump()
+    transaction.on_commit(bump, using=using)
+
+
+def user_permissions(user):
+    """``"app_label.codename"`` of every permission ``user`` has directly or through groups."""
+    key = f"permissions:{user.pk}:{permissions_version()}"
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = {
+            f"{app_label}.{codename}"
+            for app_label, codename in Permission.objects.filter(
+                Q(user=user) | Q(group__user=user)
+            )
+            .values_list("content_type__app_label", "codename")
+            .distinct()
+        }
+        cache.set(key, permissions, timeout=settings.PERMISSIONS_CACHE_TIMEOUT)
+    return permissions
+
+
+def catalog():
+    """Serialized content types, groups and permissions for the account forms."""
+    from accounts.serializers import (
+        ContentTypeSerializer,
+        GroupSerializer,
+        PermissionSerializer,
+    )
+
+    key = f"permissions-catalog:{permissions_version()}"
+    data = cache.get(key)
+    if data is None:
+        data = {
+            "contenttypes": ContentTypeSerializer(ContentType.objects.all(), many=True).data,
+            "groups": GroupSerializer(
+                Group.objects.prefetch_related("permissions"), many=True
+            ).data,
+            "permissions": PermissionSerializer(Permission.objects.all(), many=True).data,
+        }
+        cache.set(key, data, timeout=settings.PERMISSIONS_CACHE_TIMEOUT)
+    return data
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose per-user permission set comes from ``user_permissions``."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if user_obj.is_superuser:
+            return super().get_all_permissions(user_obj, obj)
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = user_permissions(user_obj)
+        return user_obj._perm_cache
@@ -0,0 +1,51 @@
+"""
+Lean ``/me``: token claims plus a cached profile snapshot.
+
+The SPA asks for the current user on every route change. The snapshot (what
+``AccountReadSerializer`` returns) is cached under an ETag built from the
+user's ``modified`` and ``last_login`` timestamps (logging in saves only
+``last_login``) and the permission version (``accounts.permissions``), all
+known without touching the database once the request is authenticated. The full read only happens when one of them
+changes, and clients sending ``If-None-Match`` get a bodiless 304.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.permissions import permissions_version
+from authentication.serializers import user_claims
+
+
+def profile_etag(user):
+    last_login = user.last_login.isoformat() if user.last_login else ""
+    version = f"{user.pk}:{user.modified.isoformat()}:{last_login}:{permissions_version()}"
+    return '"{}"'.format(hashlib.md5(version.encode()).hexdigest())
+
+
+def profile_snapshot(user, etag, context):
+    """``AccountReadSerializer`` data of ``user``, cached under ``etag``."""
+    from accounts.models import User
+    from accounts.serializers import AccountReadSerializer
+
+    key = f"profile:{user.pk}:{etag}"
+    data = cache.get(key)
+    if data is None:
+        user = User.objects.prefetch_related("groups", "user_permissions").get(pk=user.pk)
+        data = dict(AccountReadSerializer(user, context=context).data)
+        cache.set(key, data, timeout=settings.PERMISSIONS_CACHE_TIMEOUT)
+    return data
+
+
+def token_claims(request):
+    """Claims of the request's access token, or the same fields from the user."""
+    claims = user_claims(request.user)
+    payload = getattr(request.auth, "payload", None)
+    if payload is None or not set(claims) - {"id"} <= set(payload):
+        # Session login, or a token issued before the claims were added.
+        return claims
+    return {
+        name: payload[api_settings.USER_ID_CLAIM if name == "id" else name] for name in claims
+    }
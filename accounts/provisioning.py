@@ -0,0 +1,89 @@
+"""
+Bulk account provisioning.
+
+Creating accounts one at a time through ``AccountSerializer`` costs a
+password hash (the KDF, slow by design) and five writes per user: the
+insert, a save after ``set_password``, the two M2M ``set`` calls and a final
+save. ``provision`` hashes every password before opening a transaction,
+inserts the users with ``bulk_create`` in batches and links groups and
+permissions with one insert per through table and batch.
+
+Hashing runs in the calling process unless ``processes`` asks for a pool.
+Only the ``provisionaccounts`` command does: forking a web worker, with its
+threads and open database and cache sockets, is unsafe, and a pool per
+request would let one caller occupy every core.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from accounts.models import User
+from accounts.permissions import invalidate
+
+
+def init_worker():
+    # Forked workers inherit the set-up project; spawned ones start bare.
+    if not apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, processes=None):
+    """
+    ``make_password`` of every password (``None`` gives an unusable one),
+    spread over ``processes`` worker processes (all cores by default).
+    """
+    passwords = list(passwords)
+    processes = min(processes or os.cpu_count() or 1, len(passwords))
+    if processes <= 1:
+        return [make_password(password) for password in passwords]
+    # A few chunks per worker keeps them busy without a round trip per hash.
+    chunksize = max(1, len(passwords) // (processes * 4))
+    with ProcessPoolExecutor(processes, initializer=init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def provision(accounts, batch_size=None, processes=1, using=DEFAULT_DB_ALIAS):
+    """
+    Create a user for every dict in ``accounts``: ``User`` field values plus
+    ``password`` and the ``groups``/``user_permissions`` ids, hashing on
+    ``processes`` processes (``None`` for all cores). Returns the created
+    users.
+    """
+    batch_size = batch_size or settings.ACCOUNTS_BULK_BATCH_SIZE
+    accounts = [dict(account) for account in accounts]
+    passwords = hash_passwords([account.pop("password", None) for account in accounts], processes)
+    groups = [set(account.pop("groups", [])) for account in accounts]
+    permissions = [set(account.pop("user_permissions", [])) for account in accounts]
+
+    GroupLink = User.groups.through
+    PermissionLink = User.user_permissions.through
+    with transaction.atomic(using):
+        users = User.objects.using(using).bulk_create(
+            [User(password=password, **account) for account, password in zip(accounts, passwords)],
+            batch_size=batch_size,
+        )
+        GroupLink.objects.using(using).bulk_create(
+            [
+                GroupLink(user_id=user.pk, group_id=group)
+                for user, ids in zip(users, groups)
+                for group in ids
+            ],
+            batch_size=batch_size,
+        )
+        PermissionLink.objects.using(using).bulk_create(
+            [
+                PermissionLink(user_id=user.pk, permission_id=permission)
+                for user, ids in zip(users, permissions)
+                for permission in ids
+            ],
+            batch_size=batch_size,
+        )
+    # Through-table inserts send no m2m_changed.
+    invalidate(using=using)
+    return users
@@ -1,9 +1,15 @@
+from collections import Counter
+
 from rest_framework import serializers
 
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import Permission, Group
 
+from accounts.models import ROLE_CHOICES
+from organizations.models import Organization
+
 User = get_user_model()
 
 
@@ -100,3 +106,49 @@ class AccountReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         exclude = ["password"]
+
+
+class AccountBulkListSerializer(serializers.ListSerializer):
+    """Checks usernames and related ids of the whole upload in one query each."""
+
+    def validate(self, attrs):
+        usernames = Counter(account["username"] for account in attrs)
+        repeated = [name for name, count in usernames.items() if count > 1]
+        existing = User.objects.filter(username__in=usernames).values_list("username", flat=True)
+        taken = sorted({*repeated, *existing})
+        if taken:
+            raise serializers.ValidationError({"username": [_("Taken or repeated: %s") % taken]})
+        for name, model in (
+            ("organization", Organization),
+            ("groups", Group),
+            ("user_permissions", Permission),
+        ):
+            ids = set()
+            for account in attrs:
+                value = account.get("organization_id" if name == "organization" else name, [])
+                ids.update(value if isinstance(value, list) else [value])
+            unknown = ids - set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+            if unknown:
+                raise serializers.ValidationError({name: [_("Unknown ids: %s") % sorted(unknown)]})
+        return attrs
+
+
+class AccountBulkSerializer(serializers.Serializer):
+    """
+    One account of ``POST /api/v1/accounts/bulk/``. Related objects are plain
+    ids so a large upload checks them in one query, not one per row.
+    """
+
+    username = serializers.CharField(max_length=150)
+    password = serializers.CharField(write_only=True, required=False)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    phone = serializers.CharField(max_length=140, required=False, allow_null=True)
+    organization = serializers.IntegerField(source="organization_id")
+    role = serializers.ChoiceField(choices=ROLE_CHOICES, default="observer")
+    groups = serializers.ListField(child=serializers.IntegerField(), required=False)
+    user_permissions = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        list_serializer_class = AccountBulkListSerializer
@@ -3,7 +3,11 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission, update_last_login
+from django.core.cache import cache
 
+from accounts import provisioning
+from authentication.serializers import CustomTokenObtainPairSerializer
 from accounts.factories import UserFactory, AdminUserFactory, ObserverUserFactory
 from organizations.factories import OrganizationFactory
 
@@ -14,10 +18,12 @@ User = get_user_model()
 class TestAccountAPI:
     """Tests API CRUD para AccountViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
+        cache.clear()
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/accounts/"
 
@@ -29,7 +35,7 @@ class TestAccountAPI:
         response = self.client.get(self.base_url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data["results"]) == 4  # 3 + admin_user
+        assert len(response.data["results"]) == 5  # 3 + admin y observador sembrados
         assert "results" in response.data
         assert "count" in response.data
 
@@ -213,6 +219,17 @@ class TestAccountAPI:
         assert isinstance(response.data, list)
         assert len(response.data) > 0
 
+    def test_groups_action_follows_changes(self):
+        """Test el catálogo en caché refleja los grupos nuevos"""
+        cache.clear()
+        url = f"{self.base_url}groups/"
+        self.client.get(url)
+
+        group = Group.objects.create(name="observadores")
+        response = self.client.get(url)
+
+        assert [item["id"] for item in response.data] == [group.id]
+
     def test_create_account_validation_errors(self):
         """Test validaciones en creación"""
         # Datos inválidos - username ya existe
@@ -249,3 +266,140 @@ class TestAccountAPI:
         assert len(response.data["results"]) == 2
         for user in response.data["results"]:
             assert user["organization"]["id"] == org1.id
+
+
+@pytest.mark.django_db
+class TestAccountBulkAPI:
+    """Tests del alta masiva de cuentas por la API"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        self.client = APIClient()
+        self.client.force_authenticate(user=seeded_db.admin)
+        self.url = "/api/v1/accounts/bulk/"
+        self.organization = seeded_db.organization
+
+    def test_bulk_create(self, monkeypatch):
+        """Test POST /api/v1/accounts/bulk/ - Crear cuentas en lote"""
+        # El endpoint calcula los hashes en el propio proceso web.
+        monkeypatch.setattr(provisioning, "ProcessPoolExecutor", None)
+        data = [
+            {"username": f"obs{n}", "password": "clave123", "organization": self.organization.id}
+            for n in range(3)
+        ]
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 3
+        user = User.objects.get(username="obs1")
+        assert user.role == "observer"
+        assert user.check_password("clave123")
+
+    def test_bulk_rejects_taken_usernames(self, seeded_db):
+        """Test usuarios repetidos o existentes devuelven 400 sin crear nada"""
+        data = [
+            {"username": "nuevo", "organization": self.organization.id},
+            {"username": "nuevo", "organization": self.organization.id},
+            {"username": seeded_db.observer.username, "organization": self.organization.id},
+        ]
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "username" in response.data
+        assert not User.objects.filter(username="nuevo").exists()
+
+    def test_bulk_rejects_too_many(self, settings):
+        """Test un lote mayor que ACCOUNTS_BULK_MAX_SIZE devuelve 400"""
+        settings.ACCOUNTS_BULK_MAX_SIZE = 2
+        data = [{"username": f"obs{n}", "organization": self.organization.id} for n in range(3)]
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not User.objects.filter(username="obs0").exists()
+
+    def test_bulk_rejects_unknown_ids(self):
+        """Test organizaciones o grupos inexistentes devuelven 400"""
+        data = [{"username": "nuevo", "organization": self.organization.id, "groups": [999]}]
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "groups" in response.data
+
+
+@pytest.mark.django_db
+class TestAccountMeLean:
+    """Tests de /me ligero con claims del token y ETag"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.user = User.objects.get(pk=seeded_db.observer.pk)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = "/api/v1/accounts/me/lean/"
+
+    def test_claims_and_profile(self):
+        """Test devuelve los claims y el perfil con ETag"""
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["claims"] == {
+            "id": self.user.id,
+            "username": self.user.username,
+            "email": self.user.email,
+            "role": "observer",
+            "organization": self.user.organization_id,
+        }
+        assert response.data["profile"]["username"] == self.user.username
+        assert response["ETag"].startswith('"')
+
+    def test_claims_from_token(self):
+        """Test con un token JWT los claims salen del token"""
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        client = APIClient()
+
+        response = client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        assert response.data["claims"]["role"] == token["role"] == "observer"
+        assert response.data["claims"]["id"] == self.user.id
+
+    def test_not_modified(self, django_assert_num_queries):
+        """Test con If-None-Match igual devuelve 304 y el perfil no se relee"""
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f"W/{etag}")
+            cached = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached.status_code == status.HTTP_200_OK
+
+    def test_changes_refresh_snapshot(self):
+        """Test cambiar el usuario o sus permisos cambia el ETag y el perfil"""
+        first = self.client.get(self.url)["ETag"]
+        self.user.first_name = "Ana"
+        self.user.save()
+        second = self.client.get(self.url)
+        self.user.user_permissions.add(Permission.objects.get(codename="view_station"))
+        third = self.client.get(self.url)
+
+        assert second["ETag"] != first
+        assert second.data["profile"]["first_name"] == "Ana"
+        assert third["ETag"] != second["ETag"]
+        assert third.data["profile"]["user_permissions"]
+
+    def test_login_refreshes_snapshot(self):
+        """Test iniciar sesión cambia el ETag aunque solo se guarde last_login"""
+        first = self.client.get(self.url)["ETag"]
+        update_last_login(None, self.user)
+
+        second = self.client.get(self.url)
+
+        assert second["ETag"] != first
+        assert second.data["profile"]["last_login"] is not None
@@ -1,7 +1,12 @@
 import pytest
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.contrib.auth.hashers import check_password, is_password_usable
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 
+from accounts.permissions import permissions_version
+from accounts.provisioning import hash_passwords, provision
 from accounts.factories import UserFactory, AdminUserFactory, ObserverUserFactory
 from organizations.factories import OrganizationFactory
 
@@ -234,3 +239,107 @@ class TestUserCRUD:
         assert user.email == "test.email@example.com"
         assert "@" in user.email
         
+
+
+@pytest.mark.django_db
+class TestPermissionCache:
+    """Tests de la caché de permisos entre peticiones"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        """Configuración inicial para cada test"""
+        # Sólo se activa con una caché compartida; aquí hay un único proceso.
+        settings.AUTHENTICATION_BACKENDS = ["accounts.permissions.CachedModelBackend"]
+        cache.clear()
+        self.user = ObserverUserFactory()
+        self.permission = Permission.objects.get(codename="view_station")
+
+    def test_cached_across_instances(self, django_assert_num_queries):
+        """Test una nueva instancia del usuario no vuelve a consultar sus permisos"""
+        self.user.user_permissions.add(self.permission)
+        assert User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+        user = User.objects.get(pk=self.user.pk)
+        with django_assert_num_queries(0):
+            assert user.has_perm("stations.view_station")
+            assert not user.has_perm("stations.add_station")
+
+    def test_user_permissions_change(self):
+        """Test cambiar los permisos directos del usuario invalida la caché"""
+        assert not User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+        self.user.user_permissions.add(self.permission)
+
+        assert User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+    def test_group_change(self):
+        """Test cambiar los permisos de un grupo invalida la caché de sus miembros"""
+        group = Group.objects.create(name="observadores")
+        self.user.groups.add(group)
+        assert not User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+        group.permissions.add(self.permission)
+        assert User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+        group.delete()
+        assert not User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+    def test_commit_discards_reads_during_transaction(self, django_capture_on_commit_callbacks):
+        """Test lo que otra petición guarda en caché antes del commit no sobrevive al commit"""
+        self.user.user_permissions.add(self.permission)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                self.user.user_permissions.remove(self.permission)
+                # Otra conexión aún ve el permiso y lo guarda con la versión vigente.
+                key = f"permissions:{self.user.pk}:{permissions_version()}"
+                cache.set(key, {"stations.view_station"})
+
+        assert not User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+    def test_inactive_user(self):
+        """Test un usuario inactivo no tiene permisos aunque estén en caché"""
+        self.user.user_permissions.add(self.permission)
+        assert User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        assert not User.objects.get(pk=self.user.pk).has_perm("stations.view_station")
+
+
+@pytest.mark.django_db
+class TestProvisioning:
+    """Tests del alta masiva de cuentas"""
+
+    def test_hash_passwords_in_pool(self):
+        """Test los hashes calculados en varios procesos son válidos"""
+        hashes = hash_passwords(["uno", "dos", None], processes=2)
+
+        assert check_password("uno", hashes[0])
+        assert check_password("dos", hashes[1])
+        assert not is_password_usable(hashes[2])
+
+    def test_provision(self, django_assert_max_num_queries):
+        """Test crea usuarios, grupos y permisos con pocas consultas"""
+        organization = OrganizationFactory()
+        group = Group.objects.create(name="observadores")
+        permission = Permission.objects.get(codename="view_station")
+        accounts = [
+            {
+                "username": f"bulk{n}",
+                "password": f"clave{n}",
+                "organization_id": organization.id,
+                "groups": [group.id],
+                "user_permissions": [permission.id],
+            }
+            for n in range(5)
+        ]
+
+        with django_assert_max_num_queries(5):
+            users = provision(accounts, processes=1)
+
+        user = User.objects.get(username="bulk3")
+        assert len(users) == 5
+        assert user.check_password("clave3")
+        assert list(user.groups.all()) == [group]
+        assert user.has_perm("stations.view_station")
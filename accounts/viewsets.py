@@ -1,23 +1,24 @@
+from django.conf import settings
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from accounts.models import User
+from accounts.permissions import catalog
+from accounts.profiles import profile_etag, profile_snapshot, token_claims
+from accounts.provisioning import provision
 from accounts.serializers import (
     AccountSerializer,
     AccountReadSerializer,
-    ContentTypeSerializer,
-    PermissionSerializer,
-    GroupSerializer,
+    AccountBulkSerializer,
 )
 from rest_framework.response import Response
+from django.utils.http import parse_etags
 from django_filters.rest_framework import (
     DjangoFilterBackend,
 )
-from django.contrib.contenttypes.models import ContentType
-from django.contrib.auth.models import Permission, Group
 
 
 class AccountViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.prefetch_related("groups", "user_permissions")
     serializer_class = AccountSerializer
 
     filter_backends = [
@@ -52,29 +53,47 @@ class AccountViewSet(viewsets.ModelViewSet):
 
         return AccountReadSerializer
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create up to ``ACCOUNTS_BULK_MAX_SIZE`` accounts with a few queries."""
+        serializer = AccountBulkSerializer(
+            data=request.data, many=True, max_length=settings.ACCOUNTS_BULK_MAX_SIZE
+        )
+        serializer.is_valid(raise_exception=True)
+        users = provision(serializer.validated_data)
+        return Response(
+            status=status.HTTP_201_CREATED,
+            data={"created": len(users), "ids": [user.pk for user in users]},
+        )
+
     @action(detail=False)
     def me(self, request):
         serializer = AccountReadSerializer(request.user, context={"request": request})
         return Response(status=status.HTTP_200_OK, data=serializer.data)
 
+    @action(detail=False, url_path="me/lean")
+    def me_lean(self, request):
+        """Token claims and the cached profile, with an ETag for revalidation."""
+        etag = profile_etag(request.user)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        # Compression weakens the ETag on the way out (W/"..."), so compare weakly.
+        sent = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in {tag.removeprefix("W/") for tag in sent}:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        data = {
+            "claims": token_claims(request),
+            "profile": profile_snapshot(request.user, etag, {"request": request}),
+        }
+        return Response(status=status.HTTP_200_OK, data=data, headers=headers)
+
     @action(detail=False)
     def contenttypes(self, request):
-        models = ContentType.objects.all()
-        serializer = ContentTypeSerializer(
-            models, many=True, context={"request": request}
-        )
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        return Response(status=status.HTTP_200_OK, data=catalog()["contenttypes"])
 
     @action(detail=False)
     def groups(self, request):
-        models = Group.objects.all()
-        serializer = GroupSerializer(models, many=True, context={"request": request})
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        return Response(status=status.HTTP_200_OK, data=catalog()["groups"])
 
     @action(detail=False)
     def permissions(self, request):
-        models = Permission.objects.all()
-        serializer = PermissionSerializer(
-            models, many=True, context={"request": request}
-        )
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        return Response(status=status.HTTP_200_OK, data=catalog()["permissions"])
@@ -1,19 +1,66 @@
+from asgiref.sync import sync_to_async
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from authentication import revocation
 
 
 class CookieAuthentication(JWTAuthentication):
 
     def authenticate(self, request):
-        header = self.get_header(request)
-
-        if header is None:
-            raw_token = request.COOKIES.get("access_token") or None
-        else:
-            raw_token = self.get_raw_token(header)
-
+        raw_token = self.get_request_token(request)
         if raw_token is None:
             return None
 
         validated_token = self.get_validated_token(raw_token)
+        revocation.check(validated_token)
         # enforce_csrf(request)
         return self.get_user(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        """Async variant of ``authenticate`` for async views."""
+        raw_token = self.get_request_token(request)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if revocation.denylist.stale():
+            await sync_to_async(revocation.denylist.sync)()
+        revocation.check(validated_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_request_token(self, request):
+        header = self.get_header(request)
+
+        if header is None:
+            return request.COOKIES.get("access_token") or None
+        return self.get_raw_token(header)
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
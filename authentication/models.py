@@ -0,0 +1,18 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class RevokedToken(models.Model):
+    """A token revoked before its expiry (see ``authentication.revocation``)."""
+
+    jti = models.CharField(_("token id"), max_length=255, unique=True)
+    expires_at = models.DateTimeField(_("expires at"), db_index=True)
+
+    created = models.DateTimeField(_("created"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("revoked token")
+        verbose_name_plural = _("revoked tokens")
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,97 @@
+"""
+Revocation of JWTs before they expire.
+
+``revoke`` stores the token id (``jti``) and expiry in ``RevokedToken``, the
+table every worker shares. Each worker keeps the ids of the revoked tokens
+still alive in a dict, so authentication checks a token with one lookup and
+no query. At most every ``TOKEN_REVOCATION_SYNC_SECONDS`` the first request
+fetches only the rows created since the last sync (with a minute of overlap
+for transactions that committed late); a token revoked in another worker is
+rejected after at most that delay, one revoked in this worker at once.
+
+Entries drop out of memory and of the table once the token expires, so both
+stay as small as the number of revocations within a refresh-token lifetime.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from authentication.models import RevokedToken
+
+# How far back each sync looks before the previous one.
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+class Denylist:
+    """Ids of the revoked, unexpired tokens with their expiry (epoch seconds)."""
+
+    def __init__(self):
+        self.entries = {}
+        self.since = None
+        self.synced_at = None
+        self.lock = threading.Lock()
+
+    def stale(self):
+        return (
+            self.synced_at is None
+            or time.monotonic() - self.synced_at >= settings.TOKEN_REVOCATION_SYNC_SECONDS
+        )
+
+    def sync(self):
+        """Add the rows revoked since the last sync and forget expired entries."""
+        with self.lock:
+            started = datetime.now(timezone.utc)
+            rows = RevokedToken.objects.filter(expires_at__gt=started)
+            if self.since is not None:
+                rows = rows.filter(created__gte=self.since)
+            # Build a new dict and swap it in: readers never see it half-done.
+            now = started.timestamp()
+            entries = {jti: expires for jti, expires in self.entries.items() if expires > now}
+            for jti, expires_at in rows.values_list("jti", "expires_at"):
+                entries[jti] = expires_at.timestamp()
+            self.entries = entries
+            self.since = started - SYNC_OVERLAP
+            self.synced_at = time.monotonic()
+
+    def add(self, jti, expires):
+        with self.lock:
+            self.entries = {**self.entries, jti: expires}
+
+    def __contains__(self, jti):
+        expires = self.entries.get(jti)
+        return expires is not None and expires > time.time()
+
+    def clear(self):
+        with self.lock:
+            self.entries, self.since, self.synced_at = {}, None, None
+
+
+denylist = Denylist()
+
+
+def revoke(token):
+    """Revoke ``token`` (a validated simplejwt token) until it expires."""
+    jti, expires = token[api_settings.JTI_CLAIM], token["exp"]
+    expires_at = datetime.fromtimestamp(expires, timezone.utc)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        pass  # already revoked
+    RevokedToken.objects.filter(expires_at__lte=datetime.now(timezone.utc)).delete()
+    denylist.add(jti, expires)
+
+
+def check(token):
+    """Raise ``InvalidToken`` if ``token`` was revoked. Queries only when the denylist is stale."""
+    if denylist.stale():
+        denylist.sync()
+    if token.get(api_settings.JTI_CLAIM) in denylist:
+        raise InvalidToken(_("Token has been revoked"), code="token_revoked")
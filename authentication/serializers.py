@@ -1,16 +1,70 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, UntypedToken
+
+from authentication import revocation
+
+
+def user_claims(user):
+    """User fields returned on login and carried in the tokens."""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        # "photo": user.photo.url,
+        "role": user.role,
+        "organization": user.organization_id,
+    }
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for name, value in user_claims(user).items():
+            if name != "id":  # already the user id claim
+                token[name] = value
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
-        user = self.user
-        data["user"] = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            # "photo": user.photo.url,
-            "role": user.role,
-        }
+        data["user"] = user_claims(self.user)
         return data
+
+
+class RevocationCheckedTokenRefreshSerializer(TokenRefreshSerializer):
+
+    def validate(self, attrs):
+        revocation.check(RefreshToken(attrs["refresh"]))
+        return super().validate(attrs)
+
+
+class RevocationCheckedTokenVerifySerializer(TokenVerifySerializer):
+
+    def validate(self, attrs):
+        revocation.check(UntypedToken(attrs["token"]))
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """Access and/or refresh token to revoke; invalid tokens raise ``TokenError``."""
+
+    access = serializers.CharField(required=False)
+    refresh = serializers.CharField(required=False)
+
+    def validate_access(self, value):
+        return AccessToken(value)
+
+    def validate_refresh(self, value):
+        return RefreshToken(value)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(_("Provide a token to revoke."))
+        return attrs
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authentication import revocation
+from authentication.models import RevokedToken
+from authentication.serializers import CustomTokenObtainPairSerializer
+
+
+@pytest.mark.django_db
+class TestTokenRevocation:
+    """Tests de revocación de tokens JWT"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        revocation.denylist.clear()
+        self.user = seeded_db.admin
+        self.refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.access = self.refresh.access_token
+        self.client = APIClient()
+
+    def get_me(self, access):
+        return self.client.get("/api/v1/accounts/me/", HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_revoke_rejects_tokens(self):
+        """Test POST /api/auth/revoke/ - Los tokens revocados dejan de servir"""
+        assert self.get_me(self.access).status_code == status.HTTP_200_OK
+
+        response = self.client.post(
+            "/api/auth/revoke/", {"access": str(self.access), "refresh": str(self.refresh)}
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert self.get_me(self.access).status_code in [
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        ]
+        refreshed = self.client.post("/api/auth/refresh/", {"refresh": str(self.refresh)})
+        assert refreshed.status_code == status.HTTP_401_UNAUTHORIZED
+        verified = self.client.post("/api/auth/verify/", {"token": str(self.access)})
+        assert verified.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoke_requires_valid_token(self):
+        """Test revocar sin token o con un token inválido falla"""
+        assert self.client.post("/api/auth/revoke/").status_code == status.HTTP_400_BAD_REQUEST
+        invalid = self.client.post("/api/auth/revoke/", {"access": "abc"})
+        assert invalid.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_other_workers_sync_from_table(self):
+        """Test otro proceso ve la revocación al sincronizar desde la tabla"""
+        other = revocation.Denylist()
+        other.sync()
+        revocation.revoke(self.access)
+
+        assert self.access["jti"] not in other
+        other.sync()
+        assert self.access["jti"] in other
+
+    def test_check_without_queries(self, django_assert_num_queries):
+        """Test comprobar un token no consulta la base de datos entre sincronizaciones"""
+        revocation.check(self.access)
+
+        with django_assert_num_queries(0):
+            revocation.check(self.access)
+
+    def test_expired_entries_dropped(self):
+        """Test las revocaciones caducan con el token"""
+        self.access.set_exp(lifetime=timedelta(seconds=-1))
+        revocation.revoke(self.access)
+        assert self.access["jti"] not in revocation.denylist
+
+        revocation.revoke(self.refresh)
+        revocation.denylist.sync()
+
+        assert list(RevokedToken.objects.values_list("jti", flat=True)) == [self.refresh["jti"]]
+        assert set(revocation.denylist.entries) == {self.refresh["jti"]}
+
+    def test_async_view_rejects_revoked(self):
+        """Test el endpoint asíncrono también rechaza tokens revocados"""
+        revocation.revoke(self.access)
+
+        response = Client().get(
+            "/api/v1/async/stations/", HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
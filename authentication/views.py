@@ -1,6 +1,12 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenViewBase
 from django.conf import settings
 
+from authentication import revocation
+from authentication.serializers import TokenRevokeSerializer
+
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     def post(self, request, *args, **kwargs):
@@ -29,3 +35,31 @@ class CustomTokenObtainPairView(TokenObtainPairView):
 
         response.data = {"user": user}
         return response
+
+
+class TokenRevokeView(TokenViewBase):
+    """
+    Logout: revokes the access and refresh tokens given in the body, or else
+    the ones in the login cookies, until they expire.
+    """
+
+    serializer_class = TokenRevokeSerializer
+
+    def post(self, request, *args, **kwargs):
+        tokens = {}
+        for name in ("access", "refresh"):
+            value = request.data.get(name) or request.COOKIES.get(name)
+            if value:
+                tokens[name] = value
+        serializer = self.get_serializer(data=tokens)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        for token in serializer.validated_data.values():
+            revocation.revoke(token)
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        response.delete_cookie("access")
+        response.delete_cookie("refresh")
+        return response
@@ -0,0 +1,230 @@
+"""
+API benchmark suite on production-sized data.
+
+Seeds the database configured by ``config.bench_settings`` (use a dedicated,
+empty database), then measures p50/p95/p99 latency and throughput of every
+router endpoint in ``config/urls.py`` plus the admin changelists under
+concurrent clients, and the import/export resources in process. Results are
+written as JSON and compared with a stored baseline; any regression beyond
+``--tolerance`` exits with status 1.
+
+    DATABASE=postgresql python -m benchmarks.bench_api --seed
+    python -m benchmarks.bench_api --update-baseline
+    python -m benchmarks.bench_api            # compare against the baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.bench_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.test import Client  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from benchmarks import seed  # noqa: E402
+from benchmarks.loadgen import Request, run  # noqa: E402
+from config.urls import router  # noqa: E402
+from histories.resources import RainfallHistoryResource  # noqa: E402
+from stations.models import RainfallStation  # noqa: E402
+from stations.resources import RainfallStationResource, StationResource  # noqa: E402
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DEFAULT_RESULTS = BENCHMARKS_DIR / "results" / "latest.json"
+DEFAULT_BASELINE = BENCHMARKS_DIR / "baseline.json"
+
+ADMIN_CHANGELISTS = (
+    "/admin/stations/rainfallstation/",
+    "/admin/histories/rainfallhistory/",
+    "/admin/stations/station/",
+    "/admin/accounts/user/",
+)
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = make_server(
+        "127.0.0.1", 0, get_wsgi_application(), ThreadingWSGIServer, QuietHandler
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def scenarios(user):
+    """Name → list of requests, one scenario per endpoint."""
+    token = AccessToken.for_user(user)
+    api_headers = {"Authorization": f"Bearer {token}"}
+    client = Client()
+    client.force_login(user)
+    admin_headers = {"Cookie": f"sessionid={client.cookies['sessionid'].value}"}
+
+    result = {}
+    for prefix, viewset, basename in router.registry:
+        obj = viewset.queryset.order_by("-pk").first()
+        result[f"GET /api/v1/{prefix}/"] = [Request("GET", f"/api/v1/{prefix}/", api_headers)]
+        if obj is not None:
+            result[f"GET /api/v1/{prefix}/{{id}}/"] = [
+                Request("GET", f"/api/v1/{prefix}/{obj.pk}/", api_headers)
+            ]
+    station = RainfallStation.objects.order_by("-pk").values_list("station", flat=True).first()
+    if station is not None:
+        result["GET /api/v1/rainfall/?station&paginator"] = [
+            Request("GET", f"/api/v1/rainfall/?station={station}&paginator", api_headers)
+        ]
+    for path in ADMIN_CHANGELISTS:
+        result[f"GET {path}"] = [Request("GET", path, admin_headers)]
+    return result
+
+
+def measure_resources(rows):
+    """Time import/export resources in process on ``rows`` records."""
+    results = {}
+    for name, resource_class, queryset in (
+        ("export rainfall", RainfallStationResource, RainfallStation.objects.order_by("-pk")),
+        ("export stations", StationResource, StationResource._meta.model.objects.all()),
+        ("export histories", RainfallHistoryResource, RainfallHistoryResource._meta.model.objects.all()),
+    ):
+        start = time.perf_counter()
+        dataset = resource_class().export(queryset=queryset[:rows])
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "rows": len(dataset),
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(len(dataset) / elapsed, 1) if elapsed else 0.0,
+        }
+
+        if name == "export rainfall":
+            start = time.perf_counter()
+            resource_class().import_data(dataset, dry_run=True)
+            elapsed = time.perf_counter() - start
+            results["import rainfall (dry run)"] = {
+                "rows": len(dataset),
+                "seconds": round(elapsed, 3),
+                "rows_per_s": round(len(dataset) / elapsed, 1) if elapsed else 0.0,
+            }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """List human-readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]} -> {current[metric]}"
+                )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput_rps {previous['throughput_rps']} -> "
+                f"{current['throughput_rps']}"
+            )
+        if current["error_rate"] > previous["error_rate"]:
+            regressions.append(
+                f"{name}: error_rate {previous['error_rate']} -> {current['error_rate']}"
+            )
+    for name, current in results["resources"].items():
+        previous = baseline.get("resources", {}).get(name)
+        if previous and current["rows_per_s"] < previous["rows_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: rows_per_s {previous['rows_per_s']} -> {current['rows_per_s']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", action="store_true", help="seed the database first")
+    parser.add_argument("--stations", type=int, default=1000)
+    parser.add_argument("--rainfall-rows", type=int, default=10_000_000)
+    parser.add_argument("--base-url", help="benchmark a running server instead")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--resource-rows", type=int, default=10000)
+    parser.add_argument("--output", default=str(DEFAULT_RESULTS))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    User = get_user_model()
+    if args.seed:
+        if User.objects.exists():
+            parser.error("refusing to seed a database that already has data")
+        seed.seed(stations=args.stations, rainfall_rows_total=args.rainfall_rows)
+    user = User.objects.get(username=seed.BENCH_USERNAME)
+
+    base_url = args.base_url
+    if base_url is None:
+        _, base_url = start_server()
+
+    results = {
+        "meta": {
+            "rainfall_rows": RainfallStation.objects.count(),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+        },
+        "endpoints": {},
+        "resources": {},
+    }
+    for name, requests in scenarios(user).items():
+        result = asyncio.run(run(base_url, requests, args.concurrency, args.duration))
+        results["endpoints"][name] = summary = result.summary()
+        print(
+            f"{name:<50} {summary['throughput_rps']:>8} req/s  p50 {summary['p50_ms']:>8} "
+            f"p95 {summary['p95_ms']:>8} p99 {summary['p99_ms']:>8} ms  "
+            f"errors {summary['error_rate']}"
+        )
+    results["resources"] = measure_resources(args.resource_rows)
+    for name, summary in results["resources"].items():
+        print(f"{name:<50} {summary['rows_per_s']:>8} rows/s ({summary['rows']} rows)")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as handle:
+        json.dump(results, handle, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --update-baseline")
+        return
+    with open(args.baseline) as handle:
+        regressions = compare(results, json.load(handle), args.tolerance)
+    if regressions:
+        print("PERFORMANCE REGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Load comparison of the sync (gunicorn WSGI) and async (ASGI) read endpoints.
+
+Start both deployments against the same database, for example:
+
+    gunicorn config.wsgi -w 1 --threads 8 -b 127.0.0.1:8000
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker -w 1 -b 127.0.0.1:8001
+
+then run:
+
+    python -m benchmarks.bench_asgi --token <access token> --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+
+from benchmarks.loadgen import Request, run
+
+ENDPOINTS = ("rainfall/", "histories/", "stations/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wsgi-url", default="http://127.0.0.1:8000/api/v1")
+    parser.add_argument("--asgi-url", default="http://127.0.0.1:8001/api/v1/async")
+    parser.add_argument("--token", required=True, help="JWT access token")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    requests = [Request("GET", f"/{endpoint}", headers) for endpoint in ENDPOINTS]
+
+    results = {}
+    for name, base_url in (("wsgi", args.wsgi_url), ("asgi", args.asgi_url)):
+        result = asyncio.run(run(base_url, requests, args.concurrency, args.duration))
+        results[name] = result.summary()
+        print(
+            "{name}: {throughput_rps} req/s, p50 {p50_ms} ms, p95 {p95_ms} ms, "
+            "p99 {p99_ms} ms, error rate {error_rate}".format(name=name, **results[name])
+        )
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"benchmark": "asgi", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compression ratio and time for a ``/api/v1/rainfall/?paginator`` sized payload.
+
+    python -m benchmarks.bench_compression --rows 50000 --output compression.json
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from core.compression import GzipCodec, ZstdCodec, zstandard
+
+
+def rainfall_payload(rows, stations=50):
+    start = date(2000, 1, 1)
+    records = []
+    for index in range(rows):
+        station_id = index % stations + 1
+        registration_date = start + timedelta(days=index // stations)
+        records.append(
+            {
+                "id": index + 1,
+                "station": station_id,
+                "registration_date": registration_date.isoformat(),
+                "day": registration_date.day,
+                "month": registration_date.month,
+                "year": registration_date.year,
+                "value": f"{max(random.gauss(4, 8), 0):.2f}",
+                "created": "2025-09-08T00:02:00.000000Z",
+                "modified": "2025-09-08T00:02:00.000000Z",
+            }
+        )
+    return json.dumps(records).encode()
+
+
+def measure(codec, payload, level, repeat):
+    timings = []
+    compressed = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = codec.compress(payload, level)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "codec": codec.name,
+        "level": level,
+        "input_bytes": len(payload),
+        "output_bytes": len(compressed),
+        "ratio": round(len(payload) / len(compressed), 2),
+        "median_ms": round(timings[len(timings) // 2], 2),
+        "mb_per_s": round(len(payload) / 1e6 / (timings[len(timings) // 2] / 1000), 1),
+    }
+
+
+def run(rows, repeat):
+    payload = rainfall_payload(rows)
+    codecs = [(GzipCodec(), (1, 6, 9))]
+    if zstandard is not None:
+        codecs.append((ZstdCodec(), (1, 3, 9)))
+    return [
+        measure(codec, payload, level, repeat)
+        for codec, levels in codecs
+        for level in levels
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    for result in results:
+        print(
+            "{codec:>5} level {level}: {input_bytes} -> {output_bytes} bytes "
+            "(x{ratio}) in {median_ms} ms, {mb_per_s} MB/s".format(**result)
+        )
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"benchmark": "compression", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
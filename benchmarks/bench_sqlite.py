@@ -0,0 +1,183 @@
+"""
+Concurrent read/write throughput of the default and tuned SQLite profiles.
+
+Reader threads run the rainfall list queries the API issues while one writer
+inserts daily readings in batches, like the import path does.
+
+    python -m benchmarks.bench_sqlite --seconds 5 --readers 4
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+from django.conf import settings  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE stations_rainfallstation (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    station_id INTEGER NOT NULL,
+    registration_date DATE NOT NULL,
+    value DECIMAL NULL
+);
+CREATE INDEX rainfall_station_idx ON stations_rainfallstation (station_id);
+"""
+
+READ_QUERIES = (
+    "SELECT COUNT(*) FROM stations_rainfallstation WHERE station_id = ?",
+    "SELECT id, station_id, registration_date, value FROM stations_rainfallstation "
+    "WHERE station_id = ? ORDER BY id DESC LIMIT 10",
+)
+
+
+def profiles():
+    return {
+        # Django's defaults: rollback journal, synchronous=FULL, 5 s timeout.
+        "default": [],
+        "tuned": list(settings.SQLITE_PRAGMAS),
+    }
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    for pragma in pragmas:
+        connection.execute(pragma)
+    return connection
+
+
+def seed(path, pragmas, rows, stations):
+    connection = connect(path, pragmas)
+    connection.executescript(SCHEMA)
+    start = date(2000, 1, 1)
+    connection.execute("BEGIN IMMEDIATE")
+    connection.executemany(
+        "INSERT INTO stations_rainfallstation (station_id, registration_date, value) "
+        "VALUES (?, ?, ?)",
+        (
+            (n % stations + 1, (start + timedelta(days=n // stations)).isoformat(), 1.5)
+            for n in range(rows)
+        ),
+    )
+    connection.execute("COMMIT")
+    connection.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_profile(name, pragmas, seconds, readers, batch, rows, stations):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "bench.sqlite3")
+    seed(path, pragmas, rows, stations)
+
+    stop = threading.Event()
+    read_latencies = []
+    write_latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def reader():
+        connection = connect(path, pragmas)
+        latencies = []
+        while not stop.is_set():
+            station = random.randint(1, stations)
+            start = time.perf_counter()
+            try:
+                for query in READ_QUERIES:
+                    connection.execute(query, (station,)).fetchall()
+            except sqlite3.OperationalError as error:
+                with lock:
+                    errors.append(str(error))
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+        with lock:
+            read_latencies.extend(latencies)
+        connection.close()
+
+    def writer():
+        connection = connect(path, pragmas)
+        day = date(2030, 1, 1)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(
+                    "INSERT INTO stations_rainfallstation "
+                    "(station_id, registration_date, value) VALUES (?, ?, ?)",
+                    ((n % stations + 1, day.isoformat(), 2.5) for n in range(batch)),
+                )
+                connection.execute("COMMIT")
+            except sqlite3.OperationalError as error:
+                with lock:
+                    errors.append(str(error))
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                continue
+            write_latencies.append((time.perf_counter() - start) * 1000)
+            day += timedelta(days=1)
+        connection.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    shutil.rmtree(directory)
+
+    return {
+        "profile": name,
+        "reads_per_s": round(len(read_latencies) / seconds, 1),
+        "read_p50_ms": round(percentile(read_latencies, 0.50), 2),
+        "read_p95_ms": round(percentile(read_latencies, 0.95), 2),
+        "read_p99_ms": round(percentile(read_latencies, 0.99), 2),
+        "rows_written_per_s": round(len(write_latencies) * batch / seconds, 1),
+        "write_p95_ms": round(percentile(write_latencies, 0.95), 2),
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--stations", type=int, default=100)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = [
+        run_profile(
+            name, pragmas, args.seconds, args.readers, args.batch, args.rows, args.stations
+        )
+        for name, pragmas in profiles().items()
+    ]
+    for result in results:
+        print(
+            "{profile:>8}: {reads_per_s} reads/s (p95 {read_p95_ms} ms), "
+            "{rows_written_per_s} rows written/s (p95 {write_p95_ms} ms), "
+            "{errors} errors".format(**result)
+        )
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"benchmark": "sqlite", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
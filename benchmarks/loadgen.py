@@ -0,0 +1,148 @@
+"""
+Minimal asyncio HTTP/1.1 load generator shared by the benchmark scripts.
+
+One coroutine per simulated client, so thousands of concurrent connections
+cost no threads on the client side.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: dict = field(default_factory=dict)
+    body: bytes = b""
+    # Results are also broken down per name when set (see LoadResult.groups).
+    name: str = ""
+
+
+@dataclass
+class LoadResult:
+    latencies_ms: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    errors: int = 0
+    elapsed_s: float = 0.0
+    groups: dict = field(default_factory=dict)
+
+    def group(self, name):
+        if name not in self.groups:
+            self.groups[name] = LoadResult()
+        return self.groups[name]
+
+    def record(self, status_code, latency_ms, name=""):
+        self.latencies_ms.append(latency_ms)
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        if name:
+            self.group(name).record(status_code, latency_ms)
+
+    def record_error(self, name=""):
+        self.errors += 1
+        if name:
+            self.group(name).errors += 1
+
+    def summary(self):
+        latencies = sorted(self.latencies_ms)
+        total = len(latencies) + self.errors
+        failed = self.errors + sum(
+            count for code, count in self.statuses.items() if code >= 500
+        )
+        client_errors = sum(
+            count for code, count in self.statuses.items() if 400 <= code < 500
+        )
+        histogram = {}
+        for bucket in HISTOGRAM_BUCKETS_MS:
+            histogram[f"<={bucket}ms"] = sum(1 for value in latencies if value <= bucket)
+        histogram["total"] = len(latencies)
+        return {
+            "requests": total,
+            "throughput_rps": round(len(latencies) / self.elapsed_s, 1)
+            if self.elapsed_s
+            else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "client_error_rate": round(client_errors / total, 4) if total else 0.0,
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "histogram": histogram,
+        }
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def send(base_url, request, timeout=30.0):
+    """Send ``request`` to ``base_url`` returning ``(status, body)``."""
+    url = urlsplit(base_url)
+    host = url.hostname or "127.0.0.1"
+    port = url.port or (443 if url.scheme == "https" else 80)
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=url.scheme == "https"), timeout
+    )
+    try:
+        headers = {
+            "Host": url.netloc,
+            "Connection": "close",
+            "Accept-Encoding": "identity",
+            **request.headers,
+        }
+        if request.body:
+            headers["Content-Length"] = str(len(request.body))
+        head = f"{request.method} {url.path.rstrip('/')}{request.path} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + request.body)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    status_line = response.split(b"\r\n", 1)[0].split()
+    body = response.split(b"\r\n\r\n", 1)[-1]
+    return int(status_line[1]), body
+
+
+async def run(base_url, requests, concurrency, duration_s=None, total=None):
+    """
+    Fire ``requests`` (cycled) at ``base_url`` from ``concurrency`` clients
+    until ``duration_s`` elapses or ``total`` requests have been sent.
+    """
+    result = LoadResult()
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration_s if duration_s else None
+
+    def next_request():
+        nonlocal sent
+        if total is not None and sent >= total:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        request = requests[sent % len(requests)]
+        sent += 1
+        return request
+
+    async def client():
+        while (request := next_request()) is not None:
+            begin = time.perf_counter()
+            try:
+                status_code, _ = await send(base_url, request)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                result.record_error(request.name)
+                continue
+            result.record(status_code, (time.perf_counter() - begin) * 1000, request.name)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - start
+    for group in result.groups.values():
+        group.elapsed_s = result.elapsed_s
+    return result
@@ -0,0 +1,170 @@
+"""
+Replay traffic recorded by ``core.recording.RequestRecorderMiddleware``.
+
+Record on the server being studied (``REQUEST_RECORDER_ENABLED=True``, lines
+go to ``logs/traffic.jsonl``), then fire the same mix at a local server:
+
+    python -m benchmarks.replay logs/traffic.jsonl --token <access token> \\
+        --secret password=<password> --concurrency 32
+
+Requests that were authenticated are sent with the given JWT (or session
+cookie for admin pages); ``[REDACTED]`` body values are filled in from
+``--secret``. Writes are replayed too unless ``--read-only`` is passed, so
+point it at a throwaway database. Prints latency percentiles, a histogram
+and error rates overall and per endpoint.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from benchmarks.loadgen import HISTOGRAM_BUCKETS_MS, Request, run
+
+REDACTED = "[REDACTED]"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def load(path, include=(), read_only=False):
+    """Recorded requests from a JSON lines file, optionally filtered."""
+    records = []
+    with open(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if read_only and record["method"] not in READ_METHODS:
+                continue
+            if include and not any(record["path"].startswith(prefix) for prefix in include):
+                continue
+            records.append(record)
+    return records
+
+
+def endpoint(record):
+    """Group name with ids collapsed, e.g. ``GET /api/v1/stations/{id}/``."""
+    return f"{record['method']} {_ID_RE.sub('/{id}', record['path'])}"
+
+
+def fill_secrets(value, secrets):
+    if isinstance(value, dict):
+        return {
+            key: secrets.get(key, item) if item == REDACTED else fill_secrets(item, secrets)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [fill_secrets(item, secrets) for item in value]
+    return value
+
+
+def fill_encoded_secrets(encoded, secrets):
+    pairs = parse_qsl(encoded, keep_blank_values=True)
+    return urlencode(
+        [(key, secrets.get(key, value) if value == REDACTED else value) for key, value in pairs]
+    )
+
+
+def to_request(record, token=None, sessionid=None, secrets=None):
+    secrets = secrets or {}
+    headers = {}
+    if record.get("auth") == "session" and sessionid:
+        headers["Cookie"] = f"sessionid={sessionid}"
+    elif record.get("auth") and token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    query = fill_encoded_secrets(record.get("query") or "", secrets)
+    path = f"{record['path']}?{query}" if query else record["path"]
+
+    body = record.get("body")
+    if body is None:
+        data = b""
+    elif record.get("content_type") == "application/json":
+        headers["Content-Type"] = "application/json"
+        data = json.dumps(fill_secrets(body, secrets)).encode()
+    else:
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+        data = fill_encoded_secrets(body, secrets).encode()
+    return Request(record["method"], path, headers, data, name=endpoint(record))
+
+
+def report(name, summary):
+    print(
+        f"{name:<55} {summary['requests']:>7} req  {summary['throughput_rps']:>8} req/s  "
+        f"p50 {summary['p50_ms']:>8}  p95 {summary['p95_ms']:>8}  p99 {summary['p99_ms']:>8} ms  "
+        f"errors {summary['error_rate']} (4xx {summary['client_error_rate']})  "
+        f"{summary['statuses']}"
+    )
+
+
+def histogram(summary, width=40):
+    total = summary["histogram"]["total"] or 1
+    previous = 0
+    for bucket in HISTOGRAM_BUCKETS_MS:
+        cumulative = summary["histogram"][f"<={bucket}ms"]
+        count = cumulative - previous
+        previous = cumulative
+        print(f"  <= {bucket:>6} ms {count:>8}  {'#' * round(width * count / total)}")
+    print(f"   > {HISTOGRAM_BUCKETS_MS[-1]:>6} ms {summary['histogram']['total'] - previous:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("recording", help="JSON lines file written by the recorder")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the recording")
+    parser.add_argument("--duration", type=float, help="loop the recording for N seconds")
+    parser.add_argument("--token", help="JWT access token for authenticated requests")
+    parser.add_argument("--sessionid", help="session cookie for admin requests")
+    parser.add_argument(
+        "--secret", action="append", default=[], metavar="KEY=VALUE",
+        help="value for a redacted body field, e.g. password=...",
+    )
+    parser.add_argument(
+        "--include", action="append", default=[], metavar="PREFIX",
+        help="only replay paths starting with PREFIX",
+    )
+    parser.add_argument("--read-only", action="store_true", help="skip write requests")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    secrets = dict(secret.split("=", 1) for secret in args.secret)
+    records = load(args.recording, args.include, args.read_only)
+    if not records:
+        parser.error("no requests to replay")
+    requests = [to_request(record, args.token, args.sessionid, secrets) for record in records]
+
+    total = None if args.duration else len(requests) * args.repeat
+    result = asyncio.run(
+        run(args.base_url, requests, args.concurrency, args.duration, total)
+    )
+
+    summary = result.summary()
+    endpoints = {
+        name: group.summary() for name, group in sorted(result.groups.items())
+    }
+    for name, group_summary in endpoints.items():
+        report(name, group_summary)
+    report("TOTAL", summary)
+    histogram(summary)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(
+                {
+                    "benchmark": "replay",
+                    "recording": args.recording,
+                    "concurrency": args.concurrency,
+                    "total": summary,
+                    "endpoints": endpoints,
+                },
+                handle,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
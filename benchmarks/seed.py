@@ -0,0 +1,165 @@
+"""
+Seed a benchmark database with production-sized data through batched
+``bulk_create`` calls; rainfall readings go through ``stations.seeding``.
+"""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from histories.models import RainfallHistory
+from locations.models import Location
+from organizations.models import Organization
+from stations.models import EquipmentStation, Station
+from stations.seeding import seed_rainfall
+
+User = get_user_model()
+
+DEPARTMENTS = (
+    "Boaco", "Carazo", "Chinandega", "Chontales", "Estelí", "Granada",
+    "Jinotega", "León", "Madriz", "Managua", "Masaya", "Matagalpa",
+    "Nueva Segovia", "Río San Juan", "Rivas", "RACCN", "RACCS",
+)
+
+BENCH_USERNAME = "bench-admin"
+BENCH_PASSWORD = "bench-password"
+
+
+def bulk_insert(model, objects, batch_size):
+    batch = []
+    created = 0
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+    return created
+
+
+def seed_locations(municipalities_per_department=9, communities_per_municipality=5):
+    """Create the full country → department → municipality → community tree."""
+    country = Location.objects.create(name="Nicaragua", code="NI", location_type="country")
+    departments = Location.objects.bulk_create(
+        Location(name=name, code=f"NI-{n:02d}", location_type="department", parent=country)
+        for n, name in enumerate(DEPARTMENTS)
+    )
+    municipalities = Location.objects.bulk_create(
+        Location(
+            name=f"{department.name} {n}",
+            code=f"{department.code}-{n:02d}",
+            location_type="municipality",
+            parent=department,
+        )
+        for department in departments
+        for n in range(municipalities_per_department)
+    )
+    Location.objects.bulk_create(
+        Location(
+            name=f"{municipality.name}-{n}",
+            code=f"{municipality.code}-{n:02d}",
+            location_type="communnity",
+            parent=municipality,
+        )
+        for municipality in municipalities
+        for n in range(communities_per_municipality)
+    )
+    return departments
+
+
+def seed(
+    stations=1000,
+    rainfall_rows_total=10_000_000,
+    organizations=20,
+    observers=50,
+    batch_size=5000,
+    log=print,
+):
+    with transaction.atomic():
+        departments = seed_locations()
+        log(f"locations: {Location.objects.count()}")
+
+        orgs = Organization.objects.bulk_create(
+            Organization(
+                name=f"Organization {n}",
+                code=f"ORG-{n:04d}",
+                location=departments[n % len(departments)],
+            )
+            for n in range(organizations)
+        )
+        station_objects = Station.objects.bulk_create(
+            (
+                Station(
+                    name=f"Station {n}",
+                    code=f"STA{n:05d}",
+                    latitude=f"{random.uniform(10.7, 15.0):.4f}",
+                    longitude=f"{random.uniform(-87.7, -83.1):.4f}",
+                    organization=orgs[n % len(orgs)],
+                )
+                for n in range(stations)
+            ),
+            batch_size=batch_size,
+        )
+        bulk_insert(
+            EquipmentStation,
+            (
+                EquipmentStation(name=f"Rain gauge {station.code}", code=station.code, station=station)
+                for station in station_objects
+            ),
+            batch_size,
+        )
+        bulk_insert(
+            RainfallHistory,
+            (
+                RainfallHistory(
+                    station=station,
+                    month=month,
+                    value=Decimal(f"{random.uniform(5, 300):.2f}"),
+                )
+                for station in station_objects
+                for month in range(1, 13)
+            ),
+            batch_size,
+        )
+        log(f"stations: {len(station_objects)}")
+
+        admin = User(
+            username=BENCH_USERNAME,
+            organization=orgs[0],
+            role="admin",
+            is_staff=True,
+            is_superuser=True,
+        )
+        admin.set_password(BENCH_PASSWORD)
+        admin.save()
+        bulk_insert(
+            User,
+            (
+                User(
+                    username=f"observer{n}",
+                    organization=orgs[n % len(orgs)],
+                    role="observer",
+                    password=admin.password,
+                )
+                for n in range(observers)
+            ),
+            batch_size,
+        )
+
+    # Contiguous daily series ending today, one transaction per station.
+    days = max(rainfall_rows_total // len(station_objects), 1)
+    end = date.today()
+    created = seed_rainfall(
+        [station.pk for station in station_objects],
+        end - timedelta(days=days - 1),
+        end,
+        batch_size=batch_size * 10,
+    )
+    log(f"rainfall rows: {created}")
+    return admin
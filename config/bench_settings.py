@@ -0,0 +1,20 @@
+"""
+Benchmark settings for Django project.
+Same database configuration as production settings, without throttling so
+concurrent load is not answered with 429s.
+"""
+
+from .settings import *
+
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_CLASSES": [],
+}
+
+# Seeded accounts only need a password, not a slow KDF
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
@@ -63,11 +63,17 @@ INSTALLED_APPS = [
     "drf_yasg",
     "django_filters",
     "import_export",
+    "core",
+    "dashboard",
 ]
 
 MIDDLEWARE = [
+    "core.profiling.ProfilingMiddleware",
+    "core.queries.QueryInspectorMiddleware",
+    "core.recording.RequestRecorderMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -107,18 +113,63 @@ DATABASES = {
     }
 }
 
+# Tuned SQLite profile for field deployments (SQLITE_PROFILE=tuned): WAL lets
+# the API and admin keep reading while ingestion writes, and IMMEDIATE
+# transactions take the write lock up front instead of failing on upgrade.
+SQLITE_PROFILE = env("SQLITE_PROFILE", default="default")
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={env.int('SQLITE_MMAP_SIZE', default=268435456)}",  # bytes
+    f"PRAGMA cache_size={env.int('SQLITE_CACHE_SIZE', default=-64000)}",  # KiB if < 0
+    f"PRAGMA busy_timeout={env.int('SQLITE_BUSY_TIMEOUT', default=5000)}",  # ms
+    "PRAGMA temp_store=MEMORY",
+]
+if SQLITE_PROFILE == "tuned":
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": ";".join(SQLITE_PRAGMAS),
+        "transaction_mode": "IMMEDIATE",
+    }
+
 # Override database configuration if PostgreSQL is specified
 if env("DATABASE", default="") == "postgresql":
+    DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql_psycopg2",
+            "ENGINE": "django.db.backends.postgresql",
             "NAME": env("DATABASE_NAME", default="rocc"),
             "USER": env("DATABASE_USER", default="root"),
             "PASSWORD": env("DATABASE_PASSWORD", default="example"),
             "HOST": env("DATABASE_HOST", default="localhost"),
             "PORT": env("DATABASE_PORT", default="5432"),
+            # Django refuses persistent connections when the pool is enabled.
+            "CONN_MAX_AGE": 0
+            if DATABASE_POOL
+            else env.int("DATABASE_CONN_MAX_AGE", default=60),  # seconds
+            "CONN_HEALTH_CHECKS": env.bool("DATABASE_CONN_HEALTH_CHECKS", default=True),
+            "OPTIONS": {},
         }
     }
+    if DATABASE_POOL:
+        # psycopg_pool.ConnectionPool options, see
+        # https://www.psycopg.org/psycopg3/docs/api/pool.html
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+            "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),  # seconds
+            "max_idle": env.float("DATABASE_POOL_MAX_IDLE", default=600.0),
+            "max_lifetime": env.float("DATABASE_POOL_MAX_LIFETIME", default=3600.0),
+        }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The per-process default is fine for one worker; with several, point
+# CACHE_URL at a shared backend (e.g. dbcache://django_cache after
+# createcachetable) so cache invalidations reach every worker. LocMemCache
+# keeps 300 entries by default, fewer than one per station.
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://?max_entries=100000")}
 
 
 # Password validation
@@ -174,6 +225,33 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.User"
 
+# Permission sets are cached across requests (accounts.permissions), but
+# only a shared cache carries an invalidation to every worker: with the
+# per-process default, a revoked permission would keep working in the other
+# workers until the entry expired. There the stock backend resolves
+# permissions per request, and what is still cached under the permission
+# version (catalog, /me snapshot) expires within seconds.
+SHARED_CACHE = not CACHES["default"]["BACKEND"].endswith((".LocMemCache", ".DummyCache"))
+AUTHENTICATION_BACKENDS = [
+    "accounts.permissions.CachedModelBackend"
+    if SHARED_CACHE
+    else "django.contrib.auth.backends.ModelBackend"
+]
+PERMISSIONS_CACHE_TIMEOUT = env.int(
+    "PERMISSIONS_CACHE_TIMEOUT", default=3600 if SHARED_CACHE else 5
+)  # seconds
+# Bulk account provisioning (accounts.provisioning): rows per INSERT and the
+# largest upload POST /api/v1/accounts/bulk/ takes. The endpoint hashes in
+# the web worker, one slow hash per account; use the provisionaccounts
+# command, which hashes on every core, beyond that.
+ACCOUNTS_BULK_BATCH_SIZE = env.int("ACCOUNTS_BULK_BATCH_SIZE", default=1000)
+ACCOUNTS_BULK_MAX_SIZE = env.int("ACCOUNTS_BULK_MAX_SIZE", default=20)
+# Admin changelists of large tables (core.changelist): above this many rows
+# (as estimated by PostgreSQL) the paginator shows the estimate instead of
+# counting, and the date hierarchy's values are cached this long.
+ADMIN_EXACT_COUNT_LIMIT = env.int("ADMIN_EXACT_COUNT_LIMIT", default=10000)
+ADMIN_FILTER_CACHE_TIMEOUT = env.int("ADMIN_FILTER_CACHE_TIMEOUT", default=600)  # seconds
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
@@ -207,12 +285,26 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
+# Response compression (core.middleware.CompressionMiddleware)
+COMPRESSION_ENCODINGS = env.list("COMPRESSION_ENCODINGS", default=["zstd", "gzip"])
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)  # bytes
+COMPRESSION_CPU_BUDGET_MS = env.float("COMPRESSION_CPU_BUDGET_MS", default=20.0)
+COMPRESSION_GZIP_LEVEL = env.int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_ZSTD_LEVEL = env.int("COMPRESSION_ZSTD_LEVEL", default=3)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),  # minutes
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "UPDATE_LAST_LOGIN": True,
     "TOKEN_OBTAIN_SERIALIZER": "authentication.serializers.CustomTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": (
+        "authentication.serializers.RevocationCheckedTokenRefreshSerializer"
+    ),
+    "TOKEN_VERIFY_SERIALIZER": "authentication.serializers.RevocationCheckedTokenVerifySerializer",
 }
+# Longest delay before a token revoked in one worker is rejected by the others
+# (authentication.revocation).
+TOKEN_REVOCATION_SYNC_SECONDS = env.float("TOKEN_REVOCATION_SYNC_SECONDS", default=2.0)
 
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
@@ -221,30 +313,136 @@ SWAGGER_SETTINGS = {
     "PERSIST_AUTH": True,
 }
 
-if DEBUG:
-    LOGGING = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "handlers": {
-            "console": {
-                "level": "DEBUG",
-                "class": "logging.StreamHandler",
-                "formatter": "verbose",
-            },
+# Request profiling (core.profiling.ProfilingMiddleware): Server-Timing
+# headers and JSON log lines for a sampled fraction of requests.
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", default=0.01)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "level": "DEBUG",
+            "class": "logging.StreamHandler",
+            "formatter": "verbose",
         },
-        "formatters": {
-            "verbose": {
-                "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-                "style": "{",
-            },
+        "structured": {
+            "level": "INFO",
+            "class": "logging.StreamHandler",
+            "formatter": "message",
         },
-        "loggers": {
-            "django.db.backends": {
-                "handlers": ["console"],
-                "level": "DEBUG",
-                "propagate": False,
-            },
+    },
+    "formatters": {
+        "verbose": {
+            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
+            "style": "{",
+        },
+        "message": {
+            "format": "{message}",
+            "style": "{",
+        },
+    },
+    "loggers": {
+        "core.profiling": {
+            "handlers": ["structured"],
+            "level": "INFO",
+            "propagate": False,
         },
+    },
+}
+
+# N+1 and slow query detector (core.queries.QueryInspectorMiddleware). Findings
+# go to a rotating log file and to the "Query findings" admin page.
+QUERY_INSPECTOR_ENABLED = env.bool("QUERY_INSPECTOR_ENABLED", default=False)
+QUERY_INSPECTOR_REPEAT_THRESHOLD = env.int("QUERY_INSPECTOR_REPEAT_THRESHOLD", default=5)
+QUERY_INSPECTOR_SLOW_MS = env.float("QUERY_INSPECTOR_SLOW_MS", default=100.0)
+QUERY_INSPECTOR_LOG_FILE = env(
+    "QUERY_INSPECTOR_LOG_FILE", default=os.path.join(BASE_DIR, "logs", "queries.log")
+)
+
+if QUERY_INSPECTOR_ENABLED:
+    os.makedirs(os.path.dirname(QUERY_INSPECTOR_LOG_FILE), exist_ok=True)
+    LOGGING["handlers"]["queries_file"] = {
+        "level": "WARNING",
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": QUERY_INSPECTOR_LOG_FILE,
+        "maxBytes": 10 * 1024 * 1024,
+        "backupCount": 5,
+        "formatter": "message",
+    }
+    LOGGING["loggers"]["core.queries"] = {
+        "handlers": ["queries_file"],
+        "level": "WARNING",
+        "propagate": False,
+    }
+
+# Traffic recorder (core.recording.RequestRecorderMiddleware): one redacted
+# JSON line per sampled request, replayed with "python -m benchmarks.replay".
+REQUEST_RECORDER_ENABLED = env.bool("REQUEST_RECORDER_ENABLED", default=False)
+REQUEST_RECORDER_SAMPLE_RATE = env.float("REQUEST_RECORDER_SAMPLE_RATE", default=1.0)
+REQUEST_RECORDER_MAX_BODY = env.int("REQUEST_RECORDER_MAX_BODY", default=64 * 1024)
+REQUEST_RECORDER_REDACT = ["password", "token", "access", "refresh", "secret"]
+REQUEST_RECORDER_FILE = env(
+    "REQUEST_RECORDER_FILE", default=os.path.join(BASE_DIR, "logs", "traffic.jsonl")
+)
+
+if REQUEST_RECORDER_ENABLED:
+    os.makedirs(os.path.dirname(REQUEST_RECORDER_FILE), exist_ok=True)
+    LOGGING["handlers"]["recording_file"] = {
+        "level": "INFO",
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": REQUEST_RECORDER_FILE,
+        "maxBytes": 50 * 1024 * 1024,
+        "backupCount": 5,
+        "formatter": "message",
+    }
+    LOGGING["loggers"]["core.recording"] = {
+        "handlers": ["recording_file"],
+        "level": "INFO",
+        "propagate": False,
+    }
+
+# Rainfall quality control (stations.quality), run on every write path.
+RAINFALL_QC_NORMAL_FACTOR = env.float("RAINFALL_QC_NORMAL_FACTOR", default=1.0)
+RAINFALL_QC_MIN_THRESHOLD = env.float("RAINFALL_QC_MIN_THRESHOLD", default=50.0)  # mm
+RAINFALL_QC_NEIGHBOR_RADIUS_KM = env.float("RAINFALL_QC_NEIGHBOR_RADIUS_KM", default=25.0)
+RAINFALL_QC_MIN_NEIGHBORS = env.int("RAINFALL_QC_MIN_NEIGHBORS", default=2)
+RAINFALL_QC_MAX_JUMP = env.float("RAINFALL_QC_MAX_JUMP", default=75.0)  # mm
+RAINFALL_QC_BATCH_SIZE = env.int("RAINFALL_QC_BATCH_SIZE", default=1000)
+# Station coordinates for the spatial check, cached under the station
+# table's version; seconds only without a shared cache (SHARED_CACHE), where
+# a station added or moved in one worker would not reach the others.
+RAINFALL_QC_CACHE_TIMEOUT = env.int(
+    "RAINFALL_QC_CACHE_TIMEOUT", default=86400 if SHARED_CACHE else 5
+)  # seconds
+
+# Largest station × date matrix served by /api/v1/rainfall/matrix/.
+RAINFALL_MATRIX_MAX_CELLS = env.int("RAINFALL_MATRIX_MAX_CELLS", default=5_000_000)
+
+# Rainfall statistics (stations.statistics), cached per station. A write
+# renews the station's version only in the cache of the worker handling it,
+# so without a shared cache (SHARED_CACHE) results expire within seconds.
+RAINFALL_STATS_CACHE_TIMEOUT = env.int(
+    "RAINFALL_STATS_CACHE_TIMEOUT", default=86400 if SHARED_CACHE else 5
+)  # seconds
+# Share of days (or months) that must be reported for a total to be given.
+RAINFALL_STATS_MIN_COVERAGE = env.float("RAINFALL_STATS_MIN_COVERAGE", default=0.8)
+RAINFALL_SEASON_START = env("RAINFALL_SEASON_START", default="01-01")  # MM-DD
+RAINFALL_SPI_MIN_YEARS = env.int("RAINFALL_SPI_MIN_YEARS", default=10)
+
+# Admin dashboard (dashboard.summaries): months recomputed by each
+# refresh_dashboard run, counting the current one, and stations ranked.
+DASHBOARD_REFRESH_MONTHS = env.int("DASHBOARD_REFRESH_MONTHS", default=2)
+DASHBOARD_TOP_STATIONS = env.int("DASHBOARD_TOP_STATIONS", default=10)
+
+# Printing every SQL statement slows the dev server down considerably, so it
+# is opt-in even with DEBUG on.
+if DEBUG and env.bool("LOG_SQL", default=False):
+    LOGGING["loggers"]["django.db.backends"] = {
+        "handlers": ["console"],
+        "level": "DEBUG",
+        "propagate": False,
     }
 
 UNFOLD = {
@@ -270,7 +468,7 @@ UNFOLD = {
             "950": "oklch(0.282 0.091 267.935)",
         },
     },
-    # "DASHBOARD_CALLBACK": "dashboard.views.dashboard_callback",
+    "DASHBOARD_CALLBACK": "dashboard.views.dashboard_callback",
     "SIDEBAR": {
         "navigation": [
             {
@@ -336,6 +534,22 @@ UNFOLD = {
                     },
                 ],
             },
+            {
+                "title": _("Monitoring"),
+                "collapsible": True,
+                "items": [
+                    {
+                        "title": _("Query findings"),
+                        "icon": "query_stats",
+                        "link": reverse_lazy("admin:core_queryfinding_changelist"),
+                    },
+                    {
+                        "title": _("Data completeness"),
+                        "icon": "calendar_month",
+                        "link": reverse_lazy("admin:stations_rainfallstation_completeness"),
+                    },
+                ],
+            },
         ],
     },
     "LOGIN": {
@@ -25,7 +25,8 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
-# Use in-memory database for faster tests
+# Use in-memory database for faster tests. Each pytest-xdist worker is a
+# separate process and therefore gets its own database.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
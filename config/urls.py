@@ -29,10 +29,13 @@ from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 
 from accounts.viewsets import AccountViewSet
-from authentication.views import CustomTokenObtainPairView
+from authentication.views import CustomTokenObtainPairView, TokenRevokeView
+from core.views import DatabaseMetricsView
+from histories.views import RainfallHistoryAsyncView
 from histories.viewsets import RainfallHistoryViewSet
 from locations.viewsets import LocationViewSet
 from organizations.viewsets import OrganizationViewSet
+from stations.views import RainfallStationAsyncView, StationAsyncView
 from stations.viewsets import (
     EquipmentStationViewSet,
     RainfallStationViewSet,
@@ -61,6 +64,16 @@ router.register("stations", StationViewSet)
 router.register("equipments", EquipmentStationViewSet)
 router.register("rainfall", RainfallStationViewSet)
 
+# Async (ASGI) read-only variants of the heaviest list/retrieve endpoints.
+async_urlpatterns = [
+    path("histories/", RainfallHistoryAsyncView.as_view()),
+    path("histories/<int:pk>/", RainfallHistoryAsyncView.as_view()),
+    path("stations/", StationAsyncView.as_view()),
+    path("stations/<int:pk>/", StationAsyncView.as_view()),
+    path("rainfall/", RainfallStationAsyncView.as_view()),
+    path("rainfall/<int:pk>/", RainfallStationAsyncView.as_view()),
+]
+
 
 def home(request):
     return HttpResponse("pong")
@@ -75,6 +88,13 @@ urlpatterns = [
     path("api/auth/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/auth/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("api/auth/revoke/", TokenRevokeView.as_view(), name="token_revoke"),
+    path(
+        "api/v1/metrics/database/",
+        DatabaseMetricsView.as_view(),
+        name="database_metrics",
+    ),
+    path("api/v1/async/", include(async_urlpatterns)),
     path("api/v1/", include(router.urls)),
     path(
         "swagger<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"
@@ -0,0 +1,96 @@
+"""
+Shared test fixtures.
+
+``seeded_db`` loads a small, fixed world (location tree, organization, admin
+and observer users) with bulk inserts once per test class and rolls it back
+after the class, like ``TestCase.setUpTestData``. Each test still runs in
+its own savepoint through the ``django_db`` mark, so whatever a test writes
+is undone before the next one while the seeded rows stay.
+
+The suite also runs in parallel with pytest-xdist (``pytest -n auto
+--dist loadscope``); every worker gets its own test database.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from core.testing import assert_query_budget
+from locations.models import Location
+from organizations.models import Organization
+
+SEED_PASSWORD = "testpass123"
+
+
+@pytest.fixture(scope="session")
+def seed_password_hash():
+    """Hash the shared password once per session instead of once per user."""
+    return make_password(SEED_PASSWORD)
+
+
+def seed_world(password_hash):
+    country = Location.objects.create(
+        name="Nicaragua", code="SEED-NI", location_type="country"
+    )
+    department = Location.objects.create(
+        name="Managua", code="SEED-NI-MN", location_type="department", parent=country
+    )
+    organization = Organization.objects.create(
+        name="Instituto Nicaragüense de Estudios Territoriales",
+        code="SEED-ORG",
+        location=department,
+    )
+    User = get_user_model()
+    admin, observer = User.objects.bulk_create(
+        [
+            User(
+                username="seed-admin",
+                email="seed-admin@example.com",
+                password=password_hash,
+                organization=organization,
+                role="admin",
+                is_staff=True,
+                is_superuser=True,
+            ),
+            User(
+                username="seed-observer",
+                email="seed-observer@example.com",
+                password=password_hash,
+                organization=organization,
+                role="observer",
+            ),
+        ]
+    )
+    return SimpleNamespace(
+        country=country,
+        department=department,
+        organization=organization,
+        admin=admin,
+        observer=observer,
+        password=SEED_PASSWORD,
+    )
+
+
+@pytest.fixture(scope="class")
+def seeded_db(django_db_setup, django_db_blocker, seed_password_hash):
+    """
+    The seeded world, shared by every test of the requesting class. Tests
+    must not rely on changes to these Python objects surviving between tests.
+    """
+    with django_db_blocker.unblock():
+        atomic = transaction.atomic()
+        atomic.__enter__()
+        try:
+            yield seed_world(seed_password_hash)
+        finally:
+            transaction.set_rollback(True)
+            atomic.__exit__(None, None, None)
+
+
+@pytest.fixture
+def query_budget():
+    """``core.testing.assert_query_budget`` as a fixture."""
+    return assert_query_budget
@@ -0,0 +1,37 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+
+from core.models import QueryFinding
+
+
+@admin.register(QueryFinding)
+class QueryFindingAdmin(ModelAdmin):
+    list_display = (
+        "kind",
+        "view",
+        "serializer_field",
+        "max_count",
+        "max_duration_ms",
+        "occurrences",
+        "modified",
+    )
+    list_filter = ("kind",)
+    search_fields = ("view", "serializer_field", "sql")
+    ordering = ["-modified"]
+    readonly_fields = (
+        "kind",
+        "view",
+        "serializer_field",
+        "sql",
+        "fingerprint",
+        "path",
+        "occurrences",
+        "max_count",
+        "max_duration_ms",
+        "created",
+        "modified",
+    )
+    compressed_fields = True
+
+    def has_add_permission(self, request):
+        return False
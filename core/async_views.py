@@ -0,0 +1,197 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import ForeignKey, Q
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from authentication.auth import CookieAuthentication
+from organizations.scoping import scope_queryset
+
+
+class AsyncReadOnlyView(View):
+    """
+    Async list/retrieve endpoint for a ``ModelViewSet`` read path, served with
+    the async ORM so a single ASGI worker can hold many slow clients.
+
+    Filters, ordering, search and ``?paginator`` follow ``viewset_class``;
+    responses match the DRF JSON output of ``serializer_class``. Everything
+    the serializer touches must be loaded through ``select_related`` because
+    lazy relation loads are not allowed in async code. Like the viewset's
+    ``OrganizationScopeFilter``, rows are limited to the user's organization
+    through ``viewset_class.organization_field``, and requests go through the
+    viewset's throttles (429 with ``Retry-After`` when one refuses).
+    """
+
+    viewset_class = None
+    serializer_class = None
+    select_related = ()
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, pk=None):
+        try:
+            user = await self.authenticate(request)
+        except (AuthenticationFailed, InvalidToken) as error:
+            detail = error.detail
+            if not isinstance(detail, dict):
+                detail = {"detail": detail}
+            return self.render(detail, status.HTTP_401_UNAUTHORIZED)
+        if user is None or not user.is_authenticated:
+            return self.render(
+                {"detail": "Authentication credentials were not provided."},
+                status.HTTP_401_UNAUTHORIZED,
+            )
+        # Throttles key on request.user, which a cookie token does not set.
+        request.user = user
+        wait = await sync_to_async(self.check_throttles)(request)
+        if wait is not False:
+            error = Throttled(wait)
+            response = self.render({"detail": error.detail}, status.HTTP_429_TOO_MANY_REQUESTS)
+            if error.wait:
+                response.headers["Retry-After"] = str(error.wait)
+            return response
+
+        queryset = scope_queryset(
+            self.get_queryset(), user, self.viewset_class.organization_field
+        )
+        if pk is not None:
+            try:
+                instance = await queryset.aget(pk=pk)
+            except queryset.model.DoesNotExist:
+                return self.render({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+            return self.render(self.serialize(instance))
+
+        try:
+            queryset = await sync_to_async(self.filter_queryset)(request, queryset)
+        except ValueError as error:
+            return self.render({"detail": str(error)}, status.HTTP_400_BAD_REQUEST)
+
+        if "paginator" in request.GET:
+            return self.render(self.serialize([obj async for obj in queryset], many=True))
+        return self.render(await self.paginate(request, queryset))
+
+    async def authenticate(self, request):
+        user = await request.auser()
+        if user.is_authenticated:
+            return user
+        result = await CookieAuthentication().aauthenticate(request)
+        return result[0] if result else None
+
+    def check_throttles(self, request):
+        """
+        Runs in a worker thread (throttles use the cache). Like
+        ``APIView.check_throttles`` with ``viewset_class.throttle_classes``:
+        ``False`` if every throttle allows ``request``, else the seconds to
+        wait (``None`` if unknown).
+        """
+        throttles = [throttle_class() for throttle_class in self.viewset_class.throttle_classes]
+        durations = [
+            throttle.wait() for throttle in throttles if not throttle.allow_request(request, self)
+        ]
+        if not durations:
+            return False
+        durations = [duration for duration in durations if duration is not None]
+        return max(durations, default=None)
+
+    def get_queryset(self):
+        queryset = self.viewset_class.queryset.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def filter_queryset(self, request, queryset):
+        """
+        Runs in a worker thread: a ``filterset_class`` may query the database
+        to validate related object filters.
+        """
+        filterset_class = getattr(self.viewset_class, "filterset_class", None)
+        if filterset_class is not None:
+            filterset = filterset_class(request.GET, queryset=queryset, request=request)
+            if not filterset.is_valid():
+                raise ValueError(
+                    " ".join(
+                        f"{name}: {' '.join(errors)}"
+                        for name, errors in filterset.errors.items()
+                    )
+                )
+            queryset = filterset.qs
+        else:
+            queryset = self.filter_fields(request, queryset)
+        return self.search_and_order(request, queryset)
+
+    def filter_fields(self, request, queryset):
+        model = queryset.model
+        lookups = {}
+        for name in getattr(self.viewset_class, "filterset_fields", []):
+            value = request.GET.get(name)
+            if value in (None, ""):
+                continue
+            field = model._meta.get_field(name)
+            if isinstance(field, ForeignKey) or field.get_internal_type().endswith(
+                "IntegerField"
+            ):
+                if not value.lstrip("-").isdigit():
+                    raise ValueError(f"{name}: a whole number is required.")
+                value = int(value)
+            lookups[field.attname] = value
+        return queryset.filter(**lookups)
+
+    def search_and_order(self, request, queryset):
+        search = request.GET.get("search", "")
+        search_fields = getattr(self.viewset_class, "search_fields", [])
+        for term in search.replace(",", " ").split():
+            condition = Q()
+            for field in search_fields:
+                condition |= Q(**{f"{field}__icontains": term})
+            queryset = queryset.filter(condition)
+
+        ordering_fields = getattr(self.viewset_class, "ordering_fields", [])
+        ordering = [
+            term.strip()
+            for term in request.GET.get("ordering", "").split(",")
+            if term.strip().lstrip("-") in ordering_fields
+        ]
+        ordering = ordering or getattr(self.viewset_class, "ordering", None) or ["pk"]
+        return queryset.order_by(*ordering)
+
+    async def paginate(self, request, queryset):
+        page_size = settings.REST_FRAMEWORK.get("PAGE_SIZE") or 10
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+        count = await queryset.acount()
+        offset = (page - 1) * page_size
+        objects = [obj async for obj in queryset[offset : offset + page_size]]
+
+        url = request.build_absolute_uri()
+        next_url = None
+        if offset + page_size < count:
+            next_url = replace_query_param(url, "page", page + 1)
+        previous_url = None
+        if page > 2:
+            previous_url = replace_query_param(url, "page", page - 1)
+        elif page == 2:
+            previous_url = remove_query_param(url, "page")
+        return {
+            "count": count,
+            "next": next_url,
+            "previous": previous_url,
+            "results": self.serialize(objects, many=True),
+        }
+
+    def serialize(self, data, many=False):
+        return self.serializer_class(
+            data, many=many, context={"request": self.request}
+        ).data
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            JSONRenderer().render(data),
+            status=status_code,
+            content_type="application/json",
+        )
@@ -0,0 +1,138 @@
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd is optional
+    zstandard = None
+
+
+class GzipCodec:
+    name = "gzip"
+    fast_level = 1
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, data, level=None):
+        compressor = self.compressobj(level)
+        return compressor.compress(data) + compressor.flush()
+
+    def compressobj(self, level=None):
+        return _ZlibStream(self.level if level is None else level)
+
+
+class _ZlibStream:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush_block(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdCodec:
+    name = "zstd"
+    fast_level = 1
+
+    def __init__(self, level=3):
+        self.level = level
+
+    def compress(self, data, level=None):
+        level = self.level if level is None else level
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def compressobj(self, level=None):
+        return _ZstdStream(self.level if level is None else level)
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush_block(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+def available_codecs(gzip_level=6, zstd_level=3):
+    codecs = {"gzip": GzipCodec(gzip_level)}
+    if zstandard is not None:
+        codecs["zstd"] = ZstdCodec(zstd_level)
+    return codecs
+
+
+def parse_accept_encoding(header):
+    """Return a ``{coding: qvalue}`` mapping for an Accept-Encoding header."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        qvalue = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        accepted[coding] = qvalue
+    return accepted
+
+
+def negotiate(header, preferred):
+    """Pick the first coding in ``preferred`` the client accepts with q > 0."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    for coding in preferred:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class ThroughputEstimator:
+    """
+    Exponentially weighted compression throughput (bytes per millisecond)
+    per codec and level, used to keep each response inside a CPU budget.
+    """
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self._rates = {}
+
+    def estimate_ms(self, coding, level, size):
+        rate = self._rates.get((coding, level))
+        if not rate:
+            return 0.0
+        return size / rate
+
+    def record(self, coding, level, size, elapsed_ms):
+        if elapsed_ms <= 0 or size <= 0:
+            return
+        rate = size / elapsed_ms
+        key = (coding, level)
+        previous = self._rates.get(key)
+        if previous is None:
+            self._rates[key] = rate
+        else:
+            self._rates[key] = previous + self.alpha * (rate - previous)
+
+
+def timed_compress(codec, data, level=None):
+    """Compress ``data`` returning ``(payload, elapsed_ms)``."""
+    start = time.perf_counter()
+    payload = codec.compress(data, level)
+    return payload, (time.perf_counter() - start) * 1000
@@ -0,0 +1,42 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def pool_metrics(using=DEFAULT_DB_ALIAS):
+    """
+    Snapshot of the connection pool behind ``using``: connections in use,
+    time spent waiting for one and connections created since startup.
+    """
+    connection = connections[using]
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return {
+            "pooled": False,
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE", 0),
+            "conn_health_checks": connection.settings_dict.get(
+                "CONN_HEALTH_CHECKS", False
+            ),
+        }
+
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "pooled": True,
+        "vendor": connection.vendor,
+        "min_size": stats.get("pool_min", 0),
+        "max_size": stats.get("pool_max", 0),
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_avg": round(wait_ms / requests, 2) if requests else 0.0,
+        "connections_created": stats.get("connections_num", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "returns_bad": stats.get("returns_bad", 0),
+    }
@@ -0,0 +1,92 @@
+"""
+Model fields shared by the apps.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from django import forms
+from django.core import exceptions, validators
+from django.db import models
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+HUNDREDTH = Decimal("0.01")
+
+
+class HundredthsField(models.Field):
+    """
+    Decimal with two places stored as an integer count of hundredths, a
+    fixed-width integer column instead of ``numeric``, so ``SUM``/``AVG`` run
+    on integers. Python, forms, admin and DRF see ``Decimal`` values in the
+    original unit, e.g. ``Decimal("12.50")`` for a stored 1250; lookups and
+    aggregates convert the same way.
+
+    ``max_digits`` keeps its ``DecimalField`` meaning: up to 9 digits fit a
+    4-byte ``integer``, more need a ``bigint``.
+    """
+
+    description = _("Decimal number stored as integer hundredths")
+    decimal_places = 2
+    default_error_messages = {
+        "invalid": _("“%(value)s” value must be a decimal number."),
+    }
+
+    def __init__(self, verbose_name=None, name=None, max_digits=10, **kwargs):
+        self.max_digits = max_digits
+        super().__init__(verbose_name, name, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.max_digits != 10:
+            kwargs["max_digits"] = self.max_digits
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        # Not reported through get_internal_type(): expressions would then
+        # truncate AVG() results with int() before from_db_value() runs.
+        return connection.data_types["IntegerField" if self.max_digits <= 9 else "BigIntegerField"]
+
+    @cached_property
+    def validators(self):
+        return [
+            *super().validators,
+            validators.DecimalValidator(self.max_digits, self.decimal_places),
+        ]
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Decimal):
+            return value if value is None else value.quantize(HUNDREDTH, ROUND_HALF_UP)
+        try:
+            return Decimal(str(value)).quantize(HUNDREDTH, ROUND_HALF_UP)
+        except (InvalidOperation, ValueError):
+            raise exceptions.ValidationError(
+                self.error_messages["invalid"], code="invalid", params={"value": value}
+            )
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        if isinstance(value, int):
+            return Decimal(value).scaleb(-2)
+        # AVG and other aggregates come back as floats or numerics.
+        return Decimal(str(value)).scaleb(-2)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None or hasattr(value, "resolve_expression"):
+            return value
+        return int(self.to_python(value).scaleb(2))
+
+    def formfield(self, **kwargs):
+        return super().formfield(
+            **{
+                "max_digits": self.max_digits,
+                "decimal_places": self.decimal_places,
+                "form_class": forms.DecimalField,
+                **kwargs,
+            }
+        )
+
+
+serializers.ModelSerializer.serializer_field_mapping[HundredthsField] = serializers.DecimalField
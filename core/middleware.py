@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from core.compression import ThroughputEstimator, available_codecs, negotiate, timed_compress
+
+DEFAULT_EXCLUDED_CONTENT_TYPES = (
+    # HTML pages (the admin) carry the CSRF token next to reflected request
+    # data; compressing them would expose the token to BREACH.
+    "text/html",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/x-bzip2",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/pdf",
+    "application/octet-stream",
+)
+
+# SVG is text even though it lives under image/.
+COMPRESSIBLE_OVERRIDES = ("image/svg+xml",)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with the best encoding the client accepts (zstd, then
+    gzip). Small bodies and already-compressed media are sent as-is, and
+    buffered responses that would exceed ``COMPRESSION_CPU_BUDGET_MS`` fall
+    back to the codec's fastest level or are skipped.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        self.cpu_budget_ms = getattr(settings, "COMPRESSION_CPU_BUDGET_MS", 20.0)
+        self.excluded_content_types = tuple(
+            getattr(
+                settings,
+                "COMPRESSION_EXCLUDED_CONTENT_TYPES",
+                DEFAULT_EXCLUDED_CONTENT_TYPES,
+            )
+        )
+        self.codecs = available_codecs(
+            gzip_level=getattr(settings, "COMPRESSION_GZIP_LEVEL", 6),
+            zstd_level=getattr(settings, "COMPRESSION_ZSTD_LEVEL", 3),
+        )
+        self.encodings = [
+            encoding
+            for encoding in getattr(settings, "COMPRESSION_ENCODINGS", ["zstd", "gzip"])
+            if encoding in self.codecs
+        ]
+        self.estimator = ThroughputEstimator()
+
+    def process_response(self, request, response):
+        if not self.should_compress(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), self.encodings)
+        if encoding is None:
+            return response
+        codec = self.codecs[encoding]
+
+        if response.streaming:
+            self.compress_streaming(response, codec)
+        else:
+            level = self.pick_level(codec, len(response.content))
+            if level is None:
+                return response
+            compressed, elapsed_ms = timed_compress(codec, response.content, level)
+            self.estimator.record(encoding, level, len(response.content), elapsed_ms)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def should_compress(self, response):
+        if response.has_header("Content-Encoding"):
+            return False
+        if response.status_code in (204, 206, 304):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type.startswith(COMPRESSIBLE_OVERRIDES):
+            return True
+        if content_type.startswith(self.excluded_content_types):
+            return False
+        if not response.streaming and len(response.content) < self.min_size:
+            return False
+        return True
+
+    def pick_level(self, codec, size):
+        """
+        Return the level to compress ``size`` bytes with, or ``None`` when
+        even the fastest level is expected to blow the CPU budget.
+        """
+        for level in (codec.level, codec.fast_level):
+            if self.estimator.estimate_ms(codec.name, level, size) <= self.cpu_budget_ms:
+                return level
+        return None
+
+    def compress_streaming(self, response, codec):
+        # The final size is unknown, so streams always use the fast level and
+        # flush a block per chunk so clients can decode progressively.
+        if response.is_async:
+            original = response.streaming_content
+
+            async def compressed_content():
+                stream = codec.compressobj(codec.fast_level)
+                async for chunk in original:
+                    data = stream.compress(chunk) + stream.flush_block()
+                    if data:
+                        yield data
+                yield stream.flush()
+
+            response.streaming_content = compressed_content()
+        else:
+            response.streaming_content = self._compress_sequence(
+                response.streaming_content, codec
+            )
+        del response.headers["Content-Length"]
+
+    @staticmethod
+    def _compress_sequence(sequence, codec):
+        stream = codec.compressobj(codec.fast_level)
+        for chunk in sequence:
+            data = stream.compress(chunk) + stream.flush_block()
+            if data:
+                yield data
+        yield stream.flush()
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryFinding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('n_plus_one', 'N+1 query'), ('slow', 'slow query')], max_length=140, verbose_name='kind')),
+                ('view', models.CharField(max_length=255, verbose_name='view')),
+                ('serializer_field', models.CharField(blank=True, default='', max_length=255, verbose_name='serializer field')),
+                ('sql', models.TextField(verbose_name='sql')),
+                ('fingerprint', models.CharField(max_length=64, unique=True, verbose_name='fingerprint')),
+                ('path', models.CharField(max_length=255, verbose_name='path')),
+                ('occurrences', models.PositiveIntegerField(default=1, verbose_name='occurrences')),
+                ('max_count', models.PositiveIntegerField(default=0, verbose_name='max count')),
+                ('max_duration_ms', models.FloatField(default=0, verbose_name='max duration (ms)')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='last seen')),
+            ],
+            options={
+                'verbose_name': 'query finding',
+                'verbose_name_plural': 'query findings',
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+FINDING_KIND_CHOICES = (
+    ("n_plus_one", _("N+1 query")),
+    ("slow", _("slow query")),
+)
+
+
+class QueryFinding(models.Model):
+    kind = models.CharField(_("kind"), max_length=140, choices=FINDING_KIND_CHOICES)
+    view = models.CharField(_("view"), max_length=255)
+    serializer_field = models.CharField(
+        _("serializer field"), max_length=255, blank=True, default=""
+    )
+    sql = models.TextField(_("sql"))
+    fingerprint = models.CharField(_("fingerprint"), max_length=64, unique=True)
+    path = models.CharField(_("path"), max_length=255)
+
+    occurrences = models.PositiveIntegerField(_("occurrences"), default=1)
+    max_count = models.PositiveIntegerField(_("max count"), default=0)
+    max_duration_ms = models.FloatField(_("max duration (ms)"), default=0)
+
+    created = models.DateTimeField(_("created"), auto_now_add=True)
+    modified = models.DateTimeField(_("last seen"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("query finding")
+        verbose_name_plural = _("query findings")
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.view}"
+
+    @classmethod
+    def record(cls, fingerprint, count, duration_ms, path, **fields):
+        finding, created = cls.objects.get_or_create(
+            fingerprint=fingerprint,
+            defaults={
+                "max_count": count,
+                "max_duration_ms": duration_ms,
+                "path": path,
+                **fields,
+            },
+        )
+        if not created:
+            cls.objects.filter(pk=finding.pk).update(
+                occurrences=F("occurrences") + 1,
+                max_count=Greatest("max_count", count),
+                max_duration_ms=Greatest("max_duration_ms", duration_ms),
+                path=path,
+                modified=timezone.now(),
+            )
+        return finding
@@ -0,0 +1,141 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("core.profiling")
+
+
+class RequestProfile:
+    """
+    Per-request timings: database (count and time, from an execute wrapper),
+    view time outside the database (serialization for the API), template or
+    DRF render time and total time, all in milliseconds.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.finished = None
+        self.queries = 0
+        self.db_ms = 0.0
+        self.view_db_ms = 0.0
+
+    def capture_queries(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.queries += 1
+            self.db_ms += elapsed_ms
+            if self.view_started is not None and self.view_finished is None:
+                self.view_db_ms += elapsed_ms
+
+    def start_view(self):
+        self.view_started = time.perf_counter()
+
+    def finish_view(self):
+        self.view_finished = time.perf_counter()
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        if self.view_started is not None and self.view_finished is None:
+            self.view_finished = self.finished
+
+    @property
+    def total_ms(self):
+        return (self.finished - self.started) * 1000
+
+    @property
+    def serialize_ms(self):
+        if self.view_started is None:
+            return 0.0
+        view_ms = (self.view_finished - self.view_started) * 1000
+        return max(view_ms - self.view_db_ms, 0.0)
+
+    @property
+    def render_ms(self):
+        if self.view_finished is None:
+            return 0.0
+        return (self.finished - self.view_finished) * 1000
+
+    def metrics(self):
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_ms, 2),
+            "serialize_ms": round(self.serialize_ms, 2),
+            "render_ms": round(self.render_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+        }
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;dur={self.db_ms:.2f};desc="{self.queries} queries"',
+                f"serialize;dur={self.serialize_ms:.2f}",
+                f"render;dur={self.render_ms:.2f}",
+                f"total;dur={self.total_ms:.2f}",
+            ]
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in (``PROFILING_ENABLED``) request instrumentation. A
+    ``PROFILING_SAMPLE_RATE`` fraction of requests is profiled; those get a
+    ``Server-Timing`` header and one JSON log line on ``core.profiling``.
+    Requests outside the sample are not instrumented at all.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.01)
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = request.profile = RequestProfile()
+        with profile.capture_queries():
+            response = self.get_response(request)
+        profile.finish()
+
+        response.headers["Server-Timing"] = profile.server_timing()
+        match = request.resolver_match
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request_profile",
+                    "method": request.method,
+                    "path": request.path,
+                    "view": match.view_name if match else None,
+                    "status": response.status_code,
+                    **profile.metrics(),
+                }
+            )
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, "profile"):
+            request.profile.start_view()
+
+    def process_template_response(self, request, response):
+        if hasattr(request, "profile"):
+            request.profile.finish_view()
+        return response
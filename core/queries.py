@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import Serializer
+
+logger = logging.getLogger("core.queries")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Reduce ``sql`` to its shape: literals and IN lists become placeholders."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _IN_RE.sub("IN (...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def serializer_field_from_stack():
+    """
+    Name the serializer field being rendered when the current query runs,
+    e.g. ``RainfallHistoryReadSerializer.station``, or "" outside DRF.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == "to_representation":
+            owner = frame.f_locals.get("self")
+            field = frame.f_locals.get("field")
+            if isinstance(owner, Serializer) and field is not None:
+                return f"{type(owner).__name__}.{field.field_name}"
+        frame = frame.f_back
+    return ""
+
+
+class QueryShape:
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.serializer_field = ""
+
+
+class QueryInspector:
+    """
+    Groups the queries of one request by normalized shape. The stack is only
+    walked for the second query of a shape, which is when an N+1 starts.
+    """
+
+    def __init__(self, repeat_threshold, slow_ms):
+        self.repeat_threshold = repeat_threshold
+        self.slow_ms = slow_ms
+        self.shapes = {}
+        self.slow = []
+
+    def capture_queries(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            shape_sql = normalize_sql(sql)
+            shape = self.shapes.get(shape_sql)
+            if shape is None:
+                shape = self.shapes[shape_sql] = QueryShape(shape_sql)
+            shape.count += 1
+            shape.total_ms += elapsed_ms
+            shape.max_ms = max(shape.max_ms, elapsed_ms)
+            if shape.count == 2:
+                shape.serializer_field = serializer_field_from_stack()
+            if elapsed_ms >= self.slow_ms:
+                self.slow.append((shape, elapsed_ms))
+
+    def findings(self):
+        findings = []
+        for shape in self.shapes.values():
+            if shape.count >= self.repeat_threshold:
+                findings.append(
+                    {
+                        "kind": "n_plus_one",
+                        "sql": shape.sql,
+                        "count": shape.count,
+                        "duration_ms": round(shape.total_ms, 2),
+                        "serializer_field": shape.serializer_field,
+                    }
+                )
+        for shape, elapsed_ms in self.slow:
+            findings.append(
+                {
+                    "kind": "slow",
+                    "sql": shape.sql,
+                    "count": 1,
+                    "duration_ms": round(elapsed_ms, 2),
+                    "serializer_field": shape.serializer_field,
+                }
+            )
+        return findings
+
+
+def view_name(request):
+    match = request.resolver_match
+    if match is None:
+        return ""
+    func = match.func
+    view_class = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    if view_class is None:
+        return f"{func.__module__}.{func.__qualname__}"
+    name = f"{view_class.__module__}.{view_class.__qualname__}"
+    actions = getattr(func, "actions", None)
+    if actions and request.method.lower() in actions:
+        name += f".{actions[request.method.lower()]}"
+    return name
+
+
+class QueryInspectorMiddleware:
+    """
+    Opt-in (``QUERY_INSPECTOR_ENABLED``) N+1 and slow query detector. Shapes
+    repeated ``QUERY_INSPECTOR_REPEAT_THRESHOLD`` times in one request and
+    queries slower than ``QUERY_INSPECTOR_SLOW_MS`` are written to the
+    ``core.queries`` log and aggregated as ``QueryFinding`` rows for the admin.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSPECTOR_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.repeat_threshold = getattr(settings, "QUERY_INSPECTOR_REPEAT_THRESHOLD", 5)
+        self.slow_ms = getattr(settings, "QUERY_INSPECTOR_SLOW_MS", 100)
+
+    def __call__(self, request):
+        inspector = QueryInspector(self.repeat_threshold, self.slow_ms)
+        with inspector.capture_queries():
+            response = self.get_response(request)
+
+        findings = inspector.findings()
+        if findings:
+            self.report(request, findings)
+        return response
+
+    def report(self, request, findings):
+        from core.models import QueryFinding
+
+        view = view_name(request)
+        for finding in findings:
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "query_finding",
+                        "method": request.method,
+                        "path": request.path,
+                        "view": view,
+                        **finding,
+                    }
+                )
+            )
+            fingerprint = hashlib.sha256(
+                "|".join(
+                    (finding["kind"], view, finding["serializer_field"], finding["sql"])
+                ).encode()
+            ).hexdigest()
+            QueryFinding.record(
+                fingerprint=fingerprint,
+                count=finding["count"],
+                duration_ms=finding["duration_ms"],
+                path=request.path[:255],
+                kind=finding["kind"],
+                view=view[:255],
+                serializer_field=finding["serializer_field"][:255],
+                sql=finding["sql"],
+            )
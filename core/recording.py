@@ -0,0 +1,111 @@
+import json
+import logging
+import random
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger("core.recording")
+
+REDACTED = "[REDACTED]"
+RECORDED_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded")
+
+
+def is_sensitive(key, redact_keys):
+    key = str(key).lower()
+    return any(word in key for word in redact_keys)
+
+
+def redact(value, redact_keys):
+    """Replace values under sensitive keys, at any depth, with ``REDACTED``."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if is_sensitive(key, redact_keys) else redact(item, redact_keys)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item, redact_keys) for item in value]
+    return value
+
+
+def redact_query(query, redact_keys):
+    pairs = parse_qsl(query, keep_blank_values=True)
+    return urlencode(
+        [(key, REDACTED if is_sensitive(key, redact_keys) else value) for key, value in pairs]
+    )
+
+
+def auth_scheme(request):
+    """How the request authenticated: "bearer", "cookie", "session" or None."""
+    if request.META.get("HTTP_AUTHORIZATION", "").startswith("Bearer "):
+        return "bearer"
+    if request.COOKIES.get("access_token"):
+        return "cookie"
+    if request.COOKIES.get(settings.SESSION_COOKIE_NAME):
+        return "session"
+    return None
+
+
+class RequestRecorderMiddleware:
+    """
+    Opt-in (``REQUEST_RECORDER_ENABLED``) traffic recorder for local replay
+    with ``benchmarks.replay``. A ``REQUEST_RECORDER_SAMPLE_RATE`` fraction
+    of requests is written as one JSON line on ``core.recording``: method,
+    path, query, JSON or form body, auth scheme, status and duration.
+    Credentials are never recorded: headers and cookies are left out and
+    keys matching ``REQUEST_RECORDER_REDACT`` are masked in bodies and query
+    strings. Other bodies (uploads) are omitted.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_RECORDER_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_RECORDER_SAMPLE_RATE", 1.0)
+        self.max_body = getattr(settings, "REQUEST_RECORDER_MAX_BODY", 64 * 1024)
+        self.redact_keys = [
+            key.lower() for key in getattr(settings, "REQUEST_RECORDER_REDACT", [])
+        ]
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        record = self.describe(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        record["status"] = response.status_code
+        record["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(json.dumps(record))
+        return response
+
+    def describe(self, request):
+        content_type = request.content_type or ""
+        record = {
+            "timestamp": round(time.time(), 3),
+            "method": request.method,
+            "path": request.path,
+            "query": redact_query(request.META.get("QUERY_STRING", ""), self.redact_keys),
+            "auth": auth_scheme(request),
+            "content_type": content_type,
+            "body": None,
+        }
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+        if not length or content_type not in RECORDED_CONTENT_TYPES:
+            return record
+        if length > self.max_body:
+            record["body_omitted"] = True
+            return record
+
+        if content_type == "application/json":
+            try:
+                body = json.loads(request.body)
+            except ValueError:
+                record["body_omitted"] = True
+                return record
+            record["body"] = redact(body, self.redact_keys)
+        else:
+            record["body"] = redact_query(request.body.decode("latin-1"), self.redact_keys)
+        return record
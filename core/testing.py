@@ -0,0 +1,96 @@
+"""
+Query budget assertions for API tests.
+
+    with assert_query_budget(max_queries=2, max_db_ms=50):
+        client.get("/api/v1/histories/")
+
+    assert_constant_query_count(
+        lambda: client.get("/api/v1/histories/?paginator"),
+        populate=lambda size: ...,  # make sure ``size`` rows exist
+    )
+"""
+
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+class QueryBudget:
+    """Records SQL and time of every query on every connection while active."""
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def db_ms(self):
+        return sum(ms for _, ms in self.queries)
+
+    def describe(self):
+        return "\n".join(
+            f"  {n}. ({ms:.2f} ms) {sql}" for n, (sql, ms) in enumerate(self.queries, 1)
+        )
+
+    def check(self, max_queries=None, max_db_ms=None):
+        if max_queries is not None and self.count > max_queries:
+            raise AssertionError(
+                f"{self.count} queries executed, budget is {max_queries}:\n{self.describe()}"
+            )
+        if max_db_ms is not None and self.db_ms > max_db_ms:
+            raise AssertionError(
+                f"{self.db_ms:.2f} ms spent in the database, budget is "
+                f"{max_db_ms} ms:\n{self.describe()}"
+            )
+
+
+@contextmanager
+def assert_query_budget(max_queries=None, max_db_ms=None):
+    """Fail if the block runs more than ``max_queries`` or ``max_db_ms``."""
+    budget = QueryBudget()
+    with budget:
+        yield budget
+    budget.check(max_queries, max_db_ms)
+
+
+def assert_constant_query_count(request, populate, sizes=(10, 1000)):
+    """
+    Call ``populate(size)`` and then ``request()`` for each of ``sizes`` and
+    fail if the number of queries changes with the number of rows, which is
+    how N+1 queries from nested serializers show up.
+    """
+    budgets = {}
+    for size in sizes:
+        populate(size)
+        with QueryBudget() as budget:
+            request()
+        budgets[size] = budget
+
+    counts = {size: budget.count for size, budget in budgets.items()}
+    if len(set(counts.values())) > 1:
+        largest = budgets[max(sizes)]
+        raise AssertionError(
+            f"query count grows with the number of rows {counts}, "
+            f"queries with {max(sizes)} rows:\n{largest.describe()}"
+        )
+    return counts
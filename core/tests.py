@@ -0,0 +1,502 @@
+import gzip
+import json
+import os
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+import zstandard
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.factories import AdminUserFactory, ObserverUserFactory
+from accounts.models import User
+from core.compression import negotiate
+from core.db import pool_metrics
+from core.middleware import CompressionMiddleware
+from core.models import QueryFinding
+from core.queries import normalize_sql
+from core.recording import REDACTED
+from core.testing import assert_constant_query_count
+from benchmarks.replay import endpoint, to_request
+from histories.factories import RainfallHistoryFactory
+from histories.models import RainfallHistory
+from histories.viewsets import RainfallHistoryViewSet
+from locations.models import Location
+from organizations.models import Organization
+from stations.factories import StationFactory
+from stations.models import EquipmentStation, RainfallStation, Station
+
+PAYLOAD = json.dumps([{"station": n, "value": "12.50"} for n in range(500)]).encode()
+
+
+def json_response(request, content=PAYLOAD):
+    return HttpResponse(content, content_type="application/json")
+
+
+class TestCompressionMiddleware:
+    """Tests para CompressionMiddleware"""
+
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        self.factory = RequestFactory()
+
+    def test_negotiate_prefers_server_order(self):
+        """Test negociación respeta el orden del servidor y q=0"""
+        assert negotiate("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+        assert negotiate("gzip, zstd;q=0", ["zstd", "gzip"]) == "gzip"
+        assert negotiate("*", ["zstd", "gzip"]) == "zstd"
+        assert negotiate("br", ["zstd", "gzip"]) is None
+
+    def test_zstd_response(self):
+        """Test respuesta comprimida con zstd"""
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip, zstd")
+        response = CompressionMiddleware(json_response)(request)
+
+        assert response["Content-Encoding"] == "zstd"
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content)
+        assert zstandard.ZstdDecompressor().decompress(response.content) == PAYLOAD
+
+    def test_gzip_response(self):
+        """Test respuesta comprimida con gzip"""
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(json_response)(request)
+
+        assert response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.content) == PAYLOAD
+
+    def test_small_response_not_compressed(self):
+        """Test respuestas bajo el umbral no se comprimen"""
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(lambda r: json_response(r, b"[]"))(request)
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == b"[]"
+
+    def test_compressed_media_skipped(self):
+        """Test contenido ya comprimido no se vuelve a comprimir"""
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(
+            lambda r: HttpResponse(PAYLOAD, content_type="image/png")
+        )(request)
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_html_skipped(self):
+        """Test HTML no se comprime (BREACH)"""
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(
+            lambda r: HttpResponse(PAYLOAD, content_type="text/html; charset=utf-8")
+        )(request)
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == PAYLOAD
+
+    def test_cpu_budget_skips_compression(self, settings):
+        """Test sin presupuesto de CPU se envía sin comprimir"""
+        settings.COMPRESSION_CPU_BUDGET_MS = 0
+        middleware = CompressionMiddleware(json_response)
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+        # The first response at each level calibrates the estimator.
+        middleware(request)
+        middleware(request)
+        response = middleware(request)
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_streaming_response(self):
+        """Test respuestas en streaming se comprimen por bloques"""
+        chunks = [PAYLOAD[i : i + 1000] for i in range(0, len(PAYLOAD), 1000)]
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(
+            lambda r: StreamingHttpResponse(chunks, content_type="application/json")
+        )(request)
+
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        assert gzip.decompress(b"".join(response.streaming_content)) == PAYLOAD
+
+
+@pytest.mark.django_db
+class TestDatabaseMetrics:
+    """Tests para las métricas del pool de conexiones"""
+
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/v1/metrics/database/"
+
+    def test_metrics_without_pool(self):
+        """Test métricas sin pool reportan conexiones persistentes"""
+        metrics = pool_metrics()
+
+        assert metrics["pooled"] is False
+        assert metrics["vendor"] == "sqlite"
+
+    def test_metrics_with_pool(self, monkeypatch):
+        """Test métricas con pool reportan uso, espera y conexiones creadas"""
+        psycopg_pool = pytest.importorskip("psycopg_pool")
+        pool = psycopg_pool.ConnectionPool("", min_size=2, max_size=5, open=False)
+        monkeypatch.setattr(connection, "pool", pool, raising=False)
+
+        metrics = pool_metrics()
+
+        assert metrics["pooled"] is True
+        assert metrics["max_size"] == 5
+        assert metrics["in_use"] == metrics["size"] - metrics["available"]
+        assert metrics["connections_created"] == 0
+        assert metrics["wait_ms_avg"] == 0.0
+
+    def test_metrics_endpoint_admin_only(self):
+        """Test el endpoint de métricas solo es accesible para administradores"""
+        self.client.force_authenticate(user=ObserverUserFactory())
+        assert self.client.get(self.url).status_code == status.HTTP_403_FORBIDDEN
+
+        self.client.force_authenticate(user=AdminUserFactory())
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["pooled"] is False
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """Tests para ProfilingMiddleware"""
+
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.url = "/api/v1/stations/"
+
+    def get(self, settings, enabled, sample_rate=1.0):
+        settings.PROFILING_ENABLED = enabled
+        settings.PROFILING_SAMPLE_RATE = sample_rate
+        client = APIClient()
+        client.force_authenticate(user=AdminUserFactory())
+        return client.get(self.url)
+
+    def test_server_timing_header(self, settings, caplog):
+        """Test las peticiones muestreadas incluyen Server-Timing y log"""
+        with caplog.at_level("INFO", logger="core.profiling"):
+            response = self.get(settings, enabled=True)
+
+        assert response.status_code == status.HTTP_200_OK
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "serialize;dur=", "render;dur=", "total;dur="):
+            assert metric in timing
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["view"] == "station-list"
+        assert record["queries"] >= 1
+        assert record["total_ms"] >= record["db_ms"]
+
+    def test_disabled_by_default(self, settings):
+        """Test sin habilitar no se agrega el encabezado"""
+        response = self.get(settings, enabled=False)
+
+        assert not response.has_header("Server-Timing")
+
+    def test_unsampled_requests(self, settings):
+        """Test peticiones fuera de la muestra no se instrumentan"""
+        response = self.get(settings, enabled=True, sample_rate=0)
+
+        assert not response.has_header("Server-Timing")
+
+
+@pytest.mark.django_db
+class TestQueryInspector:
+    """Tests para el detector de consultas N+1 y lentas"""
+
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=AdminUserFactory())
+
+    def test_normalize_sql(self):
+        """Test normalización de consultas por forma"""
+        assert normalize_sql(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"
+        ) == "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?"
+
+    def without_select_related(self, monkeypatch):
+        """Quita el select_related de historiales para reproducir su N+1"""
+        monkeypatch.setattr(
+            RainfallHistoryViewSet, "queryset", RainfallHistory.objects.all()
+        )
+
+    def test_detects_nested_serializer_n_plus_one(self, settings, monkeypatch):
+        """Test detecta N+1 del serializer anidado de historiales"""
+        self.without_select_related(monkeypatch)
+        settings.QUERY_INSPECTOR_ENABLED = True
+        settings.QUERY_INSPECTOR_REPEAT_THRESHOLD = 3
+        RainfallHistoryFactory.create_batch(4)
+
+        response = self.client.get("/api/v1/histories/")
+
+        assert response.status_code == status.HTTP_200_OK
+        finding = QueryFinding.objects.get(
+            serializer_field="RainfallHistoryReadSerializer.station"
+        )
+        assert finding.kind == "n_plus_one"
+        assert finding.view == "histories.viewsets.RainfallHistoryViewSet.list"
+        assert finding.max_count == 4
+        assert "stations_station" in finding.sql
+        assert QueryFinding.objects.filter(
+            serializer_field="StationReadSerializer.organization"
+        ).exists()
+
+    def test_repeated_requests_aggregate(self, settings, monkeypatch):
+        """Test hallazgos repetidos se agregan en una sola fila"""
+        self.without_select_related(monkeypatch)
+        settings.QUERY_INSPECTOR_ENABLED = True
+        settings.QUERY_INSPECTOR_REPEAT_THRESHOLD = 3
+        RainfallHistoryFactory.create_batch(4)
+
+        self.client.get("/api/v1/histories/")
+        self.client.get("/api/v1/histories/")
+
+        finding = QueryFinding.objects.get(
+            serializer_field="RainfallHistoryReadSerializer.station"
+        )
+        assert finding.occurrences == 2
+
+    def test_slow_queries(self, settings):
+        """Test consultas sobre el umbral se reportan como lentas"""
+        settings.QUERY_INSPECTOR_ENABLED = True
+        settings.QUERY_INSPECTOR_SLOW_MS = 0
+
+        self.client.get("/api/v1/stations/")
+
+        assert QueryFinding.objects.filter(kind="slow").exists()
+
+    def test_disabled_by_default(self, settings):
+        """Test sin habilitar no se registran hallazgos"""
+        RainfallHistoryFactory.create_batch(6)
+
+        self.client.get("/api/v1/histories/")
+
+        assert not QueryFinding.objects.exists()
+
+
+@pytest.mark.django_db
+class TestRequestRecorder:
+    """Tests para el grabador de tráfico y su reproducción"""
+
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        cache.clear()
+
+    def recorded(self, caplog):
+        return [
+            json.loads(record.getMessage())
+            for record in caplog.records
+            if record.name == "core.recording"
+        ]
+
+    def test_records_request(self, settings, caplog):
+        """Test graba método, ruta, consulta, autenticación y estado"""
+        settings.REQUEST_RECORDER_ENABLED = True
+        client = APIClient()
+        client.force_authenticate(user=AdminUserFactory())
+        with caplog.at_level("INFO", logger="core.recording"):
+            response = client.get("/api/v1/stations/?search=norte&token=abc")
+
+        assert response.status_code == status.HTTP_200_OK
+        [record] = self.recorded(caplog)
+        assert record["method"] == "GET"
+        assert record["path"] == "/api/v1/stations/"
+        assert "search=norte" in record["query"]
+        assert "abc" not in record["query"]
+        assert record["status"] == 200
+        assert record["duration_ms"] >= 0
+
+    def test_redacts_credentials(self, settings, caplog):
+        """Test las contraseñas del login nunca se graban"""
+        settings.REQUEST_RECORDER_ENABLED = True
+        AdminUserFactory(username="grabado", password="secreto123")
+        with caplog.at_level("INFO", logger="core.recording"):
+            APIClient().post(
+                "/api/auth/",
+                {"username": "grabado", "password": "secreto123"},
+                format="json",
+            )
+
+        [record] = self.recorded(caplog)
+        assert record["body"] == {"username": "grabado", "password": REDACTED}
+        assert "secreto123" not in json.dumps(record)
+
+    def test_disabled_by_default(self, caplog):
+        """Test sin habilitar no se graba nada"""
+        client = APIClient()
+        client.force_authenticate(user=AdminUserFactory())
+        with caplog.at_level("INFO", logger="core.recording"):
+            client.get("/api/v1/stations/")
+
+        assert self.recorded(caplog) == []
+
+    def test_replay_request(self):
+        """Test convierte una línea grabada en una petición reproducible"""
+        record = {
+            "method": "POST",
+            "path": "/api/auth/",
+            "query": "",
+            "auth": None,
+            "content_type": "application/json",
+            "body": {"username": "grabado", "password": REDACTED},
+        }
+        request = to_request(record, secrets={"password": "secreto123"})
+
+        assert json.loads(request.body) == {"username": "grabado", "password": "secreto123"}
+        assert "Authorization" not in request.headers
+        assert endpoint({"method": "GET", "path": "/api/v1/stations/12/"}) == (
+            "GET /api/v1/stations/{id}/"
+        )
+
+
+def populate_accounts(world, size):
+    existing = User.objects.count()
+    User.objects.bulk_create(
+        User(username=f"budget{n}", password=world.admin.password, organization=world.organization)
+        for n in range(existing, size)
+    )
+    return User
+
+
+def populate_locations(world, size):
+    existing = Location.objects.count()
+    parents = [world.country, world.department]
+    Location.objects.bulk_create(
+        Location(
+            name=f"Budget {n}",
+            code=f"BGT-{n:05d}",
+            location_type="municipality",
+            parent=parents[n % 2],
+        )
+        for n in range(existing, size)
+    )
+    return Location
+
+
+def populate_organizations(world, size):
+    existing = Organization.objects.count()
+    Organization.objects.bulk_create(
+        Organization(name=f"Budget {n}", code=f"BGT-{n:05d}", location=world.department)
+        for n in range(existing, size)
+    )
+    return Organization
+
+
+def populate_stations(world, size):
+    existing = Station.objects.count()
+    Station.objects.bulk_create(
+        Station(name=f"Budget {n}", code=f"BGT{n:05d}", organization=world.organization)
+        for n in range(existing, size)
+    )
+    return Station
+
+
+def budget_station(world):
+    return Station.objects.first() or StationFactory(organization=world.organization)
+
+
+def populate_equipments(world, size):
+    station = budget_station(world)
+    existing = EquipmentStation.objects.count()
+    EquipmentStation.objects.bulk_create(
+        EquipmentStation(name=f"Budget {n}", code=f"BGT{n:05d}", station=station)
+        for n in range(existing, size)
+    )
+    return EquipmentStation
+
+
+def populate_rainfall(world, size):
+    station = budget_station(world)
+    existing = RainfallStation.objects.count()
+    RainfallStation.objects.bulk_create(
+        RainfallStation(
+            station=station,
+            registration_date=date(2020, 1, 1) + timedelta(days=n),
+            value=Decimal("3.25"),
+        )
+        for n in range(existing, size)
+    )
+    return RainfallStation
+
+
+def populate_histories(world, size):
+    station = budget_station(world)
+    existing = RainfallHistory.objects.count()
+    RainfallHistory.objects.bulk_create(
+        RainfallHistory(station=station, month=n % 12 + 1, value=Decimal("10.5"))
+        for n in range(existing, size)
+    )
+    return RainfallHistory
+
+
+# Time spent in the database depends on the machine, so it is only checked
+# when QUERY_BUDGET_DB_MS is set (milliseconds per request).
+DB_MS_BUDGET = os.environ.get("QUERY_BUDGET_DB_MS")
+DB_MS_BUDGET = float(DB_MS_BUDGET) if DB_MS_BUDGET else None
+ENDPOINTS = [
+    # URL, populate(world, size) -> model, queries for a list page and a detail.
+    ("/api/v1/accounts/", populate_accounts, 4, 3),
+    ("/api/v1/locations/", populate_locations, 2, 1),
+    ("/api/v1/organizations/", populate_organizations, 2, 1),
+    ("/api/v1/stations/", populate_stations, 2, 1),
+    ("/api/v1/equipments/", populate_equipments, 2, 1),
+    ("/api/v1/rainfall/", populate_rainfall, 2, 1),
+    ("/api/v1/histories/", populate_histories, 2, 1),
+]
+
+
+@pytest.mark.django_db
+class TestEndpointQueryBudget:
+    """Tests de presupuesto de consultas de los endpoints de la API"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.world = seeded_db
+        self.client = APIClient()
+        self.client.force_authenticate(user=seeded_db.admin)
+
+    @pytest.mark.parametrize("url, populate, max_queries, _", ENDPOINTS)
+    def test_list_budget(self, query_budget, url, populate, max_queries, _):
+        """Test los listados paginados respetan su presupuesto de consultas"""
+        populate(self.world, 10)
+        with query_budget(max_queries=max_queries, max_db_ms=DB_MS_BUDGET):
+            response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("url, populate, _, max_queries", ENDPOINTS)
+    def test_retrieve_budget(self, query_budget, url, populate, _, max_queries):
+        """Test los detalles respetan su presupuesto de consultas"""
+        obj = populate(self.world, 1).objects.order_by("-pk").first()
+        with query_budget(max_queries=max_queries, max_db_ms=DB_MS_BUDGET):
+            response = self.client.get(f"{url}{obj.pk}/")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("url, populate, _, __", ENDPOINTS)
+    def test_list_query_count_is_constant(self, url, populate, _, __):
+        """Test el número de consultas de los listados no crece de 10 a 1000 filas"""
+        assert_constant_query_count(
+            lambda: self.client.get(f"{url}?paginator"), lambda size: populate(self.world, size)
+        )
+
+    def test_me_budget(self, query_budget):
+        """Test /me respeta su presupuesto de consultas"""
+        with query_budget(max_queries=2, max_db_ms=DB_MS_BUDGET):
+            response = self.client.get("/api/v1/accounts/me/")
+
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,12 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db import pool_metrics
+
+
+class DatabaseMetricsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(status=status.HTTP_200_OK, data=pool_metrics())
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class DashboardConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'dashboard'
+
+    def ready(self):
+        from dashboard.summaries import refresh_written
+        from stations.signals import rainfall_changed
+
+        rainfall_changed.connect(refresh_written, dispatch_uid="dashboard-refresh")
@@ -0,0 +1,26 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from dashboard.summaries import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the monthly rainfall behind the admin dashboard; run it on a "
+        "schedule (the last DASHBOARD_REFRESH_MONTHS by default)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start", type=date.fromisoformat, default=None, help="first month to rebuild"
+        )
+        parser.add_argument("--end", type=date.fromisoformat, default=None)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = refresh(options["start"], options["end"], using=options["database"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{rows} station months refreshed in {elapsed:.1f}s")
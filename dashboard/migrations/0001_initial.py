@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-19 13:09
+
+import core.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('stations', '0008_rainfall_organization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRainfall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='month')),
+                ('total', core.fields.HundredthsField(blank=True, null=True, verbose_name='total')),
+                ('days', models.PositiveSmallIntegerField(default=0, verbose_name='days')),
+                ('normal', core.fields.HundredthsField(blank=True, null=True, verbose_name='normal')),
+                ('last_day', models.DateField(verbose_name='last day')),
+                ('refreshed', models.DateTimeField(auto_now=True, verbose_name='refreshed')),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stations.station', verbose_name='station')),
+            ],
+            options={
+                'verbose_name': 'monthly rainfall',
+                'verbose_name_plural': 'monthly rainfall',
+                'indexes': [models.Index(fields=['month', 'total'], name='monthly_rainfall_month_idx')],
+                'constraints': [models.UniqueConstraint(fields=('station', 'month'), name='monthly_rainfall_station_month_uniq')],
+            },
+        ),
+    ]
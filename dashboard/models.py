@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from core.fields import HundredthsField
+from stations.models import Station
+
+
+class MonthlyRainfall(models.Model):
+    """
+    A station's rainfall in one calendar month, precomputed from its readings
+    by ``dashboard.summaries.refresh``.
+    """
+
+    station = models.ForeignKey(
+        Station, verbose_name=_("station"), on_delete=models.CASCADE
+    )
+    # First day of the month.
+    month = models.DateField(_("month"))
+    # Millimetres over the trusted readings (stations.quality), and their count.
+    total = HundredthsField(_("total"), null=True, blank=True)
+    days = models.PositiveSmallIntegerField(_("days"), default=0)
+    # The station's RainfallHistory value for the calendar month when refreshed.
+    normal = HundredthsField(_("normal"), null=True, blank=True)
+    # Latest reading of the month, flagged or not.
+    last_day = models.DateField(_("last day"))
+
+    refreshed = models.DateTimeField(_("refreshed"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("monthly rainfall")
+        verbose_name_plural = _("monthly rainfall")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["station", "month"], name="monthly_rainfall_station_month_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["month", "total"], name="monthly_rainfall_month_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.station} {self.month:%Y-%m}"
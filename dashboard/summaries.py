@@ -0,0 +1,149 @@
+"""
+Precomputed rainfall figures for the admin dashboard.
+
+The dashboard shows the stations reporting today, this year's monthly totals
+against the normals in ``RainfallHistory`` and the stations with the most
+rain this month. Live, each admin page load would aggregate a year of
+``RainfallStation``; instead ``refresh`` stores one ``MonthlyRainfall`` row
+per station and month, with the station's normal for the month, and
+``summary`` reads only that table (stations × months rows), whatever the
+size of the readings table.
+
+``refresh`` recomputes whole months from one ``GROUP BY`` over their date
+range. Every write of readings (``stations.signals.rainfall_changed``)
+refreshes the current month of the stations written once it commits, so
+today's figures stay current. Writes to earlier months and new normals are
+picked up by ``manage.py refresh_dashboard``, which redoes the last
+``DASHBOARD_REFRESH_MONTHS`` and should run daily (e.g. from cron);
+``--start`` rebuilds from an earlier month after a back-fill.
+"""
+
+import calendar
+from datetime import date
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Avg, Count, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from dashboard.models import MonthlyRainfall
+from histories.models import RainfallHistory
+from stations.models import RainfallStation, Station
+
+
+def first_month(end, months):
+    """First day of the month ``months - 1`` months before ``end``'s."""
+    index = end.year * 12 + end.month - 1 - (months - 1)
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def refresh(start=None, end=None, stations=None, using=DEFAULT_DB_ALIAS):
+    """
+    Recompute ``MonthlyRainfall`` for every month from ``start``'s to
+    ``end``'s (the last ``DASHBOARD_REFRESH_MONTHS`` up to today by default),
+    only for ``stations`` if given. Returns the number of rows written.
+    """
+    end = end or date.today()
+    start = (start or first_month(end, settings.DASHBOARD_REFRESH_MONTHS)).replace(day=1)
+    end = end.replace(day=calendar.monthrange(end.year, end.month)[1])
+    readings = RainfallStation.objects.using(using).filter(registration_date__range=(start, end))
+    history = RainfallHistory.objects.using(using)
+    existing = MonthlyRainfall.objects.using(using).filter(month__range=(start, end))
+    if stations is not None:
+        readings = readings.filter(station__in=stations)
+        history = history.filter(station__in=stations)
+        existing = existing.filter(station__in=stations)
+    trusted = Q(qc_flags=0)
+    rows = (
+        readings.order_by()
+        .values("station", month_start=TruncMonth("registration_date"))
+        .annotate(
+            total=Sum("value", filter=trusted),
+            days=Count("value", filter=trusted),
+            last_day=Max("registration_date"),
+        )
+    )
+    normals = {
+        (station, month): value
+        for station, month, value in history.values_list("station", "month", "value")
+    }
+    months = [
+        MonthlyRainfall(
+            station_id=row["station"],
+            month=row["month_start"],
+            total=row["total"],
+            days=row["days"],
+            normal=normals.get((row["station"], row["month_start"].month)),
+            last_day=row["last_day"],
+        )
+        for row in rows
+    ]
+    # Upserted, so a refresh racing another one for the same station and
+    # month updates the row the other inserted instead of failing on the
+    # unique constraint; then the months left without readings go.
+    written = {}
+    for row in months:
+        written.setdefault(row.month, []).append(row.station_id)
+    kept = Q()
+    for month, station_ids in written.items():
+        kept |= Q(month=month, station__in=station_ids)
+    with transaction.atomic(using):
+        MonthlyRainfall.objects.using(using).bulk_create(
+            months,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["station", "month"],
+            update_fields=["total", "days", "normal", "last_day", "refreshed"],
+        )
+        existing.exclude(kept).delete()
+    return len(months)
+
+
+def refresh_written(sender, station_ids, using, **kwargs):
+    """
+    ``rainfall_changed`` receiver: refresh this month of the stations
+    written, once their readings are visible to every connection. A failed
+    refresh is logged and left to ``refresh_dashboard``; the write stands.
+    """
+    transaction.on_commit(
+        lambda: refresh(date.today(), date.today(), stations=station_ids, using=using),
+        using=using,
+        robust=True,
+    )
+
+
+def summary(today=None, using=DEFAULT_DB_ALIAS):
+    """The dashboard's figures as of ``today``, read from ``MonthlyRainfall``."""
+    today = today or date.today()
+    this_month = today.replace(day=1)
+    year = MonthlyRainfall.objects.using(using).filter(
+        month__range=(date(today.year, 1, 1), this_month)
+    )
+
+    # Compared with the normal only where both are known.
+    compared = Q(total__isnull=False, normal__isnull=False)
+    monthly = (
+        year.filter(total__isnull=False)
+        .order_by("month")
+        .values("month")
+        .annotate(
+            stations=Count("station"),
+            average=Avg("total"),
+            rainfall=Sum("total", filter=compared),
+            monthly_normal=Sum("normal", filter=compared),
+        )
+    )
+
+    top = (
+        year.filter(month=this_month, total__isnull=False)
+        .select_related("station")
+        .order_by("-total", "station")[: settings.DASHBOARD_TOP_STATIONS]
+    )
+    return {
+        "today": today,
+        "reporting": year.filter(month=this_month, last_day=today).count(),
+        "stations": Station.objects.using(using).count(),
+        "monthly": list(monthly),
+        "top": list(top),
+        "refreshed": year.aggregate(refreshed=Max("refreshed"))["refreshed"],
+    }
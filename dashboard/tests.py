@@ -0,0 +1,184 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import Client
+
+from core.testing import assert_constant_query_count
+from dashboard import summaries
+from dashboard.models import MonthlyRainfall
+from dashboard.summaries import refresh, summary
+from histories.factories import RainfallHistoryFactory
+from stations.factories import RainfallStationFactory, StationFactory
+from stations.models import RainfallStation
+from stations.quality import QCFlag
+
+
+@pytest.mark.django_db
+class TestMonthlyRainfall:
+    """Tests de los agregados mensuales del tablero"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Configuración inicial para cada test"""
+        self.station = StationFactory()
+        RainfallHistoryFactory(station=self.station, month=3, value=Decimal("20.00"))
+        for day, value in [(1, "1.50"), (2, "2.50"), (3, None)]:
+            RainfallStationFactory(
+                station=self.station,
+                registration_date=date(2024, 3, day),
+                value=Decimal(value) if value else None,
+            )
+        RainfallStationFactory(
+            station=self.station,
+            registration_date=date(2024, 3, 4),
+            value=Decimal("900.00"),
+            qc_flags=QCFlag.ABOVE_NORMAL,
+        )
+
+    def test_refresh_aggregates_month(self):
+        """Test el total excluye lecturas marcadas y copia la normal del mes"""
+        assert refresh(date(2024, 3, 1), date(2024, 3, 31)) == 1
+
+        row = MonthlyRainfall.objects.get()
+        assert row.station == self.station
+        assert row.month == date(2024, 3, 1)
+        assert row.total == Decimal("4.00")
+        assert row.days == 2
+        assert row.normal == Decimal("20.00")
+        assert row.last_day == date(2024, 3, 4)
+
+    def test_refresh_replaces_months_in_range(self):
+        """Test refrescar quita los meses sin lecturas y conserva los de fuera del rango"""
+        refresh(date(2024, 3, 1), date(2024, 3, 31))
+        old = MonthlyRainfall.objects.create(
+            station=self.station,
+            month=date(2023, 1, 1),
+            total=Decimal("5.00"),
+            last_day=date(2023, 1, 31),
+        )
+        RainfallStation.objects.filter(registration_date__month=3).delete()
+
+        assert refresh(date(2024, 3, 15), date(2024, 3, 15)) == 0
+
+        assert list(MonthlyRainfall.objects.all()) == [old]
+
+    def test_writes_refresh_this_month(self, django_capture_on_commit_callbacks):
+        """Test escribir lecturas refresca el mes en curso solo de esas estaciones"""
+        this_month = date.today().replace(day=1)
+        other = MonthlyRainfall.objects.create(
+            station=StationFactory(), month=this_month, total=Decimal("5.00"), last_day=this_month
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reading = RainfallStationFactory(
+                station=self.station, registration_date=date.today(), value=Decimal("3.00")
+            )
+
+        row = MonthlyRainfall.objects.get(station=self.station, month=this_month)
+        assert row.total == Decimal("3.00")
+        assert row.last_day == date.today()
+        assert summary()["reporting"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            RainfallStation.objects.filter(pk=reading.pk).delete()
+
+        assert list(MonthlyRainfall.objects.filter(month=this_month)) == [other]
+
+    def test_refresh_updates_existing_row(self):
+        """Test refrescar actualiza la fila del mes en lugar de insertar otra"""
+        row = MonthlyRainfall.objects.create(
+            station=self.station,
+            month=date(2024, 3, 1),
+            total=Decimal("1.00"),
+            last_day=date(2024, 3, 1),
+        )
+
+        refresh(date(2024, 3, 1), date(2024, 3, 31), stations=[self.station.pk])
+
+        assert list(MonthlyRainfall.objects.values_list("pk", "total")) == [
+            (row.pk, Decimal("4.00"))
+        ]
+
+    def test_summary(self):
+        """Test el resumen compara con la normal y ordena las estaciones"""
+        other = StationFactory()
+        RainfallStationFactory(
+            station=other, registration_date=date(2024, 3, 10), value=Decimal("30.00")
+        )
+        refresh(date(2024, 1, 1), date(2024, 3, 31))
+
+        figures = summary(today=date(2024, 3, 10))
+
+        assert figures["reporting"] == 1
+        assert figures["stations"] == 2
+        [month] = figures["monthly"]
+        assert month["month"] == date(2024, 3, 1)
+        assert month["stations"] == 2
+        assert month["rainfall"] == Decimal("4.00")
+        assert month["monthly_normal"] == Decimal("20.00")
+        assert [row.station for row in figures["top"]] == [other, self.station]
+
+    def test_command(self):
+        """Test el comando refresh_dashboard"""
+        out = StringIO()
+        call_command("refresh_dashboard", "--start=2024-03-01", "--end=2024-03-31", stdout=out)
+
+        assert "1 station months refreshed" in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_refresh_keeps_write(monkeypatch, caplog):
+    """Test un fallo al refrescar el tablero no hace fallar la escritura ya confirmada"""
+
+    def fail(*args, **kwargs):
+        raise IntegrityError("monthly_rainfall_station_month_uniq")
+
+    monkeypatch.setattr(summaries, "refresh", fail)
+
+    reading = RainfallStationFactory(registration_date=date.today())
+
+    assert RainfallStation.objects.filter(pk=reading.pk).exists()
+    assert "on_commit" in caplog.text
+
+
+@pytest.mark.django_db
+class TestDashboard:
+    """Tests del tablero del admin"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        self.client = Client()
+        self.client.force_login(seeded_db.admin)
+        self.station = StationFactory(name="Estación Tablero")
+
+    def populate(self, size):
+        existing = RainfallStation.objects.count()
+        today = date.today()
+        RainfallStation.objects.bulk_create(
+            RainfallStation(
+                station=self.station,
+                registration_date=today - timedelta(days=n),
+                value=Decimal("1.25"),
+            )
+            for n in range(existing, size)
+        )
+        refresh(today - timedelta(days=size), today)
+
+    def test_dashboard(self):
+        """Test el índice del admin muestra las cifras precalculadas"""
+        self.populate(10)
+
+        response = self.client.get("/admin/")
+
+        assert response.status_code == 200
+        assert response.context["reporting"] == 1
+        assert "Estación Tablero" in response.content.decode()
+
+    def test_query_count_is_constant(self):
+        """Test el tablero no consulta más al crecer las lecturas"""
+        assert_constant_query_count(lambda: self.client.get("/admin/"), self.populate)
@@ -0,0 +1,48 @@
+from django.utils import formats
+from django.utils.translation import gettext_lazy as _
+
+from dashboard.summaries import summary
+
+
+def percent(part, whole):
+    return round(100 * part / whole) if whole else None
+
+
+def as_percent(value):
+    return "—" if value is None else f"{value} %"
+
+
+def dashboard_callback(request, context):
+    """``UNFOLD["DASHBOARD_CALLBACK"]``: the admin index's figures (``dashboard.summaries``)."""
+    figures = summary()
+    context.update(
+        {
+            **figures,
+            "reporting_percent": percent(figures["reporting"], figures["stations"]) or 0,
+            "monthly_table": {
+                "headers": [_("Month"), _("Stations"), _("Average (mm)"), _("Of normal")],
+                "rows": [
+                    [
+                        formats.date_format(row["month"], "YEAR_MONTH_FORMAT"),
+                        row["stations"],
+                        formats.number_format(row["average"], 1),
+                        as_percent(percent(row["rainfall"], row["monthly_normal"])),
+                    ]
+                    for row in figures["monthly"]
+                ],
+            },
+            "top_table": {
+                "headers": [_("Station"), _("Total (mm)"), _("Days"), _("Of normal")],
+                "rows": [
+                    [
+                        f"{row.station.code} · {row.station.name}",
+                        formats.number_format(row.total, 1),
+                        row.days,
+                        as_percent(percent(row.total, row.normal)),
+                    ]
+                    for row in figures["top"]
+                ],
+            },
+        }
+    )
+    return context
@@ -1,18 +1,21 @@
 from django.contrib import admin
 
+from core.changelist import LargeTableAdminMixin
 from histories.resources import RainfallHistoryResource
 from histories.models import RainfallHistory
 
 from import_export.admin import ImportExportModelAdmin
 from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import AutocompleteSelectFilter
 from unfold.contrib.import_export.forms import ExportForm, ImportForm
 
 
-class RainfallHistoryAdmin(ModelAdmin, ImportExportModelAdmin):
+class RainfallHistoryAdmin(LargeTableAdminMixin, ModelAdmin, ImportExportModelAdmin):
     list_display = ("station", "month", "value", "created")
+    list_select_related = ("station",)
     ordering = ["-id"]
     search_fields = ("station__name",)
-    list_filter = ("station",)
+    list_filter = (("station", AutocompleteSelectFilter),)
     list_per_page = 12
 
     resource_class = RainfallHistoryResource
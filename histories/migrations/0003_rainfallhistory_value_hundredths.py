@@ -0,0 +1,40 @@
+"""
+Store ``RainfallHistory.value`` as integer hundredths.
+
+The values are copied into a new integer column with ``ROUND(value * 100)``,
+which is exact for ``numeric(10, 2)`` input, before the old column is
+dropped.
+"""
+
+import core.fields
+from django.db import migrations
+
+TABLE = "histories_rainfallhistory"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("histories", "0002_alter_rainfallhistory_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rainfallhistory",
+            name="value_hundredths",
+            field=core.fields.HundredthsField(blank=True, null=True, verbose_name="value"),
+        ),
+        migrations.RunSQL(
+            f"UPDATE {TABLE} SET value_hundredths = ROUND(value * 100) WHERE value IS NOT NULL",
+            f"UPDATE {TABLE} SET value = value_hundredths / 100.0 WHERE value_hundredths IS NOT NULL",
+        ),
+        migrations.RemoveField(
+            model_name="rainfallhistory",
+            name="value",
+        ),
+        migrations.RenameField(
+            model_name="rainfallhistory",
+            old_name="value_hundredths",
+            new_name="value",
+        ),
+    ]
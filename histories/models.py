@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from core.fields import HundredthsField
 from stations.models import Station
 
 
@@ -9,9 +10,8 @@ class RainfallHistory(models.Model):
         Station, verbose_name=_("station"), on_delete=models.PROTECT
     )
     month = models.IntegerField(_("month"), default=0)
-    value = models.DecimalField(
-        _("value"), max_digits=10, decimal_places=2, null=True, blank=True
-    )
+    # Millimetres, stored as integer hundredths.
+    value = HundredthsField(_("value"), null=True, blank=True)
 
     created = models.DateTimeField(_("created"), auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
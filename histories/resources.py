@@ -1,9 +1,11 @@
-from import_export import resources
+from import_export import fields, resources, widgets
 
 from histories.models import RainfallHistory
 
 
 class RainfallHistoryResource(resources.ModelResource):
+    value = fields.Field(attribute="value", column_name="value", widget=widgets.DecimalWidget())
+
     class Meta:
         model = RainfallHistory
         exclude = ("created", "modified")
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 
 from histories.models import RainfallHistory
+from organizations.scoping import OrganizationScopedSerializerMixin
 from stations.serializers import StationReadSerializer
 
 
-class RainfallHistorySerializer(serializers.ModelSerializer):
+class RainfallHistorySerializer(OrganizationScopedSerializerMixin, serializers.ModelSerializer):
+    scoped_fields = {"station": "organization"}
 
     class Meta:
         model = RainfallHistory
@@ -1,22 +1,24 @@
 import pytest
+from django.test import Client
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 from decimal import Decimal
 
 from histories.models import RainfallHistory
 from histories.factories import RainfallHistoryFactory
 from stations.factories import StationFactory
-from accounts.factories import AdminUserFactory
 
 
 @pytest.mark.django_db
 class TestRainfallHistoryAPI:
     """Tests API CRUD para RainfallHistoryViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/histories/"
 
@@ -386,3 +388,40 @@ class TestRainfallHistoryAPI:
         # Verificar en base de datos que el método __str__ funciona
         history = RainfallHistory.objects.get(id=response.data["id"])
         assert str(history) == "7"
+
+
+@pytest.mark.django_db
+class TestAsyncRainfallHistoryAPI:
+    """Tests para el endpoint asíncrono de historiales"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        self.client = Client()
+        self.admin_user = seeded_db.admin
+        self.base_url = "/api/v1/async/histories/"
+
+    def test_list_with_nested_station(self):
+        """Test listar historiales con la estación anidada"""
+        self.client.force_login(self.admin_user)
+        station = StationFactory(name="Estación Central")
+        RainfallHistoryFactory.create_batch(3, station=station, month=5)
+
+        response = self.client.get(f"{self.base_url}?month=5&paginator")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 3
+        assert response.json()[0]["station"]["name"] == "Estación Central"
+        assert response.json()[0]["station"]["organization"]["id"] == station.organization_id
+
+    def test_jwt_authentication(self):
+        """Test autenticación con token JWT en el encabezado"""
+        history = RainfallHistoryFactory()
+        token = AccessToken.for_user(self.admin_user)
+
+        response = self.client.get(
+            f"{self.base_url}{history.id}/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == history.id
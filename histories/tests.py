@@ -61,7 +61,7 @@ class TestRainfallHistoryCRUD:
 
     def test_update_rainfall_history(self):
         """Test actualizar un historial de lluvia"""
-        history = RainfallHistoryFactory()
+        history = RainfallHistoryFactory(month=1)
         original_month = history.month
         original_value = history.value
         original_modified = history.modified
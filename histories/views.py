@@ -1,3 +1,9 @@
-from django.shortcuts import render
+from core.async_views import AsyncReadOnlyView
+from histories.serializers import RainfallHistoryReadSerializer
+from histories.viewsets import RainfallHistoryViewSet
 
-# Create your views here.
+
+class RainfallHistoryAsyncView(AsyncReadOnlyView):
+    viewset_class = RainfallHistoryViewSet
+    serializer_class = RainfallHistoryReadSerializer
+    select_related = ("station__organization",)
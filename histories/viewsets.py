@@ -5,13 +5,16 @@ from django_filters.rest_framework import (
 
 from histories.models import RainfallHistory
 from histories.serializers import RainfallHistorySerializer, RainfallHistoryReadSerializer
+from organizations.scoping import OrganizationScopeFilter
 
 
 class RainfallHistoryViewSet(viewsets.ModelViewSet):
-    queryset = RainfallHistory.objects.all()
+    queryset = RainfallHistory.objects.select_related("station__organization")
     serializer_class = RainfallHistorySerializer
+    organization_field = "station__organization"
 
     filter_backends = [
+        OrganizationScopeFilter,
         DjangoFilterBackend,
         filters.OrderingFilter,
         filters.SearchFilter,
@@ -1,21 +1,23 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
 
 from locations.models import Location
 from locations.factories import LocationFactory
-from accounts.factories import AdminUserFactory
 
 
 @pytest.mark.django_db
 class TestLocationAPI:
     """Tests API CRUD para LocationViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
+        cache.clear()
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/locations/"
 
@@ -164,11 +166,11 @@ class TestLocationAPI:
         LocationFactory(name="Managua Centro")
         LocationFactory(name="León Norte")
         
-        response = self.client.get(f"{self.base_url}?search=Managua")
+        response = self.client.get(f"{self.base_url}?search=Centro")
         
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 1
-        assert "Managua" in response.data["results"][0]["name"]
+        assert "Centro" in response.data["results"][0]["name"]
 
     def test_ordering_locations(self):
         """Test ordenamiento por ID"""
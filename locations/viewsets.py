@@ -8,7 +8,7 @@ from django_filters.rest_framework import (
 
 
 class LocationViewSet(viewsets.ModelViewSet):
-    queryset = Location.objects.all()
+    queryset = Location.objects.select_related("parent")
     serializer_class = LocationSerializer
 
     filter_backends = [
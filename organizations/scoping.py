@@ -0,0 +1,53 @@
+"""
+Per-organization data scoping.
+
+Superusers see every organization; everybody else only sees their own.
+Viewsets declare ``organization_field``, the lookup from their model to the
+organization, and list ``OrganizationScopeFilter`` in ``filter_backends``, so
+list, retrieve, update and delete all run with ``<organization_field> =
+user.organization_id`` in the SQL instead of clients filtering what they get.
+"""
+
+from rest_framework.filters import BaseFilterBackend
+
+
+def organization_scope(user):
+    """Organization id ``user`` is limited to, or ``None`` for superusers."""
+    if user.is_superuser:
+        return None
+    return user.organization_id
+
+
+def scope_queryset(queryset, user, field):
+    """``queryset`` limited to ``user``'s organization through ``field``."""
+    organization = organization_scope(user)
+    if organization is None:
+        return queryset
+    return queryset.filter(**{field: organization})
+
+
+class OrganizationScopeFilter(BaseFilterBackend):
+    def filter_queryset(self, request, queryset, view):
+        return scope_queryset(queryset, request.user, view.organization_field)
+
+
+class OrganizationScopedSerializerMixin:
+    """
+    Limits the choices of the related fields in ``scoped_fields`` (field
+    name: lookup from the related model to the organization) to the request
+    user's organization, so writes cannot point into another organization.
+    Output-only serializers are left alone.
+    """
+
+    scoped_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or not hasattr(self, "initial_data"):
+            return fields
+        for name, lookup in self.scoped_fields.items():
+            field = fields.get(name)
+            if getattr(field, "queryset", None) is not None:
+                field.queryset = scope_queryset(field.queryset, request.user, lookup)
+        return fields
@@ -1,21 +1,23 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from organizations.models import Organization
 from organizations.factories import OrganizationFactory
 from locations.factories import LocationFactory
-from accounts.factories import AdminUserFactory
 
 
 @pytest.mark.django_db
 class TestOrganizationAPI:
     """Tests API CRUD para OrganizationViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
+        cache.clear()
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/organizations/"
 
@@ -8,7 +8,7 @@ from django_filters.rest_framework import (
 
 
 class OrganizationViewSet(viewsets.ModelViewSet):
-    queryset = Organization.objects.all()
+    queryset = Organization.objects.select_related("location")
     serializer_class = OrganizationSerializer
 
     filter_backends = [
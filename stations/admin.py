@@ -1,5 +1,16 @@
+from datetime import date
+
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.translation import gettext_lazy as _
 from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import AutocompleteSelectFilter
+
+from core.changelist import LargeTableAdminMixin, MonthListFilter
+from organizations.models import Organization
+from stations import quality
+from stations.completeness import completeness
 
 from stations.resources import RainfallStationResource, StationResource
 from stations.models import EquipmentStation, RainfallStation, Station
@@ -16,11 +27,12 @@ class EquipmentStationInline(TabularInline):
     hide_title = True
 
 
-class StationAdmin(ModelAdmin, ImportExportModelAdmin):
+class StationAdmin(LargeTableAdminMixin, ModelAdmin, ImportExportModelAdmin):
     list_display = ("name", "code", "organization", "created")
+    list_select_related = ("organization",)
     ordering = ["-id"]
     search_fields = ("name",)
-    list_filter = ("organization",)
+    list_filter = (("organization", AutocompleteSelectFilter),)
     resource_class = StationResource
     inlines = (EquipmentStationInline,)
 
@@ -29,10 +41,27 @@ class StationAdmin(ModelAdmin, ImportExportModelAdmin):
     export_form_class = ExportForm
 
 
-class RainfallStationAdmin(ModelAdmin, ImportExportModelAdmin):
-    list_display = ("station", "registration_date", "value", "created")
+class QualityListFilter(admin.SimpleListFilter):
+    title = _("quality")
+    parameter_name = "quality"
+
+    def lookups(self, request, model_admin):
+        return (("trusted", _("No flags")), ("flagged", _("Flagged")))
+
+    def queryset(self, request, queryset):
+        if self.value() == "trusted":
+            return queryset.trusted()
+        if self.value() == "flagged":
+            return queryset.filter(qc_flags__gt=0)
+        return queryset
+
+
+class RainfallStationAdmin(LargeTableAdminMixin, ModelAdmin, ImportExportModelAdmin):
+    list_display = ("station", "registration_date", "value", "qc_flags", "created")
+    # Only the station is displayed; the default follows every foreign key.
+    list_select_related = ("station",)
     fields = ("station", "registration_date", "value")
-    list_filter = ("station", "year", "month")
+    list_filter = (("station", AutocompleteSelectFilter), MonthListFilter, QualityListFilter)
     date_hierarchy = "registration_date"
     ordering = ["-id"]
     list_per_page = 31
@@ -43,6 +72,69 @@ class RainfallStationAdmin(ModelAdmin, ImportExportModelAdmin):
     import_form_class = ImportForm
     export_form_class = ExportForm
 
+    def save_model(self, request, obj, form, change):
+        quality.check_readings([obj])
+        super().save_model(request, obj, form, change)
+
+    def get_urls(self):
+        return [
+            path(
+                "completeness/",
+                self.admin_site.admin_view(self.completeness_view),
+                name="stations_rainfallstation_completeness",
+            ),
+            *super().get_urls(),
+        ]
+
+    def completeness_view(self, request):
+        """Station × month completeness of one year, as a heat map."""
+        today = date.today()
+        try:
+            year = int(request.GET.get("year", today.year))
+            start, end = date(year, 1, 1), min(date(year, 12, 31), today)
+        except ValueError:
+            year = today.year
+            start, end = date(year, 1, 1), today
+        stations = None
+        organization = request.GET.get("organization", "")
+        if organization.isdigit():
+            stations = Station.objects.filter(organization=organization)
+
+        report = completeness(start, end, stations) if start <= end else None
+        rows = []
+        if report:
+            rows = [
+                {
+                    "station": station,
+                    "cells": [
+                        {
+                            "percent": percent,
+                            "reported": reported,
+                            "expected": expected,
+                            # Red at 0 % to green at 100 %.
+                            "hue": round(percent * 1.2),
+                        }
+                        for percent, reported, expected in zip(
+                            station["percent"], station["reported"], report["expected"]
+                        )
+                    ],
+                }
+                for station in report["stations"]
+            ]
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": _("Data completeness"),
+            "year": year,
+            "organization": organization,
+            "organizations": Organization.objects.order_by("name").values_list("pk", "name"),
+            "months": report["months"] if report else [],
+            "rows": rows,
+        }
+        return TemplateResponse(
+            request, "admin/stations/rainfallstation/completeness.html", context
+        )
+
 
 admin.site.register(Station, StationAdmin)
 admin.site.register(RainfallStation, RainfallStationAdmin)
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def create_rainfall_partitions(sender, using, **kwargs):
+    from datetime import date
+
+    from stations.partitions import drain_default_partition, ensure_partitions
+
+    year = date.today().year
+    ensure_partitions([year, year + 1], using)
+    drain_default_partition(using)
 
 
 class StationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stations'
+
+    def ready(self):
+        post_migrate.connect(create_rainfall_partitions, sender=self)
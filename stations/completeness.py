@@ -0,0 +1,159 @@
+"""
+Gaps and completeness of the daily rainfall series.
+
+Both reports run as one set-based query however long the period is:
+``find_gaps`` compares every reading with the previous reading of the same
+station (``LAG``), with sentinel rows on the day before ``start`` and the
+day after ``end`` so leading and trailing gaps show up too, and
+``completeness`` counts reported days per station and month with a single
+``GROUP BY``. Nothing iterates over calendar days in Python, so 1k stations
+over 30 years is a scan of the readings, not eleven million lookups.
+"""
+
+import calendar
+from datetime import date, timedelta
+
+import numpy as np
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from stations.models import RainfallStation, Station
+
+# Date arithmetic of the gap query: day after ``previous``, day before
+# ``day`` and days between both.
+GAP_EXPRESSIONS = {
+    "sqlite": (
+        "date(previous, '+1 day')",
+        "date(day, '-1 day')",
+        "julianday(day) - julianday(previous)",
+    ),
+    "postgresql": ("previous + 1", "day - 1", "day - previous"),
+}
+
+
+def month_starts(start, end):
+    """First day of every month from ``start`` to ``end``."""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(date(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def expected_days(month, start, end):
+    """Days of ``month`` that fall between ``start`` and ``end``."""
+    first = max(month, start)
+    last = min(month.replace(day=calendar.monthrange(month.year, month.month)[1]), end)
+    return (last - first).days + 1
+
+
+def find_gaps(start, end, stations=None, using=DEFAULT_DB_ALIAS):
+    """
+    Runs of missing days between ``start`` and ``end`` for ``stations``
+    (a ``Station`` queryset, all stations by default), as a list of
+    ``{"station", "start", "end", "days"}`` ordered by station and date.
+    """
+    connection = connections[using]
+    after, before, between = GAP_EXPRESSIONS.get(connection.vendor, GAP_EXPRESSIONS["postgresql"])
+    adapt = connection.ops.adapt_datefield_value
+    table = connection.ops.quote_name(RainfallStation._meta.db_table)
+    station_table = connection.ops.quote_name(Station._meta.db_table)
+    selected, reading_filter, station_params = f"SELECT id FROM {station_table}", "", []
+    if stations is not None:
+        selected, station_params = stations.using(using).values("pk").query.sql_with_params()
+        reading_filter = "AND station_id IN (SELECT id FROM selected)"
+
+    sql = f"""
+        WITH selected (id) AS ({selected}),
+        readings AS (
+            SELECT station_id, registration_date AS day FROM {table}
+            WHERE registration_date BETWEEN %s AND %s {reading_filter}
+            UNION ALL
+            SELECT id, %s FROM selected
+            UNION ALL
+            SELECT id, %s FROM selected
+        ),
+        steps AS (
+            SELECT station_id, day,
+                   LAG(day) OVER (PARTITION BY station_id ORDER BY day) AS previous
+            FROM readings
+        )
+        SELECT station_id, {after}, {before} FROM steps
+        WHERE {between} > 1
+        ORDER BY station_id, day
+    """
+    params = [
+        *station_params,
+        adapt(start),
+        adapt(end),
+        adapt(start - timedelta(days=1)),
+        adapt(end + timedelta(days=1)),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    gaps = []
+    for station, first, last in rows:
+        if isinstance(first, str):
+            first, last = date.fromisoformat(first), date.fromisoformat(last)
+        gaps.append(
+            {"station": station, "start": first, "end": last, "days": (last - first).days + 1}
+        )
+    return gaps
+
+
+def completeness(start, end, stations=None, using=DEFAULT_DB_ALIAS):
+    """
+    Station × month matrix of reported days between ``start`` and ``end``.
+
+    Returns ``{"months", "expected", "stations"}``: the first day of each
+    month, the days each month contributes to the period, and for every
+    station its ``id``, ``code``, ``name``, ``reported`` days per month and
+    ``percent`` of expected days reported (one decimal).
+    """
+    readings = RainfallStation.objects.using(using).filter(registration_date__range=(start, end))
+    # Without a station filter the readings are scanned whole, which lets
+    # PostgreSQL use a parallel plan.
+    if stations is None:
+        stations = Station.objects.all()
+    else:
+        readings = readings.filter(station__in=stations.values("pk"))
+    stations = list(stations.using(using).order_by("pk").values_list("pk", "code", "name"))
+    months = month_starts(start, end)
+    expected = np.array([expected_days(month, start, end) for month in months])
+
+    counts = (
+        readings.annotate(period=TruncMonth("registration_date"))
+        .values_list("station", "period")
+        .annotate(reported=Count("registration_date", distinct=True))
+        .order_by()
+    )
+
+    station_ids = np.array([pk for pk, _, _ in stations], dtype=np.int64)
+    reported = np.zeros((len(stations), len(months)), dtype=np.int64)
+    first = start.year * 12 + start.month - 1
+    rows = list(counts)
+    if rows:
+        station_column, period_column, count_column = zip(*rows)
+        row_index = np.searchsorted(station_ids, np.array(station_column, dtype=np.int64))
+        month_index = np.array([p.year * 12 + p.month - 1 for p in period_column]) - first
+        reported[row_index, month_index] = count_column
+
+    percent = np.round(reported * 100 / np.maximum(expected, 1), 1)
+    return {
+        "months": months,
+        "expected": expected.tolist(),
+        "stations": [
+            {
+                "id": pk,
+                "code": code,
+                "name": name,
+                "reported": reported[index].tolist(),
+                "percent": percent[index].tolist(),
+            }
+            for index, (pk, code, name) in enumerate(stations)
+        ],
+    }
@@ -34,7 +34,4 @@ class RainfallStationFactory(DjangoModelFactory):
 
     station = factory.SubFactory(StationFactory)
     registration_date = factory.Faker("date_object")
-    day = factory.Faker("random_int", min=1, max=31)
-    month = factory.Faker("random_int", min=1, max=12)
-    year = factory.Faker("random_int", min=2020, max=2024)
     value = factory.Faker("pydecimal", left_digits=6, right_digits=2, positive=True)
@@ -0,0 +1,24 @@
+import django_filters
+
+from stations.models import RainfallStation
+
+
+class RainfallStationFilter(django_filters.FilterSet):
+    """
+    ``year``, ``start_date`` and ``end_date`` filter on ``registration_date``
+    ranges, so PostgreSQL only scans the matching yearly partitions and
+    other databases use the date index. ``month`` uses the indexed
+    generated column.
+    """
+
+    month = django_filters.NumberFilter()
+    year = django_filters.NumberFilter(method="filter_year")
+    start_date = django_filters.DateFilter(field_name="registration_date", lookup_expr="gte")
+    end_date = django_filters.DateFilter(field_name="registration_date", lookup_expr="lte")
+
+    class Meta:
+        model = RainfallStation
+        fields = ["station", "month", "year"]
+
+    def filter_year(self, queryset, name, value):
+        return queryset.filter(registration_date__year=int(value))
@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from stations.partitions import drain_default_partition, ensure_partitions, partition_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Create yearly RainfallStation partitions ahead of time, move rows out "
+        "of the DEFAULT partition and list partition sizes (PostgreSQL only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead", type=int, default=1, help="years to create after the current one"
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        year = date.today().year
+        created = ensure_partitions(range(year, year + options["ahead"] + 1), using)
+        created += drain_default_partition(using)
+        for created_year in sorted(created):
+            self.stdout.write(f"created partition for {created_year}")
+
+        stats = partition_stats(using)
+        if not stats:
+            self.stdout.write("stations_rainfallstation is not partitioned on this database")
+        for name, rows, size in stats:
+            self.stdout.write(f"{name:<40} {max(rows, 0):>12} rows {size / 1024 ** 2:>10.1f} MB")
@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from stations.quality import recheck
+
+
+class Command(BaseCommand):
+    help = "Re-run rainfall quality control on stored readings and update their flags"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, required=True)
+        parser.add_argument("--end", type=date.fromisoformat, default=date.today())
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        checked, flagged = recheck(
+            options["start"],
+            options["end"],
+            batch_size=options["batch_size"],
+            using=options["database"],
+        )
+        self.stdout.write(f"{checked} readings checked, {flagged} flagged")
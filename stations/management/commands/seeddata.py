@@ -0,0 +1,40 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from stations.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Seed organizations, stations, monthly normals and daily rainfall in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organizations", type=int, default=5)
+        parser.add_argument("--stations-per-organization", type=int, default=20)
+        parser.add_argument("--start", type=date.fromisoformat, default=date(1995, 1, 1))
+        parser.add_argument("--end", type=date.fromisoformat, default=date(2024, 12, 31))
+        parser.add_argument("--seed", type=int, default=None, help="random seed")
+        parser.add_argument("--batch-size", type=int, default=50000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        summary = seed_dataset(
+            organizations=options["organizations"],
+            stations_per_organization=options["stations_per_organization"],
+            start=options["start"],
+            end=options["end"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            using=options["database"],
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            "{organizations} organizations, {stations} stations, "
+            "{histories} histories, {rainfall} rainfall rows".format(**summary)
+        )
+        self.stdout.write(
+            f"{elapsed:.1f}s ({summary['rainfall'] / elapsed:,.0f} rainfall rows/s)"
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stations', '0002_alter_equipmentstation_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rainfallstation',
+            index=models.Index(fields=['station', 'registration_date'], name='rainfall_station_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rainfallstation',
+            index=models.Index(fields=['registration_date'], name='rainfall_date_idx'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+"""
+Partition ``stations_rainfallstation`` by year on PostgreSQL.
+
+The table is rebuilt as ``PARTITION BY RANGE (registration_date)`` with a
+DEFAULT partition and one partition per year present in the data (plus the
+current and next year). PostgreSQL requires the partition key in every
+unique constraint, so the primary key becomes ``(id, registration_date)``;
+``id`` keeps its identity sequence and stays unique in practice. Other
+databases keep the plain table.
+"""
+
+import datetime
+
+from django.db import migrations
+
+from stations.partitions import DEFAULT_PARTITION, TABLE, create_partition
+
+OLD_TABLE = f"{TABLE}_unpartitioned"
+
+
+def table_definition(cursor, table):
+    """Secondary index and foreign key DDL of ``table``, to recreate them."""
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE contype = 'p')",
+        [table],
+    )
+    statements = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    statements += [
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+        for name, definition in cursor.fetchall()
+    ]
+    return statements
+
+
+def rebuild(cursor, create_table, primary_key):
+    statements = table_definition(cursor, TABLE)
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+    cursor.execute(f"ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {OLD_TABLE}_pkey")
+    cursor.execute(create_table)
+    cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY ({primary_key})")
+    return statements
+
+
+def copy_and_finish(cursor, statements):
+    cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}")
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {TABLE}"
+    )
+    cursor.execute(f"DROP TABLE {OLD_TABLE}")
+    for statement in statements:
+        cursor.execute(statement)
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT EXTRACT(YEAR FROM registration_date)::int FROM {TABLE}"
+        )
+        this_year = datetime.date.today().year
+        years = {row[0] for row in cursor.fetchall()} | {this_year, this_year + 1}
+
+        statements = rebuild(
+            cursor,
+            f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+            "PARTITION BY RANGE (registration_date)",
+            "id, registration_date",
+        )
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+        for year in sorted(years):
+            create_partition(cursor, year)
+        copy_and_finish(cursor, statements)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        statements = rebuild(
+            cursor,
+            f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY)",
+            "id",
+        )
+        copy_and_finish(cursor, statements)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0003_rainfall_date_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,40 @@
+"""
+Store ``RainfallStation.value`` as integer hundredths of a millimetre.
+
+The values are copied into a new integer column with ``ROUND(value * 100)``,
+which is exact for ``numeric(10, 2)`` input, before the old column is
+dropped, so the conversion also works on the partitioned table.
+"""
+
+import core.fields
+from django.db import migrations
+
+TABLE = "stations_rainfallstation"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0004_partition_rainfallstation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rainfallstation",
+            name="value_hundredths",
+            field=core.fields.HundredthsField(blank=True, null=True, verbose_name="value"),
+        ),
+        migrations.RunSQL(
+            f"UPDATE {TABLE} SET value_hundredths = ROUND(value * 100) WHERE value IS NOT NULL",
+            f"UPDATE {TABLE} SET value = value_hundredths / 100.0 WHERE value_hundredths IS NOT NULL",
+        ),
+        migrations.RemoveField(
+            model_name="rainfallstation",
+            name="value",
+        ),
+        migrations.RenameField(
+            model_name="rainfallstation",
+            old_name="value_hundredths",
+            new_name="value",
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth, ExtractYear
+
+
+def fill_date_parts(apps, schema_editor):
+    """Repopulate the plain day/month/year columns when unapplying."""
+    RainfallStation = apps.get_model("stations", "RainfallStation")
+    RainfallStation.objects.using(schema_editor.connection.alias).update(
+        day=ExtractDay("registration_date"),
+        month=ExtractMonth("registration_date"),
+        year=ExtractYear("registration_date"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stations', '0005_rainfall_value_hundredths'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, fill_date_parts),
+        migrations.RemoveField(
+            model_name='rainfallstation',
+            name='day',
+        ),
+        migrations.RemoveField(
+            model_name='rainfallstation',
+            name='year',
+        ),
+        migrations.RemoveField(
+            model_name='rainfallstation',
+            name='month',
+        ),
+        migrations.AddField(
+            model_name='rainfallstation',
+            name='month',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.datetime.ExtractMonth('registration_date'), output_field=models.SmallIntegerField(), verbose_name='month'),
+        ),
+        migrations.AddIndex(
+            model_name='rainfallstation',
+            index=models.Index(fields=['month'], name='rainfall_month_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0006_rainfall_generated_month"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rainfallstation",
+            name="qc_flags",
+            field=models.PositiveSmallIntegerField(default=0, verbose_name="quality flags"),
+        ),
+        migrations.AddIndex(
+            model_name="rainfallstation",
+            index=models.Index(condition=models.Q(("qc_flags__gt", 0)), fields=["station", "registration_date"], name="rainfall_flagged_idx"),
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""
+Copy ``Station.organization`` onto ``RainfallStation`` for tenant filters.
+
+The column is added without its foreign key, filled with one set-based
+``UPDATE`` and only then constrained, so the backfill does not queue a
+deferred constraint check per reading.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_organizations(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(
+            "UPDATE stations_rainfallstation AS r SET organization_id = s.organization_id "
+            "FROM stations_station AS s WHERE s.id = r.station_id"
+        )
+        return
+    RainfallStation = apps.get_model("stations", "RainfallStation")
+    Station = apps.get_model("stations", "Station")
+    RainfallStation.objects.using(connection.alias).update(
+        organization=Subquery(
+            Station.objects.filter(pk=OuterRef("station")).values("organization")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organizations", "0001_initial"),
+        ("stations", "0007_rainfall_qc_flags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rainfallstation",
+            name="organization",
+            field=models.ForeignKey(
+                db_constraint=False,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="organizations.organization",
+                verbose_name="organization",
+            ),
+        ),
+        migrations.RunPython(copy_organizations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="rainfallstation",
+            name="organization",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="organizations.organization",
+                verbose_name="organization",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rainfallstation",
+            index=models.Index(fields=["organization", "id"], name="rainfall_org_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="rainfallstation",
+            index=models.Index(
+                fields=["organization", "registration_date"], name="rainfall_org_date_idx"
+            ),
+        ),
+    ]
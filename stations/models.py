@@ -1,7 +1,53 @@
-from django.db import models
+from django.db import models, router
+from django.db.models.functions import ExtractMonth
 from django.utils.translation import gettext_lazy as _
+from core.fields import HundredthsField
 from datetime import datetime
 from organizations.models import Organization
+from stations import versions
+from stations.partitions import ensure_partitions
+from stations.signals import rainfall_changed
+
+
+class StationQuerySet(models.QuerySet):
+    """
+    Writes renew the station table's cache version (``stations.versions``);
+    those changing the organization copy it onto the stations' readings.
+    """
+
+    def copy_organizations(self, station_ids):
+        """Set the readings of ``station_ids`` to their station's organization."""
+        if station_ids:
+            organization = self.model.objects.using(self.db).filter(pk=models.OuterRef("station"))
+            RainfallStation.objects.using(self.db).filter(station__in=station_ids).update(
+                organization=models.Subquery(organization.values("organization")[:1])
+            )
+
+    def update(self, **kwargs):
+        moved = "organization" in kwargs or "organization_id" in kwargs
+        # Taken before the update, which may change what the filter matches.
+        station_ids = set(self.order_by().values_list("pk", flat=True)) if moved else set()
+        rows = super().update(**kwargs)
+        self.copy_organizations(station_ids)
+        versions.invalidate_table(using=self.db)
+        return rows
+
+    def delete(self):
+        deleted = super().delete()
+        versions.invalidate_table(using=self.db)
+        return deleted
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        versions.invalidate_table(using=self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        # Runs through ``update`` (``organization_id=Case(...)``), which copies
+        # a changed organization onto the readings.
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        versions.invalidate_table(using=self.db)
+        return rows
 
 
 class Station(models.Model):
@@ -19,6 +65,8 @@ class Station(models.Model):
     created = models.DateTimeField(_("created"), auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
+    objects = StationQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("station")
         verbose_name_plural = _("stations")
@@ -26,6 +74,27 @@ class Station(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_organization_id = instance.__dict__.get("organization_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        super().save(*args, **kwargs)
+        versions.invalidate_table(using=using)
+        loaded = getattr(self, "_loaded_organization_id", self.organization_id)
+        if loaded != self.organization_id:
+            # Keep the organization copied onto the station's readings.
+            RainfallStation.objects.filter(station=self).update(organization=self.organization_id)
+        self._loaded_organization_id = self.organization_id
+
+    def delete(self, *args, **kwargs):
+        deleted = super().delete(*args, **kwargs)
+        versions.invalidate_table(using=self._state.db)
+        return deleted
+
 
 class EquipmentStation(models.Model):
     name = models.CharField(_("name"), max_length=140)
@@ -48,6 +117,83 @@ class EquipmentStation(models.Model):
         return self.name
 
 
+def rainfall_written(station_ids, using):
+    """
+    Called by every write path of ``RainfallStation``: bump the cache version
+    of the stations (``stations.versions``) and send ``rainfall_changed``.
+    """
+    station_ids = {pk for pk in station_ids if pk is not None}
+    if station_ids:
+        versions.invalidate(station_ids, using=using)
+        rainfall_changed.send(sender=RainfallStation, station_ids=station_ids, using=using)
+
+
+class RainfallStationQuerySet(models.QuerySet):
+    """
+    Writes go through ``rainfall_written`` and fill in the organization of
+    the station.
+    """
+
+    def trusted(self):
+        """Readings without quality-control flags (see ``stations.quality``)."""
+        return self.filter(qc_flags=0)
+
+    def affected_stations(self):
+        return set(self.order_by().values_list("station", flat=True).distinct())
+
+    def organizations(self, station_ids):
+        """Organization of every station in ``station_ids``."""
+        return dict(
+            Station.objects.using(self.db)
+            .filter(pk__in=set(station_ids))
+            .values_list("pk", "organization")
+        )
+
+    def fill_organizations(self, objs):
+        pending = [obj for obj in objs if obj.organization_id is None]
+        if pending:
+            organizations = self.organizations(obj.station_id for obj in pending)
+            for obj in pending:
+                obj.organization_id = organizations.get(obj.station_id)
+
+    def update(self, **kwargs):
+        stations = self.affected_stations()
+        moved_to = kwargs.get("station", kwargs.get("station_id"))
+        moved_to = getattr(moved_to, "pk", moved_to)
+        if hasattr(moved_to, "resolve_expression"):
+            # bulk_update's CASE; it sets the organization itself.
+            moved_to = None
+        if moved_to is not None:
+            kwargs["organization"] = self.organizations([moved_to]).get(moved_to)
+        rows = super().update(**kwargs)
+        rainfall_written(stations | {moved_to}, using=self.db)
+        return rows
+
+    def delete(self):
+        stations = self.affected_stations()
+        deleted = super().delete()
+        rainfall_written(stations, using=self.db)
+        return deleted
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.fill_organizations(objs)
+        objs = super().bulk_create(objs, *args, **kwargs)
+        rainfall_written((obj.station_id for obj in objs), using=self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if "station" in fields or "station_id" in fields:
+            for obj in objs:
+                obj.organization_id = None
+            self.fill_organizations(objs)
+            fields = [*fields, "organization"]
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        rainfall_written((obj.station_id for obj in objs), using=self.db)
+        return rows
+
+
 class RainfallStation(models.Model):
     station = models.ForeignKey(
         Station, verbose_name=_("station"), on_delete=models.PROTECT
@@ -56,26 +202,85 @@ class RainfallStation(models.Model):
         _("registration_date"),
     )
 
-    day = models.IntegerField(_("day"), default=0)
-    month = models.IntegerField(_("month"), default=0)
-    year = models.IntegerField(_("year"), default=0)
-    value = models.DecimalField(
-        _("value"), max_digits=10, decimal_places=2, null=True, blank=True
+    # Computed by the database so bulk inserts and updates stay consistent;
+    # indexed for the month filter. Year filters use registration_date ranges.
+    month = models.GeneratedField(
+        expression=ExtractMonth("registration_date"),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+        verbose_name=_("month"),
+    )
+    # Millimetres, stored as integer hundredths.
+    value = HundredthsField(_("value"), null=True, blank=True)
+    # Bit mask of stations.quality.QCFlag, set when the reading is written.
+    qc_flags = models.PositiveSmallIntegerField(_("quality flags"), default=0)
+    # Copy of station.organization, so tenant filters (organizations.scoping)
+    # and their ordering run on this table's own indexes instead of a join.
+    organization = models.ForeignKey(
+        Organization,
+        verbose_name=_("organization"),
+        on_delete=models.PROTECT,
+        editable=False,
+        db_index=False,
     )
 
     created = models.DateTimeField(_("created"), auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
+    objects = RainfallStationQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("rainfall")
         verbose_name_plural = _("rainfalls")
+        indexes = [
+            models.Index(fields=["station", "registration_date"], name="rainfall_station_date_idx"),
+            models.Index(fields=["registration_date"], name="rainfall_date_idx"),
+            models.Index(fields=["month"], name="rainfall_month_idx"),
+            models.Index(fields=["organization", "id"], name="rainfall_org_id_idx"),
+            models.Index(
+                fields=["organization", "registration_date"], name="rainfall_org_date_idx"
+            ),
+            models.Index(
+                fields=["station", "registration_date"],
+                condition=models.Q(qc_flags__gt=0),
+                name="rainfall_flagged_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.station.name
 
-    def save(self, *args, **kwargs):
-        self.day = self.registration_date.day
-        self.month = self.registration_date.month
-        self.year = self.registration_date.year
+    @property
+    def day(self):
+        return self.registration_date.day
+
+    @property
+    def year(self):
+        return self.registration_date.year
 
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        ensure_partitions([self.year], using)
+        if self.organization_id is None or self.station_id != getattr(
+            self, "_loaded_station_id", self.station_id
+        ):
+            self.organization_id = self.station.organization_id
         super().save(*args, **kwargs)
+        rainfall_written(
+            {self.station_id, getattr(self, "_loaded_station_id", None)}, using=using
+        )
+        self._loaded_station_id = self.station_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Moving a reading to another station changes both series.
+        instance._loaded_station_id = instance.__dict__.get("station_id")
+        return instance
+
+    def delete(self, *args, **kwargs):
+        station_id = self.station_id
+        deleted = super().delete(*args, **kwargs)
+        rainfall_written({station_id}, using=self._state.db)
+        return deleted
+
@@ -0,0 +1,144 @@
+"""
+Yearly range partitions of ``RainfallStation`` on PostgreSQL.
+
+Migration 0004 turns ``stations_rainfallstation`` into a table partitioned by
+range on ``registration_date``, one partition per calendar year plus a
+DEFAULT partition that catches readings for years without one. Partitions
+are created on demand (``ensure_partitions``) after ``migrate``, before a
+reading for a new year is saved, when seeding, and by the
+``rainfall_partitions`` command; rows that landed in the DEFAULT partition
+are moved into the new yearly partition when it is created.
+
+Queries prune partitions when they constrain ``registration_date``, which
+is what the ``year`` filter of ``RainfallStationViewSet`` does. On other
+databases the table is a plain table and these functions do nothing.
+"""
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+TABLE = "stations_rainfallstation"
+DEFAULT_PARTITION = f"{TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{TABLE}_y(\d{{4}})$")
+
+# Years known to have a partition, per database alias, so saves only touch
+# the catalog the first time a process writes a given year.
+_known_years = {}
+
+
+def partition_name(year):
+    return f"{TABLE}_y{year}"
+
+
+def is_partitioned(cursor):
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+        [TABLE],
+    )
+    return cursor.fetchone()[0]
+
+
+def partition_years(cursor):
+    """Years that have their own partition."""
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(%s)",
+        [TABLE],
+    )
+    years = set()
+    for (name,) in cursor.fetchall():
+        match = _PARTITION_RE.match(name)
+        if match:
+            years.add(int(match.group(1)))
+    return years
+
+
+def stored_columns(cursor, table):
+    """Columns of ``table`` that accept inserts (not generated)."""
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = %s AND is_generated = 'NEVER' ORDER BY ordinal_position",
+        [table],
+    )
+    return ", ".join(row[0] for row in cursor.fetchall())
+
+
+def create_partition(cursor, year):
+    """
+    Create and attach the partition for ``year``, first moving any of its
+    rows out of the DEFAULT partition (attaching fails otherwise).
+    """
+    name = partition_name(year)
+    start, end = f"{year}-01-01", f"{year + 1}-01-01"
+    cursor.execute(
+        f"CREATE TABLE {name} "
+        f"(LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+    )
+    columns = stored_columns(cursor, TABLE)
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE registration_date >= '{start}' AND registration_date < '{end}' RETURNING *) "
+        f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+    )
+    cursor.execute(
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+def ensure_partitions(years, using=DEFAULT_DB_ALIAS):
+    """Create the missing yearly partitions for ``years``; returns the new ones."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+    known = _known_years.setdefault(using, set())
+    missing = set(years) - known
+    if not missing:
+        return []
+
+    created = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            known.update(missing)
+            return []
+        # Serialize concurrent creators; the loser sees the partitions exist.
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [TABLE])
+        existing = partition_years(cursor)
+        for year in sorted(missing - existing):
+            create_partition(cursor, year)
+            created.append(year)
+        transaction.on_commit(lambda: known.update(missing), using=using)
+    return created
+
+
+def drain_default_partition(using=DEFAULT_DB_ALIAS):
+    """Give every year found in the DEFAULT partition its own partition."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            return []
+        cursor.execute(
+            f"SELECT DISTINCT EXTRACT(YEAR FROM registration_date)::int FROM {DEFAULT_PARTITION}"
+        )
+        years = [row[0] for row in cursor.fetchall()]
+    _known_years.get(using, set()).difference_update(years)
+    return ensure_partitions(years, using)
+
+
+def partition_stats(using=DEFAULT_DB_ALIAS):
+    """``(name, estimated rows, total bytes)`` for every partition."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname, child.reltuples::bigint, pg_total_relation_size(child.oid) "
+            "FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s) ORDER BY child.relname",
+            [TABLE],
+        )
+        return cursor.fetchall()
@@ -0,0 +1,255 @@
+"""
+Quality control of rainfall readings on ingestion.
+
+``check_readings`` flags a batch of ``RainfallStation`` instances before they
+are written, with a fixed number of queries per batch and NumPy passes over
+the whole batch instead of per-row lookups:
+
+* ``NEGATIVE``: the value is below zero.
+* ``ABOVE_NORMAL``: the value exceeds the station's threshold for the month,
+  ``RAINFALL_QC_NORMAL_FACTOR`` times its ``RainfallHistory`` normal but at
+  least ``RAINFALL_QC_MIN_THRESHOLD`` mm.
+* ``SPATIAL_JUMP``: the value exceeds the median of the same day at the
+  stations within ``RAINFALL_QC_NEIGHBOR_RADIUS_KM`` by more than
+  ``RAINFALL_QC_MAX_JUMP`` mm (only with ``RAINFALL_QC_MIN_NEIGHBORS``
+  neighbours reporting).
+
+Flags are stored in ``RainfallStation.qc_flags`` (0 means no flag), so
+aggregates skip suspect data with ``RainfallStation.objects.trusted()``.
+"""
+
+import enum
+import warnings
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from histories.models import RainfallHistory
+from stations.models import RainfallStation, Station
+from stations.partitions import ensure_partitions
+from stations.versions import table_version
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class QCFlag(enum.IntFlag):
+    NEGATIVE = 1
+    ABOVE_NORMAL = 2
+    SPATIAL_JUMP = 4
+
+
+def describe(flags):
+    """Names of the flags set in ``flags``."""
+    return [flag.name.lower() for flag in QCFlag if flags & flag]
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def day_numbers(dates):
+    return np.array([day.toordinal() for day in dates], dtype=np.int64)
+
+
+def lookup(keys, values, wanted):
+    """``values`` at ``wanted`` keys (NaN where missing); ``keys`` sorted."""
+    if not len(keys):
+        return np.full(np.shape(wanted), np.nan)
+    positions = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    return np.where(keys[positions] == wanted, values[positions], np.nan)
+
+
+def sorted_table(keys, values):
+    order = np.argsort(keys, kind="stable")
+    return keys[order], values[order]
+
+
+def distances_km(lat1, lon1, lat2, lon2):
+    """Haversine distances between every point of 1 (rows) and of 2 (columns)."""
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    dlat = lat2[None, :] - lat1[:, None]
+    dlon = lon2[None, :] - lon1[:, None]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1)[:, None] * np.cos(lat2)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def above_normal(stations, months, values, using):
+    """Readings above their station and month threshold."""
+    rows = list(
+        RainfallHistory.objects.using(using)
+        .filter(station__in=set(stations.tolist()), value__isnull=False)
+        .values_list("station", "month", "value")
+    )
+    normals = np.full(len(values), np.nan)
+    if rows:
+        history_station, history_month, normal = (np.array(column) for column in zip(*rows))
+        keys, table = sorted_table(
+            history_station.astype(np.int64) * 100 + history_month.astype(np.int64),
+            normal.astype(float),
+        )
+        normals = lookup(keys, table, stations * 100 + months)
+    # fmax: stations without a normal still get the minimum threshold.
+    thresholds = np.fmax(
+        normals * settings.RAINFALL_QC_NORMAL_FACTOR, settings.RAINFALL_QC_MIN_THRESHOLD
+    )
+    return values > thresholds
+
+
+def station_coordinates(using):
+    """
+    ``(pk, latitude, longitude)`` rows of every located station, by ``pk``.
+    Cached under the station table's version, so checking a batch does not
+    read and parse the whole table again until a station changes (or, with a
+    per-process cache, for more than ``RAINFALL_QC_CACHE_TIMEOUT`` seconds).
+    """
+    key = f"station-coordinates:{using}:{table_version()}"
+    coordinates = cache.get(key)
+    if coordinates is None:
+        coordinates = np.array(
+            [
+                (pk, to_float(latitude), to_float(longitude))
+                for pk, latitude, longitude in Station.objects.using(using)
+                .order_by("pk")
+                .values_list("pk", "latitude", "longitude")
+            ]
+        ).reshape(-1, 3)
+        located = ~np.isnan(coordinates[:, 1:]).any(axis=1)
+        coordinates = coordinates[located]
+        cache.set(key, coordinates, timeout=settings.RAINFALL_QC_CACHE_TIMEOUT)
+    return coordinates
+
+
+def spatial_jumps(stations, days, values, readings, using):
+    """Readings far above the median of their neighbours on the same day."""
+    coordinates = station_coordinates(using)
+    batch_stations = np.unique(stations)
+    own = np.isin(coordinates[:, 0], batch_stations)
+    if not own.any():
+        return np.zeros(len(values), dtype=bool)
+
+    distances = distances_km(
+        coordinates[own, 1], coordinates[own, 2], coordinates[:, 1], coordinates[:, 2]
+    )
+    close = (distances <= settings.RAINFALL_QC_NEIGHBOR_RADIUS_KM) & (
+        coordinates[own, 0][:, None] != coordinates[None, :, 0]
+    )
+    candidates = coordinates[close.any(axis=0), 0].astype(np.int64)
+    if not len(candidates):
+        return np.zeros(len(values), dtype=bool)
+    close = close[:, close.any(axis=0)]
+
+    # Same-day values of every candidate neighbour: stored readings first,
+    # overridden by the readings of this batch.
+    stored = list(
+        RainfallStation.objects.using(using)
+        .filter(
+            station__in=candidates.tolist(),
+            registration_date__range=(
+                min(reading.registration_date for reading in readings),
+                max(reading.registration_date for reading in readings),
+            ),
+            value__isnull=False,
+            qc_flags=0,
+        )
+        .values_list("station", "registration_date", "value")
+    )
+    key_parts = [(station, day.toordinal(), float(value)) for station, day, value in stored]
+    key_parts += [
+        (station, day, value)
+        for station, day, value in zip(stations.tolist(), days.tolist(), values.tolist())
+        if not np.isnan(value)
+    ]
+    if not key_parts:
+        return np.zeros(len(values), dtype=bool)
+    station_column, day_column, value_column = (np.array(c) for c in zip(*key_parts))
+    span = int(max(day_column.max(), days.max())) + 1
+    keys = station_column.astype(np.int64) * span + day_column.astype(np.int64)
+    # Later entries (the batch) win over stored values for the same key.
+    keys, unique_index = np.unique(keys[::-1], return_index=True)
+    neighbour_values = value_column[::-1][unique_index]
+
+    # One row per reading, one column per candidate neighbour.
+    own_row = np.searchsorted(coordinates[own, 0].astype(np.int64), stations)
+    has_row = np.isin(stations, coordinates[own, 0].astype(np.int64))
+    mask = close[np.where(has_row, own_row, 0)] & has_row[:, None]
+    same_day = lookup(keys, neighbour_values, candidates[None, :] * span + days[:, None])
+    same_day = np.where(mask, same_day, np.nan)
+
+    reporting = (~np.isnan(same_day)).sum(axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        median = np.nanmedian(same_day, axis=1)
+    return (reporting >= settings.RAINFALL_QC_MIN_NEIGHBORS) & (
+        values - median > settings.RAINFALL_QC_MAX_JUMP
+    )
+
+
+def check_readings(readings, using=DEFAULT_DB_ALIAS):
+    """
+    Set ``qc_flags`` on every reading of ``readings`` (``RainfallStation``
+    instances, saved or not). Returns the number of flagged readings.
+    """
+    readings = list(readings)
+    if not readings:
+        return 0
+    stations = np.array([reading.station_id for reading in readings], dtype=np.int64)
+    months = np.array([reading.registration_date.month for reading in readings], dtype=np.int64)
+    days = day_numbers(reading.registration_date for reading in readings)
+    values = np.array([to_float(reading.value) for reading in readings])
+
+    flags = np.zeros(len(readings), dtype=np.int64)
+    with np.errstate(invalid="ignore"):
+        flags[values < 0] |= QCFlag.NEGATIVE
+        flags[above_normal(stations, months, values, using)] |= QCFlag.ABOVE_NORMAL
+        flags[spatial_jumps(stations, days, values, readings, using)] |= QCFlag.SPATIAL_JUMP
+
+    for reading, value in zip(readings, flags.tolist()):
+        reading.qc_flags = value
+    return int(np.count_nonzero(flags))
+
+
+def ingest(readings, batch_size=None, using=DEFAULT_DB_ALIAS):
+    """
+    Check and ``bulk_create`` unsaved ``readings`` in batches of
+    ``RAINFALL_QC_BATCH_SIZE``. Returns ``(created, flagged)``.
+    """
+    readings = list(readings)
+    batch_size = batch_size or settings.RAINFALL_QC_BATCH_SIZE
+    created = flagged = 0
+    for start in range(0, len(readings), batch_size):
+        batch = readings[start : start + batch_size]
+        flagged += check_readings(batch, using)
+        ensure_partitions({reading.registration_date.year for reading in batch}, using)
+        created += len(RainfallStation.objects.using(using).bulk_create(batch))
+    return created, flagged
+
+
+def recheck(start, end, batch_size=None, using=DEFAULT_DB_ALIAS):
+    """
+    Re-run the checks on the stored readings between ``start`` and ``end``,
+    a window of whole days at a time so every day is checked against all its
+    neighbours at once. Returns ``(checked, flagged)``.
+    """
+    batch_size = batch_size or settings.RAINFALL_QC_BATCH_SIZE
+    window = timedelta(days=max(1, batch_size // max(1, Station.objects.using(using).count())))
+    queryset = RainfallStation.objects.using(using).only(
+        "id", "station", "registration_date", "value", "qc_flags"
+    )
+    checked = flagged = 0
+    first = start
+    while first <= end:
+        last = min(first + window - timedelta(days=1), end)
+        batch = list(queryset.filter(registration_date__range=(first, last)))
+        before = [reading.qc_flags for reading in batch]
+        flagged += check_readings(batch, using)
+        changed = [reading for reading, flags in zip(batch, before) if reading.qc_flags != flags]
+        RainfallStation.objects.using(using).bulk_update(changed, ["qc_flags"], batch_size=batch_size)
+        checked += len(batch)
+        first = last + timedelta(days=1)
+    return checked, flagged
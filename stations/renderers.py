@@ -0,0 +1,23 @@
+import io
+
+import numpy as np
+from rest_framework import renderers
+
+
+class NpzRenderer(renderers.BaseRenderer):
+    """
+    Renders a dict of arrays as an uncompressed NumPy ``.npz`` archive,
+    readable with ``numpy.load(io.BytesIO(response.content))``. The media
+    type is not in the compression middleware exclusions, so the transport
+    still gets zstd/gzip when the client accepts it.
+    """
+
+    media_type = "application/x-npz"
+    format = "npz"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = io.BytesIO()
+        np.savez(buffer, **{key: np.asarray(value) for key, value in data.items()})
+        return buffer.getvalue()
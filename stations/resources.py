@@ -1,7 +1,10 @@
-from import_export import resources
+from django.conf import settings
+from import_export import fields, resources, widgets
 
 from histories.models import Station
+from stations import quality
 from stations.models import RainfallStation
+from stations.partitions import ensure_partitions
 
 
 class StationResource(resources.ModelResource):
@@ -10,6 +13,26 @@ class StationResource(resources.ModelResource):
         exclude = ("created", "modified")
 
 class RainfallStationResource(resources.ModelResource):
+    value = fields.Field(attribute="value", column_name="value", widget=widgets.DecimalWidget())
+
     class Meta:
         model = RainfallStation
-        exclude = ("day", "month", "year", "created", "modified")
\ No newline at end of file
+        exclude = ("month", "qc_flags", "organization", "created", "modified")
+        # Rows are saved in batches so quality control runs once per batch.
+        use_bulk = True
+        batch_size = settings.RAINFALL_QC_BATCH_SIZE
+
+    def get_bulk_update_fields(self):
+        return [*super().get_bulk_update_fields(), "qc_flags"]
+
+    def prepare_batch(self, instances):
+        quality.check_readings(instances)
+        ensure_partitions({instance.registration_date.year for instance in instances})
+
+    def bulk_create(self, *args, **kwargs):
+        self.prepare_batch(self.create_instances)
+        super().bulk_create(*args, **kwargs)
+
+    def bulk_update(self, *args, **kwargs):
+        self.prepare_batch(self.update_instances)
+        super().bulk_update(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Bulk data seeding for performance work.
+
+Datasets are generated as NumPy arrays (one array per column) and written
+with ``COPY`` on PostgreSQL or batched ``executemany`` elsewhere, bypassing
+model instances entirely. What the model write paths would have done is done
+once at the end: new cache versions for the station table and the seeded
+stations, and the dashboard's months of the seeded range.
+"""
+
+from datetime import date
+
+import numpy as np
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from histories.models import RainfallHistory
+from locations.models import Location
+from organizations.models import Organization
+from stations import versions
+from stations.models import RainfallStation, Station, rainfall_written
+from stations.partitions import ensure_partitions
+
+# Pacific Nicaragua climatology: dry season December-April, bimodal rainy
+# season peaking in June and September-October. Index 0 is January.
+RAIN_PROBABILITY = np.array(
+    [0.05, 0.03, 0.03, 0.08, 0.45, 0.70, 0.55, 0.60, 0.75, 0.70, 0.35, 0.10]
+)
+MEAN_WET_DAY_MM = np.array(
+    [3.0, 2.5, 3.0, 6.0, 12.0, 14.0, 10.0, 11.0, 15.0, 16.0, 9.0, 4.0]
+)
+# Gamma shape for wet-day amounts; < 1 gives many light days and few storms.
+WET_DAY_SHAPE = 0.7
+
+
+def bulk_insert(model, columns, batch_size=50000, using=DEFAULT_DB_ALIAS):
+    """
+    Insert rows given as ``{field_name: sequence}`` columns into ``model``'s
+    table. Values must already be in their database representation.
+    Returns the number of rows inserted.
+    """
+    connection = connections[using]
+    opts = model._meta
+    names = list(columns)
+    db_columns = ", ".join(
+        connection.ops.quote_name(opts.get_field(name).column) for name in names
+    )
+    table = connection.ops.quote_name(opts.db_table)
+    values = [
+        column.tolist() if isinstance(column, np.ndarray) else list(column)
+        for column in columns.values()
+    ]
+    total = len(values[0]) if values else 0
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            with cursor.cursor.copy(f"COPY {table} ({db_columns}) FROM STDIN") as copy:
+                for row in zip(*values):
+                    copy.write_row(row)
+        else:
+            placeholders = ", ".join(["%s"] * len(names))
+            sql = f"INSERT INTO {table} ({db_columns}) VALUES ({placeholders})"
+            for start in range(0, total, batch_size):
+                cursor.executemany(
+                    sql, list(zip(*(column[start : start + batch_size] for column in values)))
+                )
+    return total
+
+
+def date_range(start, end):
+    """Contiguous daily ``datetime64[D]`` array from ``start`` to ``end``."""
+    return np.arange(
+        np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="datetime64[D]"
+    )
+
+
+def seasonal_rainfall(dates, rng):
+    """Daily rainfall in mm (2 decimals) with the seasonal climatology."""
+    months = dates.astype("datetime64[M]").astype(int) % 12
+    wet = rng.random(len(dates)) < RAIN_PROBABILITY[months]
+    scale = MEAN_WET_DAY_MM[months] / WET_DAY_SHAPE
+    amounts = rng.gamma(WET_DAY_SHAPE, scale)
+    return np.round(np.where(wet, amounts, 0.0), 2)
+
+
+def to_hundredths(mm):
+    """``HundredthsField`` database representation of millimetre amounts."""
+    return np.rint(np.asarray(mm) * 100).astype(np.int64)
+
+
+def timestamp_column(length, using=DEFAULT_DB_ALIAS):
+    value = connections[using].ops.adapt_datetimefield_value(timezone.now())
+    return [value] * length
+
+
+def seed_stations(organizations, stations_per_organization, using=DEFAULT_DB_ALIAS):
+    """Create ``stations_per_organization`` stations for each organization."""
+    count = len(organizations) * stations_per_organization
+    first = Station.objects.using(using).count()
+    last_pk = Station.objects.using(using).aggregate(last=Max("pk"))["last"] or 0
+    organization_ids = np.repeat(
+        np.array([organization.pk for organization in organizations]),
+        stations_per_organization,
+    )
+    numbers = np.arange(first, first + count)
+    bulk_insert(
+        Station,
+        {
+            "name": [f"Station {n}" for n in numbers],
+            "code": [f"STA{n:05d}" for n in numbers],
+            "organization": organization_ids,
+            "created": timestamp_column(count, using),
+            "modified": timestamp_column(count, using),
+        },
+        using=using,
+    )
+    versions.invalidate_table(using)
+    return list(
+        Station.objects.using(using)
+        .filter(pk__gt=last_pk)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def seed_rainfall(station_ids, start, end, rng=None, batch_size=50000, using=DEFAULT_DB_ALIAS):
+    """
+    Insert one reading per station and day from ``start`` to ``end``.
+    Stations are written one at a time to keep memory flat on long ranges.
+    """
+    rng = rng or np.random.default_rng()
+    ensure_partitions(range(start.year, end.year + 1), using)
+    dates = date_range(start, end)
+    iso_dates = np.datetime_as_string(dates, unit="D")
+    created = timestamp_column(len(dates), using)
+
+    organizations = dict(
+        Station.objects.using(using).filter(pk__in=station_ids).values_list("pk", "organization")
+    )
+
+    total = 0
+    for station_id in station_ids:
+        total += bulk_insert(
+            RainfallStation,
+            {
+                "station": np.full(len(dates), station_id),
+                "organization": np.full(len(dates), organizations[station_id]),
+                "registration_date": iso_dates,
+                "value": to_hundredths(seasonal_rainfall(dates, rng)),
+                "qc_flags": np.zeros(len(dates), dtype=np.int64),
+                "created": created,
+                "modified": created,
+            },
+            batch_size=batch_size,
+            using=using,
+        )
+    return total
+
+
+def seed_histories(station_ids, using=DEFAULT_DB_ALIAS):
+    """Monthly normals (expected total in mm) for each station."""
+    days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    normals = np.round(RAIN_PROBABILITY * MEAN_WET_DAY_MM * days_in_month, 2)
+    count = len(station_ids) * 12
+    return bulk_insert(
+        RainfallHistory,
+        {
+            "station": np.repeat(np.array(station_ids), 12),
+            "month": np.tile(np.arange(1, 13), len(station_ids)),
+            "value": np.tile(to_hundredths(normals), len(station_ids)),
+            "created": timestamp_column(count, using),
+            "modified": timestamp_column(count, using),
+        },
+        using=using,
+    )
+
+
+def seed_dataset(
+    organizations=5,
+    stations_per_organization=20,
+    start=date(1995, 1, 1),
+    end=date(2024, 12, 31),
+    seed=None,
+    batch_size=50000,
+    using=DEFAULT_DB_ALIAS,
+):
+    """
+    Coherent dataset: organizations with their stations, contiguous daily
+    readings per station and monthly normals. Returns a summary dict.
+    """
+    rng = np.random.default_rng(seed)
+    location, _ = Location.objects.using(using).get_or_create(
+        code="NI", defaults={"name": "Nicaragua", "location_type": "country"}
+    )
+    first = Organization.objects.using(using).count()
+    orgs = Organization.objects.using(using).bulk_create(
+        Organization(name=f"Organization {n}", code=f"ORG-{n:04d}", location=location)
+        for n in range(first, first + organizations)
+    )
+    station_ids = seed_stations(orgs, stations_per_organization, using)
+    histories = seed_histories(station_ids, using)
+    readings = seed_rainfall(station_ids, start, end, rng, batch_size, using)
+    rainfall_written(station_ids, using)
+    if apps.is_installed("dashboard"):
+        from dashboard.summaries import refresh
+
+        refresh(start, end, stations=station_ids, using=using)
+    return {
+        "organizations": len(orgs),
+        "stations": len(station_ids),
+        "histories": histories,
+        "rainfall": readings,
+    }
@@ -1,10 +1,22 @@
+from datetime import date
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from organizations.models import Organization
+from organizations.scoping import (
+    OrganizationScopedSerializerMixin,
+    organization_scope,
+    scope_queryset,
+)
 from organizations.serializers import OrganizationSerializer
+from stations import quality
 from stations.models import EquipmentStation, RainfallStation, Station
 
 
-class StationSerializer(serializers.ModelSerializer):
+class StationSerializer(OrganizationScopedSerializerMixin, serializers.ModelSerializer):
+    scoped_fields = {"organization": "pk"}
 
     class Meta:
         model = Station
@@ -19,23 +31,148 @@ class StationReadSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class EquipmentStationSerializer(serializers.ModelSerializer):
+class EquipmentStationSerializer(OrganizationScopedSerializerMixin, serializers.ModelSerializer):
+    scoped_fields = {"station": "organization"}
 
     class Meta:
         model = EquipmentStation
         fields = "__all__"
 
 
-class RainfallStationSerializer(serializers.ModelSerializer):
+class RainfallStationSerializer(OrganizationScopedSerializerMixin, serializers.ModelSerializer):
+    scoped_fields = {"station": "organization"}
+    day = serializers.IntegerField(read_only=True)
+    month = serializers.IntegerField(read_only=True)
+    year = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = RainfallStation
         fields = "__all__"
+        read_only_fields = ["qc_flags"]
+
+    def create(self, validated_data):
+        reading = RainfallStation(**validated_data)
+        quality.check_readings([reading])
+        return super().create({**validated_data, "qc_flags": reading.qc_flags})
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        quality.check_readings([instance])
+        return super().update(instance, {**validated_data, "qc_flags": instance.qc_flags})
+
+
+class RainfallBulkSerializer(serializers.Serializer):
+    """
+    One reading of ``POST /api/v1/rainfall/bulk/``. ``station`` is a plain id
+    so a large upload checks its stations in one query, not one per row.
+    """
+
+    station = serializers.IntegerField()
+    registration_date = serializers.DateField()
+    value = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True, required=False
+    )
 
 
 class RainfallStationReadSerializer(serializers.ModelSerializer):
     station = StationSerializer(read_only=True)
+    day = serializers.IntegerField(read_only=True)
+    month = serializers.IntegerField(read_only=True)
+    year = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = RainfallStation
         fields = "__all__"
+
+
+class RainfallReportQuerySerializer(OrganizationScopedSerializerMixin, serializers.Serializer):
+    """
+    Query parameters of the completeness and gaps reports. With the request
+    in the context, only the user's organization can be selected.
+    """
+
+    scoped_fields = {"station": "organization", "organization": "pk"}
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    station = serializers.PrimaryKeyRelatedField(
+        queryset=Station.objects.all(), required=False
+    )
+    organization = serializers.PrimaryKeyRelatedField(
+        queryset=Organization.objects.all(), required=False
+    )
+
+    def validate(self, attrs):
+        today = date.today()
+        attrs.setdefault("end", today)
+        attrs.setdefault("start", attrs["end"].replace(month=1, day=1))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"end": _("End must not be before start.")})
+        return attrs
+
+    def visible_stations(self):
+        """Stations of the request user's organization (all for superusers)."""
+        request = self.context.get("request")
+        if request is None:
+            return Station.objects.all()
+        return scope_queryset(Station.objects.all(), request.user, "organization")
+
+    def stations(self):
+        """Selected stations, or ``None`` for all of them."""
+        stations = self.visible_stations()
+        if "station" in self.validated_data:
+            return stations.filter(pk=self.validated_data["station"].pk)
+        if "organization" in self.validated_data:
+            return stations.filter(organization=self.validated_data["organization"])
+        request = self.context.get("request")
+        if request is not None and organization_scope(request.user) is not None:
+            return stations
+        return None
+
+
+class RainfallMatrixQuerySerializer(RainfallReportQuerySerializer):
+    """
+    Query parameters of the station × date matrix. ``station`` may repeat
+    (``?station=1&station=2``); unknown ids are ignored.
+    """
+
+    station = serializers.ListField(child=serializers.IntegerField(), required=False)
+    trusted = serializers.BooleanField(required=False, default=False)
+
+    def stations(self):
+        if "station" in self.validated_data:
+            return self.visible_stations().filter(pk__in=self.validated_data["station"])
+        return super().stations()
+
+
+class RainfallStatisticsQuerySerializer(RainfallMatrixQuerySerializer):
+    """
+    Query parameters of the rolling, cumulative and SPI statistics. Without
+    ``start`` the period is the single day (or month) of ``end``.
+    """
+
+    trusted = serializers.BooleanField(required=False, default=True)
+    window = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=366), required=False
+    )
+    season_start = serializers.RegexField(r"^\d{2}-\d{2}$", required=False)
+    scale = serializers.IntegerField(min_value=1, max_value=48, default=3)
+
+    def validate_season_start(self, value):
+        month, day = (int(part) for part in value.split("-"))
+        try:
+            date(2000, month, day)
+        except ValueError:
+            raise serializers.ValidationError(_("Use MM-DD."))
+        return month, day
+
+    def validate(self, attrs):
+        attrs.setdefault("end", date.today())
+        attrs.setdefault("start", attrs["end"])
+        attrs = super().validate(attrs)
+        attrs["window"] = attrs.get("window") or [30, 60, 90]
+        attrs.setdefault(
+            "season_start", self.validate_season_start(settings.RAINFALL_SEASON_START)
+        )
+        return attrs
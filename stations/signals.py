@@ -0,0 +1,14 @@
+"""
+Signals of the stations app.
+
+``rainfall_changed`` is sent by every write path of ``RainfallStation``
+(model ``save``/``delete`` and the queryset's ``update``/``delete``/
+``bulk_create``/``bulk_update``) with ``station_ids``, the stations whose
+readings changed, and ``using``. It is sent when the rows are written, so
+receivers that read them from another connection should wait for
+``transaction.on_commit``.
+"""
+
+from django.dispatch import Signal
+
+rainfall_changed = Signal()
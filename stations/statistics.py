@@ -0,0 +1,287 @@
+"""
+Rolling totals, season-to-date rainfall and the standardized precipitation
+index (SPI) per station.
+
+Daily statistics run on the dense station × date matrix of
+``stations.timeseries`` (one query) with cumulative sums, so an N-day window
+costs the same as a one-day one. The SPI fits a gamma distribution to the
+monthly totals of every station and calendar month at once; the monthly
+totals come from one ``GROUP BY`` in the database.
+
+A total is only given when at least ``RAINFALL_STATS_MIN_COVERAGE`` of its
+days (or months) were reported. Results are cached per station under the
+station's version (``stations.versions``), so a new or changed reading of a
+station recomputes that station only. Only a shared cache carries the new
+version to every worker; with the per-process default the results expire
+within seconds (``RAINFALL_STATS_CACHE_TIMEOUT``).
+"""
+
+import calendar
+import hashlib
+import math
+import warnings
+from datetime import date, timedelta
+from statistics import NormalDist
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from stations.completeness import month_starts
+from stations.models import RainfallStation, Station
+from stations.timeseries import rainfall_matrix
+from stations.versions import station_versions
+
+YEAR_EXPRESSIONS = {
+    "sqlite": "CAST(strftime('%%Y', registration_date) AS integer)",
+    "postgresql": "CAST(EXTRACT(YEAR FROM registration_date) AS integer)",
+}
+# Iterations of the incomplete gamma series and continued fraction.
+GAMMA_ITERATIONS = 200
+TINY = 1e-300
+
+
+def cached_per_station(kind, params, station_ids, compute):
+    """
+    Per-station results of ``compute(missing_ids) -> {pk: result}``, served
+    from the cache for every station whose version has not changed.
+    """
+    digest = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    versions = station_versions(station_ids)
+    keys = {f"rainfall-stats:{kind}:{digest}:{pk}:{versions[pk]}": pk for pk in station_ids}
+    results = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    missing = [pk for pk in station_ids if pk not in results]
+    if missing:
+        computed = compute(missing)
+        cache.set_many(
+            {key: computed[pk] for key, pk in keys.items() if pk in computed},
+            timeout=settings.RAINFALL_STATS_CACHE_TIMEOUT,
+        )
+        results.update(computed)
+    return [results[pk] for pk in station_ids]
+
+
+def to_list(values):
+    """Rounded values with ``None`` instead of NaN."""
+    values = np.round(values, 2)
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def daily_matrix(station_ids, start, end, trusted, using):
+    matrix = rainfall_matrix(
+        start, end, Station.objects.filter(pk__in=station_ids), trusted, using
+    )
+    return matrix["stations"].tolist(), matrix["values"]
+
+
+def running(values):
+    """Cumulative sums of the reported values and of reported days, from 0."""
+    padding = np.zeros((values.shape[0], 1))
+    totals = np.concatenate([padding, np.cumsum(np.nan_to_num(values), axis=1)], axis=1)
+    counts = np.concatenate([padding, np.cumsum(~np.isnan(values), axis=1)], axis=1)
+    return totals, counts
+
+
+def rolling(station_ids, start, end, windows, trusted=True, using=DEFAULT_DB_ALIAS):
+    """
+    Totals of the ``windows`` (days) ending on every day from ``start`` to
+    ``end``. Returns ``{"dates", "windows", "stations"}``, each station with
+    its ``id`` and ``totals`` per window.
+    """
+    windows = sorted(set(windows))
+    days = (end - start).days + 1
+    lookback = max(windows) - 1
+
+    def compute(missing):
+        ids, values = daily_matrix(missing, start - timedelta(days=lookback), end, trusted, using)
+        totals, counts = running(values)
+        first, last = lookback + 1, lookback + days
+        results = {}
+        for window in windows:
+            total = totals[:, first:last + 1] - totals[:, first - window:last + 1 - window]
+            count = counts[:, first:last + 1] - counts[:, first - window:last + 1 - window]
+            total[count < window * settings.RAINFALL_STATS_MIN_COVERAGE] = np.nan
+            for index, pk in enumerate(ids):
+                results.setdefault(pk, {"id": pk, "totals": {}})["totals"][window] = to_list(
+                    total[index]
+                )
+        return results
+
+    params = {"start": start, "end": end, "windows": windows, "trusted": trusted}
+    return {
+        "dates": [start + timedelta(days=n) for n in range(days)],
+        "windows": windows,
+        "stations": cached_per_station("rolling", params, station_ids, compute),
+    }
+
+
+def season_first_day(day, season_start):
+    """First day of the season (starting every year on ``(month, day)``) of ``day``."""
+    month, first = season_start
+    start = date(day.year, month, min(first, calendar.monthrange(day.year, month)[1]))
+    if start > day:
+        start = date(day.year - 1, month, min(first, calendar.monthrange(day.year - 1, month)[1]))
+    return start
+
+
+def cumulative(station_ids, start, end, season_start, trusted=True, using=DEFAULT_DB_ALIAS):
+    """
+    Rainfall from the start of the season (``(month, day)``) to every day
+    from ``start`` to ``end``. Returns ``{"dates", "season_start",
+    "stations"}``, each station with its ``id`` and ``cumulative`` values.
+    """
+    first = season_first_day(start, season_start)
+    dates = [first + timedelta(days=n) for n in range((end - first).days + 1)]
+    # Column where the season of every date began.
+    seasons = [season_first_day(day, season_start) for day in dates]
+    season_column = np.array([(season - first).days for season in seasons])
+    offset = (start - first).days
+
+    def compute(missing):
+        ids, values = daily_matrix(missing, first, end, trusted, using)
+        totals, counts = running(values)
+        since = np.arange(1, len(dates) + 1) - season_column
+        total = totals[:, 1:] - totals[:, season_column]
+        count = counts[:, 1:] - counts[:, season_column]
+        total[count < since * settings.RAINFALL_STATS_MIN_COVERAGE] = np.nan
+        return {
+            pk: {"id": pk, "cumulative": to_list(total[index, offset:])}
+            for index, pk in enumerate(ids)
+        }
+
+    params = {"start": start, "end": end, "season_start": season_start, "trusted": trusted}
+    return {
+        "dates": dates[offset:],
+        "season_start": "{:02d}-{:02d}".format(*season_start),
+        "stations": cached_per_station("cumulative", params, station_ids, compute),
+    }
+
+
+def gamma_cdf(x, shape):
+    """
+    Regularized lower incomplete gamma function P(shape, x), elementwise:
+    series below ``shape + 1``, continued fraction above.
+    """
+    x, shape = (np.asarray(a, dtype=float) for a in np.broadcast_arrays(x, shape))
+    result = np.where(x <= 0, 0.0, np.nan)
+    lgamma = np.frompyfunc(math.lgamma, 1, 1)
+
+    series = (x > 0) & (x < shape + 1)
+    a, v = shape[series], x[series]
+    term = total = 1 / a
+    for n in range(1, GAMMA_ITERATIONS):
+        term = term * v / (a + n)
+        total = total + term
+    result[series] = total * np.exp(-v + a * np.log(v) - lgamma(a).astype(float))
+
+    fraction = x >= shape + 1
+    a, v = shape[fraction], x[fraction]
+    b = v + 1 - a
+    c = np.full(v.shape, 1 / TINY)
+    d = 1 / b
+    h = d
+    for n in range(1, GAMMA_ITERATIONS):
+        an = -n * (n - a)
+        b = b + 2
+        d = an * d + b
+        d = np.where(np.abs(d) < TINY, TINY, d)
+        c = b + an / c
+        c = np.where(np.abs(c) < TINY, TINY, c)
+        d = 1 / d
+        h = h * d * c
+    result[fraction] = 1 - np.exp(-v + a * np.log(v) - lgamma(a).astype(float)) * h
+    return result
+
+
+def monthly_totals(station_ids, end, trusted, using):
+    """
+    Station × month totals from January of the first year with data to
+    December of ``end``'s year; NaN for months below the coverage threshold.
+    """
+    connection = connections[using]
+    year = YEAR_EXPRESSIONS.get(connection.vendor, YEAR_EXPRESSIONS["postgresql"])
+    table = connection.ops.quote_name(RainfallStation._meta.db_table)
+    ids = np.array(sorted(station_ids), dtype=np.int64)
+    # Plain integers (station, year, month, hundredths, days) per month.
+    sql = f"""
+        SELECT station_id, {year}, month, CAST(SUM(value) AS bigint), COUNT(value)
+        FROM {table}
+        WHERE registration_date <= %s {"AND qc_flags = 0" if trusted else ""}
+        AND station_id IN ({", ".join(["%s"] * len(ids))})
+        GROUP BY 1, 2, 3
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [connection.ops.adapt_datefield_value(end), *ids.tolist()])
+        rows = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 5)
+    rows = rows[rows[:, 4] > 0]
+    if not len(rows):
+        return ids, date(end.year, 1, 1), np.full((len(ids), 12), np.nan)
+
+    # Whole years, so calendar months line up in columns of 12; months after
+    # ``end`` have no readings and stay NaN.
+    first = date(int(rows[:, 1].min()), 1, 1)
+    months = (end.year - first.year + 1) * 12
+    days = np.array([calendar.monthrange(first.year + n // 12, n % 12 + 1)[1] for n in range(months)])
+    row_index = np.searchsorted(ids, rows[:, 0].astype(np.int64))
+    month_index = ((rows[:, 1] - first.year) * 12 + rows[:, 2] - 1).astype(np.int64)
+    totals = np.full((len(ids), months), np.nan)
+    totals[row_index, month_index] = rows[:, 3] / 100
+    reported = np.zeros((len(ids), months))
+    reported[row_index, month_index] = rows[:, 4]
+    totals[reported < days * settings.RAINFALL_STATS_MIN_COVERAGE] = np.nan
+    return ids, first, totals
+
+
+def spi(station_ids, start, end, scale, trusted=True, using=DEFAULT_DB_ALIAS):
+    """
+    SPI of ``scale`` months for every month from ``start`` to ``end``,
+    calibrated on each station's whole record. Returns ``{"months",
+    "scale", "stations"}``, each station with its ``id`` and ``spi`` values
+    (``None`` without ``RAINFALL_SPI_MIN_YEARS`` years of that month).
+    """
+    months = month_starts(start, end)
+
+    def compute(missing):
+        ids, first, totals = monthly_totals(missing, end, trusted, using)
+        # Totals of the ``scale`` months ending on every month.
+        sums, counts = running(totals)
+        accumulated = np.full(totals.shape, np.nan)
+        complete = counts[:, scale:] - counts[:, :-scale] == scale
+        accumulated[:, scale - 1:] = np.where(complete, sums[:, scale:] - sums[:, :-scale], np.nan)
+
+        # Fit per station and calendar month over the years (Thom's estimator).
+        years = accumulated.reshape(len(ids), -1, 12)
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN slices
+            sample = (~np.isnan(years)).sum(axis=1)
+            zeros = (years == 0).sum(axis=1) / sample
+            positive = np.where(years > 0, years, np.nan)
+            mean = np.nanmean(positive, axis=1)
+            skew = np.log(mean) - np.nanmean(np.log(positive), axis=1)
+            shape = (1 + np.sqrt(1 + 4 * skew / 3)) / (4 * skew)
+            fitted = (sample >= settings.RAINFALL_SPI_MIN_YEARS) & (skew > 0)
+
+        wanted = np.array([(m.year - first.year) * 12 + m.month - 1 for m in months])
+        index = np.clip(wanted, 0, accumulated.shape[1] - 1)
+        x = np.where(wanted >= 0, accumulated[:, index], np.nan)
+        calendar_month = np.array([m.month - 1 for m in months])
+        shape, scale_parameter = shape[:, calendar_month], (mean / shape)[:, calendar_month]
+        valid = fitted[:, calendar_month] & ~np.isnan(x)
+
+        values = np.full(x.shape, np.nan)
+        probability = zeros[:, calendar_month][valid] + (1 - zeros[:, calendar_month][valid]) * (
+            gamma_cdf(x[valid] / scale_parameter[valid], shape[valid])
+        )
+        inverse = np.frompyfunc(NormalDist().inv_cdf, 1, 1)
+        values[valid] = inverse(np.clip(probability, 1e-6, 1 - 1e-6)).astype(float)
+        return {
+            pk: {"id": pk, "spi": to_list(values[index])} for index, pk in enumerate(ids.tolist())
+        }
+
+    params = {"start": start, "end": end, "scale": scale, "trusted": trusted}
+    return {
+        "months": months,
+        "scale": scale,
+        "stations": cached_per_station("spi", params, station_ids, compute),
+    }
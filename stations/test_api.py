@@ -1,23 +1,36 @@
+import io
+
+import numpy as np
 import pytest
+import tablib
+from django.test import Client
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework.throttling import UserRateThrottle
 from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 
+from core.testing import QueryBudget, assert_constant_query_count
+from stations.filters import RainfallStationFilter
 from stations.models import Station, EquipmentStation, RainfallStation
+from stations.quality import QCFlag
+from stations.resources import RainfallStationResource
 from stations.factories import StationFactory, EquipmentStationFactory, RainfallStationFactory
 from organizations.factories import OrganizationFactory
-from accounts.factories import AdminUserFactory
 
 
 @pytest.mark.django_db
 class TestStationAPI:
     """Tests API CRUD para StationViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
+        cache.clear()
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/stations/"
 
@@ -139,10 +152,12 @@ class TestStationAPI:
 class TestEquipmentStationAPI:
     """Tests API CRUD para EquipmentStationViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
+        cache.clear()
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/equipments/"
 
@@ -202,10 +217,12 @@ class TestEquipmentStationAPI:
 class TestRainfallStationAPI:
     """Tests API CRUD para RainfallStationViewSet"""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
         """Configuración inicial para cada test"""
+        cache.clear()
         self.client = APIClient()
-        self.admin_user = AdminUserFactory()
+        self.admin_user = seeded_db.admin
         self.client.force_authenticate(user=self.admin_user)
         self.base_url = "/api/v1/rainfall/"
 
@@ -245,17 +262,73 @@ class TestRainfallStationAPI:
         data = {
             "station": station.id,
             "registration_date": "2024-02-01"
-            # day, month, year, value tienen valores por defecto
+            # day, month y year se calculan desde registration_date
         }
         
         response = self.client.post(self.base_url, data)
         
         assert response.status_code == status.HTTP_201_CREATED
-        assert response.data["day"] == 0  # valor por defecto
-        assert response.data["month"] == 0  # valor por defecto
-        assert response.data["year"] == 0  # valor por defecto
+        assert response.data["day"] == 1
+        assert response.data["month"] == 2
+        assert response.data["year"] == 2024
         assert response.data["value"] is None  # puede ser null
 
+    def test_create_flags_negative_value(self):
+        """Test POST marca un valor negativo sin rechazarlo"""
+        station = StationFactory()
+
+        response = self.client.post(
+            self.base_url,
+            {"station": station.id, "registration_date": "2024-02-01", "value": "-4.00"},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["qc_flags"] == QCFlag.NEGATIVE
+        assert not RainfallStation.objects.trusted().exists()
+
+    def test_bulk_create(self):
+        """Test POST /api/v1/rainfall/bulk/ - Crear lecturas en lote"""
+        station = StationFactory()
+        data = [
+            {"station": station.id, "registration_date": f"2024-03-{day:02d}", "value": "5.00"}
+            for day in range(1, 11)
+        ]
+        data[3]["value"] = "-1.00"
+
+        response = self.client.post(f"{self.base_url}bulk/", data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {"created": 10, "flagged": 1}
+        assert RainfallStation.objects.filter(station=station).trusted().count() == 9
+
+    def test_bulk_create_unknown_station(self):
+        """Test el lote con una estación inexistente devuelve 400 y no guarda nada"""
+        station = StationFactory()
+        data = [
+            {"station": station.id, "registration_date": "2024-03-01", "value": "5.00"},
+            {"station": station.id + 1000, "registration_date": "2024-03-01", "value": "5.00"},
+        ]
+
+        response = self.client.post(f"{self.base_url}bulk/", data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "station" in response.data
+        assert not RainfallStation.objects.exists()
+
+    def test_import_sets_quality_flags(self):
+        """Test la importación con RainfallStationResource marca las lecturas"""
+        station = StationFactory()
+        dataset = tablib.Dataset(headers=["id", "station", "registration_date", "value"])
+        dataset.append(["", station.id, "2024-04-01", "3.50"])
+        dataset.append(["", station.id, "2024-04-02", "-2.00"])
+
+        result = RainfallStationResource().import_data(dataset)
+
+        assert not result.has_errors()
+        assert list(
+            RainfallStation.objects.order_by("registration_date").values_list("qc_flags", flat=True)
+        ) == [0, QCFlag.NEGATIVE]
+
     def test_filter_by_station(self):
         """Test filtrar registros por estación"""
         station1 = StationFactory()
@@ -272,8 +345,10 @@ class TestRainfallStationAPI:
     def test_filter_by_month(self):
         """Test filtrar por mes"""
         station = StationFactory()
-        RainfallStationFactory.create_batch(2, station=station, month=6)
-        RainfallStationFactory.create_batch(3, station=station, month=12)
+        for day in (1, 2):
+            RainfallStationFactory(station=station, registration_date=date(2023, 6, day))
+        for day in (1, 2, 3):
+            RainfallStationFactory(station=station, registration_date=date(2023, 12, day))
         
         response = self.client.get(f"{self.base_url}?month=6")
         
@@ -285,14 +360,62 @@ class TestRainfallStationAPI:
     def test_filter_by_year(self):
         """Test filtrar por año"""
         station = StationFactory()
-        RainfallStationFactory.create_batch(2, station=station, year=2023)
-        RainfallStationFactory.create_batch(3, station=station, year=2024)
+        for day in (1, 2):
+            RainfallStationFactory(station=station, registration_date=date(2023, 5, day))
+        for day in (1, 2, 3):
+            RainfallStationFactory(station=station, registration_date=date(2024, 5, day))
         
         response = self.client.get(f"{self.base_url}?year=2024")
         
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) >= 3  # Al menos los 3 que creamos
 
+    def test_filter_by_year_uses_date_range(self):
+        """Test el filtro por año se resuelve con un rango de registration_date"""
+        station = StationFactory()
+        RainfallStationFactory(station=station, registration_date=date(2023, 12, 31))
+        RainfallStationFactory(station=station, registration_date=date(2024, 1, 1))
+        RainfallStationFactory(station=station, registration_date=date(2024, 12, 31))
+
+        response = self.client.get(f"{self.base_url}?year=2024&paginator")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(record["registration_date"] for record in response.data) == [
+            "2024-01-01",
+            "2024-12-31",
+        ]
+        queryset = RainfallStationFilter(
+            {"year": "2024"}, queryset=RainfallStation.objects.all()
+        ).qs
+        where = str(queryset.query).split("WHERE", 1)[1]
+        assert "registration_date" in where
+        assert '"year"' not in where
+
+    def test_filter_by_month_uses_generated_column(self):
+        """Test el filtro por mes usa la columna generada e indexada"""
+        queryset = RainfallStationFilter(
+            {"month": "6"}, queryset=RainfallStation.objects.all()
+        ).qs
+        where = str(queryset.query).split("WHERE", 1)[1]
+
+        assert '"stations_rainfallstation"."month" = 6' in where
+
+    def test_filter_by_date_range(self):
+        """Test filtrar por rango de fechas"""
+        station = StationFactory()
+        for day in (1, 10, 20, 30):
+            RainfallStationFactory(station=station, registration_date=date(2024, 4, day))
+
+        response = self.client.get(
+            f"{self.base_url}?start_date=2024-04-10&end_date=2024-04-20&paginator"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["registration_date"] for record in response.data] == [
+            "2024-04-10",
+            "2024-04-20",
+        ]
+
     def test_ordering_by_date(self):
         """Test ordenamiento por fecha de registro"""
         station = StationFactory()
@@ -353,6 +476,364 @@ class TestRainfallStationAPI:
         assert len(response.data["results"]) == 3
 
 
+@pytest.mark.django_db
+class TestRainfallCompletenessAPI:
+    """Tests de los reportes de huecos y completitud de lluvia"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=seeded_db.admin)
+        self.station = StationFactory(organization=seeded_db.organization)
+        self.other = StationFactory()
+        for day in [1, 2, 3, 6, 7, 28]:
+            RainfallStationFactory(station=self.station, registration_date=date(2024, 2, day))
+        RainfallStationFactory(station=self.station, registration_date=date(2024, 3, 1))
+
+    def test_completeness_matrix(self):
+        """Test GET /api/v1/rainfall/completeness/ - Matriz estación × mes"""
+        response = self.client.get(
+            "/api/v1/rainfall/completeness/",
+            {"start": "2024-02-01", "end": "2024-03-10", "station": self.station.id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["months"] == [date(2024, 2, 1), date(2024, 3, 1)]
+        assert response.data["expected"] == [29, 10]
+        (station,) = response.data["stations"]
+        assert station["id"] == self.station.id
+        assert station["reported"] == [6, 1]
+        assert station["percent"] == [20.7, 10.0]
+
+    def test_completeness_by_organization(self):
+        """Test filtrar la matriz por organización"""
+        response = self.client.get(
+            "/api/v1/rainfall/completeness/",
+            {"start": "2024-02-01", "end": "2024-02-29", "organization": self.station.organization_id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [station["id"] for station in response.data["stations"]] == [self.station.id]
+
+    def test_gaps(self):
+        """Test GET /api/v1/rainfall/gaps/ - Rachas de días sin lectura"""
+        response = self.client.get(
+            "/api/v1/rainfall/gaps/",
+            {"start": "2024-02-01", "end": "2024-03-03", "station": self.station.id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [(gap["start"], gap["end"], gap["days"]) for gap in response.data] == [
+            (date(2024, 2, 4), date(2024, 2, 5), 2),
+            (date(2024, 2, 8), date(2024, 2, 27), 20),
+            (date(2024, 2, 29), date(2024, 2, 29), 1),
+            (date(2024, 3, 2), date(2024, 3, 3), 2),
+        ]
+
+    def test_gaps_station_without_readings(self):
+        """Test una estación sin lecturas es un solo hueco"""
+        response = self.client.get(
+            "/api/v1/rainfall/gaps/",
+            {"start": "2024-02-01", "end": "2024-02-29", "station": self.other.id},
+        )
+
+        assert response.data == [
+            {"station": self.other.id, "start": date(2024, 2, 1), "end": date(2024, 2, 29), "days": 29}
+        ]
+
+    def test_invalid_period(self):
+        """Test un periodo con fin anterior al inicio devuelve 400"""
+        response = self.client.get(
+            "/api/v1/rainfall/completeness/", {"start": "2024-03-01", "end": "2024-02-01"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "end" in response.data
+
+    def test_admin_dashboard(self, seeded_db):
+        """Test el tablero de completitud en el admin"""
+        client = Client()
+        client.force_login(seeded_db.admin)
+
+        response = client.get(
+            "/admin/stations/rainfallstation/completeness/", {"year": 2024}
+        )
+
+        assert response.status_code == 200
+        assert self.station.code in response.content.decode()
+
+    def test_admin_quality_filter(self, seeded_db):
+        """Test filtrar lecturas marcadas en el admin"""
+        RainfallStation.objects.filter(registration_date=date(2024, 3, 1)).update(
+            qc_flags=QCFlag.NEGATIVE
+        )
+        client = Client()
+        client.force_login(seeded_db.admin)
+
+        response = client.get("/admin/stations/rainfallstation/", {"quality": "flagged"})
+
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == 1
+
+
+@pytest.mark.django_db
+class TestRainfallMatrixAPI:
+    """Tests de la matriz estación × fecha de lluvia"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=seeded_db.admin)
+        self.url = "/api/v1/rainfall/matrix/"
+        self.first, self.second = StationFactory.create_batch(2)
+        RainfallStationFactory(station=self.first, registration_date=date(2024, 1, 1), value=Decimal("1.50"))
+        RainfallStationFactory(station=self.first, registration_date=date(2024, 1, 3), value=Decimal("0.00"))
+        RainfallStationFactory(station=self.second, registration_date=date(2024, 1, 2), value=Decimal("12.25"))
+        RainfallStationFactory(station=self.second, registration_date=date(2024, 1, 3), value=None)
+
+    def params(self, **extra):
+        return {
+            "start": "2024-01-01",
+            "end": "2024-01-03",
+            "station": [self.first.id, self.second.id],
+            **extra,
+        }
+
+    def test_json_matrix(self):
+        """Test GET /api/v1/rainfall/matrix/ - Matriz columnar en JSON"""
+        response = self.client.get(self.url, self.params())
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "dates": ["2024-01-01", "2024-01-02", "2024-01-03"],
+            "stations": [self.first.id, self.second.id],
+            "shape": [2, 3],
+            "values": [1.5, None, 0.0, None, 12.25, None],
+        }
+
+    def test_npz_matrix(self):
+        """Test el formato binario npz con máscara de nulos"""
+        response = self.client.get(self.url, self.params(format="npz"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-npz"
+        archive = np.load(io.BytesIO(response.content))
+        assert archive["stations"].tolist() == [self.first.id, self.second.id]
+        assert archive["dates"].astype(str).tolist() == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert archive["mask"].tolist() == [[False, True, False], [True, False, True]]
+        assert archive["values"][~archive["mask"]].tolist() == [1.5, 0.0, 12.25]
+
+    def test_trusted_excludes_flagged(self):
+        """Test trusted=true enmascara las lecturas marcadas"""
+        RainfallStation.objects.filter(station=self.second).update(qc_flags=QCFlag.ABOVE_NORMAL)
+
+        response = self.client.get(self.url, self.params(trusted="true"))
+
+        assert response.data["values"] == [1.5, None, 0.0, None, None, None]
+
+    def test_station_subset(self):
+        """Test una sola estación devuelve una sola fila"""
+        response = self.client.get(self.url, self.params(station=[self.second.id]))
+
+        assert response.data["stations"] == [self.second.id]
+        assert response.data["values"] == [None, 12.25, None]
+
+    def test_too_many_cells(self, settings):
+        """Test pedir más celdas que RAINFALL_MATRIX_MAX_CELLS devuelve 400"""
+        settings.RAINFALL_MATRIX_MAX_CELLS = 5
+
+        response = self.client.get(self.url, self.params())
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "end" in response.data
+
+
+@pytest.mark.django_db
+class TestRainfallStatisticsAPI:
+    """Tests de los endpoints de estadísticas de lluvia"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=seeded_db.admin)
+        self.station = StationFactory()
+        RainfallStation.objects.bulk_create(
+            RainfallStation(
+                station=self.station,
+                registration_date=date(2024, 1, 1) + timedelta(days=n),
+                value=Decimal("2.00"),
+            )
+            for n in range(120)
+        )
+
+    def test_rolling_default_windows(self):
+        """Test GET /api/v1/rainfall/rolling/ - Ventanas de 30/60/90 días"""
+        response = self.client.get(
+            "/api/v1/rainfall/rolling/", {"end": "2024-04-29", "station": self.station.id}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["dates"] == [date(2024, 4, 29)]
+        assert response.data["windows"] == [30, 60, 90]
+        (station,) = response.data["stations"]
+        assert station["totals"] == {30: [60.0], 60: [120.0], 90: [180.0]}
+
+    def test_cumulative(self):
+        """Test GET /api/v1/rainfall/cumulative/ - Acumulado de temporada"""
+        response = self.client.get(
+            "/api/v1/rainfall/cumulative/",
+            {"start": "2024-03-01", "end": "2024-03-02", "season_start": "03-01", "station": self.station.id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["season_start"] == "03-01"
+        assert response.data["stations"][0]["cumulative"] == [2.0, 4.0]
+
+    def test_spi(self):
+        """Test GET /api/v1/rainfall/spi/ - Sin años suficientes no hay SPI"""
+        response = self.client.get(
+            "/api/v1/rainfall/spi/", {"end": "2024-03-31", "scale": 3, "station": self.station.id}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["months"] == [date(2024, 3, 1)]
+        assert response.data["stations"] == [{"id": self.station.id, "spi": [None]}]
+
+    def test_rolling_window_counts_toward_cells(self, settings):
+        """Test la ventana hacia atrás de rolling cuenta para RAINFALL_MATRIX_MAX_CELLS"""
+        settings.RAINFALL_MATRIX_MAX_CELLS = 60
+        params = {"end": "2024-04-29", "station": self.station.id}
+
+        short = self.client.get("/api/v1/rainfall/rolling/", {**params, "window": 60})
+        long = self.client.get("/api/v1/rainfall/rolling/", {**params, "window": 90})
+
+        assert short.status_code == status.HTTP_200_OK
+        assert long.status_code == status.HTTP_400_BAD_REQUEST
+        assert "end" in long.data
+
+    def test_invalid_season_start(self):
+        """Test una fecha de inicio de temporada inválida devuelve 400"""
+        response = self.client.get("/api/v1/rainfall/cumulative/", {"season_start": "02-30"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "season_start" in response.data
+
+    def test_bulk_upload_refreshes_statistics(self):
+        """Test una carga en lote invalida la caché de la estación"""
+        params = {"end": "2024-04-30", "window": 1, "station": self.station.id}
+        self.client.get("/api/v1/rainfall/rolling/", params)
+
+        self.client.post(
+            "/api/v1/rainfall/bulk/",
+            [{"station": self.station.id, "registration_date": "2024-04-30", "value": "7.00"}],
+            format="json",
+        )
+        response = self.client.get("/api/v1/rainfall/rolling/", params)
+
+        assert response.data["stations"][0]["totals"] == {1: [7.0]}
+
+
+@pytest.mark.django_db
+class TestOrganizationScopeAPI:
+    """Tests del acotamiento de los datos a la organización del usuario"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.observer = seeded_db.observer
+        self.observer.user_permissions.set(
+            Permission.objects.filter(
+                content_type__app_label="stations", codename__regex=r"^(view|add)_"
+            )
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.observer)
+        self.station = StationFactory(organization=seeded_db.organization)
+        self.foreign = StationFactory()
+        self.reading = RainfallStationFactory(
+            station=self.station, registration_date=date(2024, 2, 1)
+        )
+        self.foreign_reading = RainfallStationFactory(
+            station=self.foreign, registration_date=date(2024, 2, 1)
+        )
+
+    def test_list_only_own_organization(self):
+        """Test los listados solo incluyen la organización del usuario"""
+        stations = self.client.get("/api/v1/stations/", {"paginator": ""})
+        readings = self.client.get("/api/v1/rainfall/", {"paginator": ""})
+
+        assert [station["id"] for station in stations.data] == [self.station.id]
+        assert [reading["id"] for reading in readings.data] == [self.reading.id]
+        assert readings.data[0]["organization"] == self.station.organization_id
+
+    def test_retrieve_other_organization(self):
+        """Test el detalle de otra organización devuelve 404"""
+        station = self.client.get(f"/api/v1/stations/{self.foreign.id}/")
+        reading = self.client.get(f"/api/v1/rainfall/{self.foreign_reading.id}/")
+
+        assert station.status_code == status.HTTP_404_NOT_FOUND
+        assert reading.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_for_other_organization(self):
+        """Test no se puede registrar lluvia en una estación de otra organización"""
+        response = self.client.post(
+            "/api/v1/rainfall/",
+            {"station": self.foreign.id, "registration_date": "2024-02-02", "value": "1.00"},
+        )
+        bulk = self.client.post(
+            "/api/v1/rainfall/bulk/",
+            [{"station": self.foreign.id, "registration_date": "2024-02-02", "value": "1.00"}],
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "station" in response.data
+        assert bulk.status_code == status.HTTP_400_BAD_REQUEST
+        assert not RainfallStation.objects.filter(registration_date=date(2024, 2, 2)).exists()
+
+    def test_reports_only_own_organization(self):
+        """Test los reportes sin filtro solo incluyen la organización del usuario"""
+        completeness = self.client.get(
+            "/api/v1/rainfall/completeness/", {"start": "2024-02-01", "end": "2024-02-29"}
+        )
+        matrix = self.client.get(
+            "/api/v1/rainfall/matrix/",
+            {"start": "2024-02-01", "end": "2024-02-29", "station": [self.station.id, self.foreign.id]},
+        )
+
+        assert [station["id"] for station in completeness.data["stations"]] == [self.station.id]
+        assert matrix.data["stations"] == [self.station.id]
+
+    def test_async_list_only_own_organization(self):
+        """Test el endpoint asíncrono aplica el mismo acotamiento"""
+        client = Client()
+        client.force_login(self.observer)
+
+        response = client.get("/api/v1/async/rainfall/", {"paginator": ""})
+        detail = client.get(f"/api/v1/async/rainfall/{self.foreign_reading.id}/")
+
+        assert [reading["id"] for reading in response.json()] == [self.reading.id]
+        assert detail.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_superuser_sees_every_organization(self, seeded_db):
+        """Test un superusuario ve todas las organizaciones"""
+        self.client.force_authenticate(user=seeded_db.admin)
+
+        response = self.client.get("/api/v1/rainfall/", {"paginator": ""})
+
+        assert {reading["id"] for reading in response.data} == {
+            self.reading.id,
+            self.foreign_reading.id,
+        }
+
+
 @pytest.mark.django_db
 class TestStationsUnauthorizedAccess:
     """Tests de acceso no autorizado para todos los endpoints de stations"""
@@ -370,3 +851,174 @@ class TestStationsUnauthorizedAccess:
         for endpoint in endpoints:
             response = client.get(endpoint)
             assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+
+@pytest.mark.django_db
+class TestAsyncStationAPI:
+    """Tests para los endpoints asíncronos de estaciones y lluvias"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(seeded_db.admin)
+
+    def test_list_rainfall_records(self):
+        """Test GET /api/v1/async/rainfall/ - Listar registros paginados"""
+        station = StationFactory()
+        RainfallStationFactory.create_batch(12, station=station)
+
+        response = self.client.get("/api/v1/async/rainfall/")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["count"] == 12
+        assert len(data["results"]) == 10
+        assert data["next"].endswith("page=2")
+
+    def test_filter_and_ordering(self):
+        """Test filtros y ordenamiento igual que el viewset"""
+        station1 = StationFactory()
+        station2 = StationFactory()
+        RainfallStationFactory(station=station1, registration_date=date(2024, 2, 1))
+        RainfallStationFactory(station=station1, registration_date=date(2024, 1, 1))
+        RainfallStationFactory(station=station2)
+
+        response = self.client.get(
+            f"/api/v1/async/rainfall/?station={station1.id}&ordering=registration_date&paginator"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        dates = [record["registration_date"] for record in response.json()]
+        assert dates == ["2024-01-01", "2024-02-01"]
+
+    def test_filter_by_year(self):
+        """Test filtro por año con el mismo filterset que el viewset"""
+        station = StationFactory()
+        RainfallStationFactory(station=station, registration_date=date(2023, 6, 1))
+        RainfallStationFactory(station=station, registration_date=date(2024, 6, 1))
+
+        response = self.client.get("/api/v1/async/rainfall/?year=2024&paginator")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["registration_date"] for record in response.json()] == ["2024-06-01"]
+
+    def test_invalid_filter(self):
+        """Test filtro inválido devuelve 400"""
+        response = self.client.get("/api/v1/async/rainfall/?station=abc")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_retrieve_and_search_stations(self):
+        """Test obtener y buscar estaciones"""
+        station = StationFactory(name="Estación Norte")
+        StationFactory(name="Estación Sur")
+
+        response = self.client.get(f"/api/v1/async/stations/{station.id}/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Estación Norte"
+
+        response = self.client.get("/api/v1/async/stations/?search=Norte")
+        assert [s["id"] for s in response.json()["results"]] == [station.id]
+
+        response = self.client.get("/api/v1/async/stations/999999/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unauthorized_access(self):
+        """Test acceso sin autenticación"""
+        response = Client().get("/api/v1/async/rainfall/")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_throttled(self, monkeypatch):
+        """Test los endpoints asíncronos aplican el mismo límite de peticiones que el viewset"""
+        monkeypatch.setattr(UserRateThrottle, "rate", "2/min", raising=False)
+
+        responses = [self.client.get("/api/v1/async/stations/") for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [
+            status.HTTP_200_OK,
+            status.HTTP_200_OK,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        ]
+        assert 0 < int(responses[-1]["Retry-After"]) <= 60
+
+
+@pytest.mark.django_db
+class TestStationsQueryBudget:
+    """Tests de presupuesto de consultas para los endpoints de estaciones"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, seeded_db):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=seeded_db.admin)
+        self.admin_client = Client()
+        self.admin_client.force_login(seeded_db.admin)
+        self.organizations = OrganizationFactory.create_batch(3)
+        self.station = StationFactory(organization=self.organizations[0])
+
+    def populate_stations(self, size):
+        existing = Station.objects.count()
+        Station.objects.bulk_create(
+            Station(name=f"Budget {n}", code=f"BGT{n:05d}", organization=self.organizations[n % 3])
+            for n in range(existing, size)
+        )
+
+    def populate_rainfall(self, size):
+        existing = RainfallStation.objects.count()
+        dates = [date(2020, 1, 1) + timedelta(days=n) for n in range(existing, size)]
+        RainfallStation.objects.bulk_create(
+            RainfallStation(
+                station=self.station,
+                registration_date=day,
+                value=Decimal("3.25"),
+            )
+            for day in dates
+        )
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/v1/rainfall/completeness/",
+            "/api/v1/rainfall/gaps/",
+            "/api/v1/rainfall/matrix/",
+            "/api/v1/rainfall/rolling/",
+            "/api/v1/rainfall/cumulative/",
+            "/api/v1/rainfall/spi/",
+        ],
+    )
+    def test_report_query_count_is_constant(self, url):
+        """Test los reportes de completitud no crecen con el número de lecturas"""
+        assert_constant_query_count(
+            lambda: self.client.get(url, {"start": "2020-01-01", "end": "2023-12-31"}),
+            self.populate_rainfall,
+        )
+
+    @pytest.mark.parametrize(
+        "url, populate",
+        [
+            ("/admin/stations/station/", "populate_stations"),
+            ("/admin/stations/rainfallstation/", "populate_rainfall"),
+        ],
+    )
+    def test_admin_changelist_query_count_is_constant(self, url, populate):
+        """Test el listado del admin no consulta una fila relacionada por fila"""
+        assert_constant_query_count(lambda: self.admin_client.get(url), getattr(self, populate))
+
+    def test_admin_changelist_without_distinct(self):
+        """Test el listado de lluvias no recorre la tabla con DISTINCT al recargar"""
+        url = "/admin/stations/rainfallstation/"
+        self.populate_rainfall(1000)
+        self.admin_client.get(url)
+
+        with QueryBudget() as budget:
+            response = self.admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not [sql for sql, _ in budget.queries if "DISTINCT" in sql]
+        content = response.content.decode()
+        assert "registration_date__year=2022" in content
+        assert response.context["cl"].result_count == 1000
@@ -1,8 +1,22 @@
+import numpy as np
 import pytest
 from decimal import Decimal
 from datetime import date
 
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Sum
+
+from dashboard.models import MonthlyRainfall
+from histories.models import RainfallHistory
+from organizations.models import Organization
+from stations.completeness import completeness, find_gaps
 from stations.models import Station, EquipmentStation, RainfallStation
+from stations import statistics
+from stations.quality import QCFlag, check_readings, ingest, recheck
+from stations.partitions import drain_default_partition, ensure_partitions, partition_stats
+from stations.seeding import seed_dataset
+from stations.versions import table_version
 from stations.factories import (
     OrganizationFactory,
     StationFactory,
@@ -176,15 +190,28 @@ class TestRainfallStationCRUD:
         assert rainfall.created is not None
         assert rainfall.modified is not None
 
+    def test_date_parts_follow_registration_date(self):
+        """Test que day, month y year siguen a registration_date también en bulk_create y update"""
+        station = StationFactory()
+        rainfall = RainfallStationFactory(station=station, registration_date=date(2021, 9, 14))
+        (bulk,) = RainfallStation.objects.bulk_create(
+            [RainfallStation(station=station, registration_date=date(2022, 3, 5))]
+        )
+
+        assert (rainfall.day, rainfall.month, rainfall.year) == (14, 9, 2021)
+        assert bulk.month == 3
+
+        RainfallStation.objects.filter(pk=rainfall.pk).update(registration_date=date(2023, 11, 2))
+        updated = RainfallStation.objects.get(pk=rainfall.pk)
+
+        assert (updated.day, updated.month, updated.year) == (2, 11, 2023)
+
     def test_create_rainfall_with_specific_values(self):
         """Test crear registro de lluvia con valores específicos"""
         station = StationFactory()
         rainfall = RainfallStation.objects.create(
             station=station,
             registration_date=date(2024, 1, 15),
-            day=15,
-            month=1,
-            year=2024,
             value=Decimal("25.50"),
         )
 
@@ -250,3 +277,480 @@ class TestRainfallStationCRUD:
         assert rainfall.month == today.month
         assert rainfall.year == today.year
         assert rainfall.value is None
+
+
+@pytest.mark.django_db
+class TestRainfallValueStorage:
+    """Tests del almacenamiento de value como centésimas enteras"""
+
+    def test_stored_as_integer_hundredths(self):
+        """Test que la base de datos guarda centésimas y el modelo devuelve Decimal"""
+        rainfall = RainfallStationFactory(value=Decimal("25.50"))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT value FROM stations_rainfallstation WHERE id = %s", [rainfall.pk]
+            )
+            assert cursor.fetchone()[0] == 2550
+        assert RainfallStation.objects.get(pk=rainfall.pk).value == Decimal("25.50")
+
+    def test_aggregates_are_exact(self):
+        """Test que Sum y Avg devuelven milímetros exactos"""
+        station = StationFactory()
+        for day, value in enumerate(["0.10", "0.20", "0.25"], start=1):
+            RainfallStationFactory(
+                station=station, registration_date=date(2024, 5, day), value=Decimal(value)
+            )
+
+        totals = RainfallStation.objects.filter(station=station).aggregate(
+            total=Sum("value"), average=Avg("value")
+        )
+
+        assert totals["total"] == Decimal("0.55")
+        assert totals["average"].quantize(Decimal("0.0001")) == Decimal("0.1833")
+
+    def test_lookups_use_millimetres(self):
+        """Test que los filtros comparan en milímetros"""
+        station = StationFactory()
+        RainfallStationFactory(station=station, value=Decimal("1.49"))
+        RainfallStationFactory(station=station, value=Decimal("1.50"))
+
+        readings = RainfallStation.objects.filter(station=station)
+
+        assert readings.filter(value__gte=Decimal("1.5")).count() == 1
+        assert readings.filter(value="1.49").count() == 1
+
+    def test_history_value_round_trip(self):
+        """Test que RainfallHistory conserva los dos decimales"""
+        history = RainfallHistory.objects.create(
+            station=StationFactory(), month=6, value=Decimal("99999999.99")
+        )
+
+        assert RainfallHistory.objects.get(pk=history.pk).value == Decimal("99999999.99")
+
+
+@pytest.mark.django_db
+class TestBulkSeeding:
+    """Tests para la generación masiva de datos"""
+
+    def test_seed_dataset_counts(self):
+        """Test que se crean estaciones por organización, normales y lecturas diarias"""
+        summary = seed_dataset(
+            organizations=2,
+            stations_per_organization=3,
+            start=date(2024, 1, 1),
+            end=date(2024, 3, 31),
+            seed=7,
+        )
+
+        assert summary == {
+            "organizations": 2,
+            "stations": 6,
+            "histories": 72,
+            "rainfall": 6 * 91,
+        }
+        assert Station.objects.count() == 6
+        assert RainfallHistory.objects.count() == 72
+        for organization in Organization.objects.all():
+            assert Station.objects.filter(organization=organization).count() == 3
+
+    def test_seed_dataset_refreshes_caches_and_dashboard(self):
+        """Test sembrar renueva las versiones en caché y los meses del tablero"""
+        station = StationFactory()
+        table = table_version()
+
+        seed_dataset(
+            organizations=1,
+            stations_per_organization=2,
+            start=date(2024, 1, 1),
+            end=date(2024, 2, 29),
+            seed=7,
+        )
+
+        seeded = list(Station.objects.exclude(pk=station.pk).values_list("pk", flat=True))
+        assert table_version() != table
+        assert MonthlyRainfall.objects.filter(station__in=seeded).count() == 4
+        assert not MonthlyRainfall.objects.filter(station=station).exists()
+
+    def test_seed_dataset_contiguous_and_coherent(self):
+        """Test que las fechas son contiguas y day/month/year son coherentes"""
+        seed_dataset(
+            organizations=1,
+            stations_per_organization=2,
+            start=date(2023, 12, 30),
+            end=date(2024, 3, 2),
+            seed=7,
+        )
+
+        for station in Station.objects.all():
+            readings = list(
+                RainfallStation.objects.filter(station=station).order_by("registration_date")
+            )
+            assert len(readings) == 64
+            assert readings[0].registration_date == date(2023, 12, 30)
+            assert readings[-1].registration_date == date(2024, 3, 2)
+            for previous, current in zip(readings, readings[1:]):
+                assert (current.registration_date - previous.registration_date).days == 1
+            for reading in readings:
+                assert reading.day == reading.registration_date.day
+                assert reading.month == reading.registration_date.month
+                assert reading.year == reading.registration_date.year
+                assert reading.value >= 0
+
+    def test_seed_dataset_is_reproducible(self):
+        """Test que la misma semilla produce los mismos valores"""
+        options = {
+            "organizations": 1,
+            "stations_per_organization": 1,
+            "start": date(2024, 6, 1),
+            "end": date(2024, 6, 30),
+            "seed": 3,
+        }
+        seed_dataset(**options)
+        first = list(RainfallStation.objects.order_by("pk").values_list("value", flat=True))
+        RainfallStation.objects.all().delete()
+        seed_dataset(**options)
+        second = list(RainfallStation.objects.order_by("pk").values_list("value", flat=True))
+
+        assert first == second
+        assert any(value > 0 for value in first)
+
+
+@pytest.mark.django_db
+class TestRainfallCompleteness:
+    """Tests del motor de huecos y completitud"""
+
+    def test_seeded_series_is_complete(self):
+        """Test una serie contigua no tiene huecos y está completa al 100 %"""
+        seed_dataset(
+            organizations=1,
+            stations_per_organization=2,
+            start=date(2023, 12, 1),
+            end=date(2024, 1, 31),
+            seed=3,
+        )
+
+        report = completeness(date(2023, 12, 1), date(2024, 1, 31))
+
+        assert find_gaps(date(2023, 12, 1), date(2024, 1, 31)) == []
+        assert report["months"] == [date(2023, 12, 1), date(2024, 1, 1)]
+        assert [station["percent"] for station in report["stations"]] == [[100.0, 100.0]] * 2
+
+    def test_deleted_readings_are_gaps(self):
+        """Test las lecturas borradas aparecen como huecos y bajan el porcentaje"""
+        seed_dataset(
+            organizations=1,
+            stations_per_organization=1,
+            start=date(2024, 1, 1),
+            end=date(2024, 1, 31),
+            seed=3,
+        )
+        RainfallStation.objects.filter(
+            registration_date__range=(date(2024, 1, 10), date(2024, 1, 12))
+        ).delete()
+
+        (gap,) = find_gaps(date(2024, 1, 1), date(2024, 1, 31))
+        (station,) = completeness(date(2024, 1, 1), date(2024, 1, 31))["stations"]
+
+        assert (gap["start"], gap["end"], gap["days"]) == (date(2024, 1, 10), date(2024, 1, 12), 3)
+        assert station["reported"] == [28]
+
+
+@pytest.mark.django_db
+class TestRainfallQuality:
+    """Tests del control de calidad de lecturas de lluvia"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Configuración inicial para cada test"""
+        self.station = StationFactory(latitude="9.9300", longitude="-84.0800")
+        self.neighbors = [
+            StationFactory(latitude="9.9400", longitude="-84.0900"),
+            StationFactory(latitude="9.9500", longitude="-84.0700"),
+        ]
+        self.far = StationFactory(latitude="10.6300", longitude="-85.4400")
+
+    def reading(self, station, value, day=date(2024, 5, 1)):
+        return RainfallStation(station=station, registration_date=day, value=Decimal(value))
+
+    def test_negative_value(self):
+        """Test un valor negativo se marca como NEGATIVE"""
+        reading = self.reading(self.far, "-1.00")
+
+        assert check_readings([reading]) == 1
+        assert reading.qc_flags == QCFlag.NEGATIVE
+
+    def test_above_monthly_normal(self):
+        """Test un valor sobre la normal mensual del histórico se marca"""
+        RainfallHistory.objects.create(station=self.far, month=5, value=Decimal("120.00"))
+        readings = [self.reading(self.far, "119.00"), self.reading(self.far, "121.00")]
+
+        check_readings(readings)
+
+        assert [reading.qc_flags for reading in readings] == [0, QCFlag.ABOVE_NORMAL]
+
+    def test_minimum_threshold_without_history(self):
+        """Test sin histórico se aplica el umbral mínimo"""
+        readings = [self.reading(self.far, "50.00"), self.reading(self.far, "50.01")]
+
+        check_readings(readings)
+
+        assert [reading.qc_flags for reading in readings] == [0, QCFlag.ABOVE_NORMAL]
+
+    def test_spatial_jump(self):
+        """Test un salto frente a la mediana de las estaciones vecinas se marca"""
+        RainfallHistory.objects.create(station=self.station, month=5, value=Decimal("500.00"))
+        for neighbor in self.neighbors:
+            RainfallStationFactory(
+                station=neighbor, registration_date=date(2024, 5, 1), value=Decimal("10.00")
+            )
+        readings = [
+            self.reading(self.station, "90.00"),
+            self.reading(self.station, "80.00", day=date(2024, 5, 2)),
+        ]
+
+        check_readings(readings)
+
+        # El 2 de mayo ningún vecino reporta, así que no se compara.
+        assert [reading.qc_flags for reading in readings] == [QCFlag.SPATIAL_JUMP, 0]
+
+    def test_neighbors_in_same_batch(self):
+        """Test las lecturas vecinas del mismo lote cuentan para la mediana"""
+        readings = [self.reading(neighbor, "5.00") for neighbor in self.neighbors]
+        readings.append(self.reading(self.station, "85.00"))
+        RainfallHistory.objects.create(station=self.station, month=5, value=Decimal("500.00"))
+
+        check_readings(readings)
+
+        assert [reading.qc_flags for reading in readings] == [0, 0, QCFlag.SPATIAL_JUMP]
+
+    def test_coordinates_cached_until_a_station_changes(self, django_assert_num_queries):
+        """Test las coordenadas no se releen en cada lote y se renuevan al mover una estación"""
+        readings = [self.reading(neighbor, "5.00") for neighbor in self.neighbors]
+        readings.append(self.reading(self.station, "85.00"))
+        RainfallHistory.objects.create(station=self.station, month=5, value=Decimal("500.00"))
+        check_readings(readings)
+
+        # Normales y lecturas de los vecinos, sin leer la tabla de estaciones.
+        with django_assert_num_queries(2):
+            check_readings(readings)
+        self.neighbors[0].latitude, self.neighbors[0].longitude = "10.6400", "-85.4500"
+        self.neighbors[0].save()
+        check_readings(readings)
+
+        assert readings[-1].qc_flags == 0
+
+    def test_ingest_and_trusted(self):
+        """Test ingest guarda las marcas y trusted() excluye lecturas sospechosas"""
+        readings = [
+            self.reading(self.far, "12.00", day=date(2024, 5, day)) for day in range(1, 5)
+        ]
+        readings.append(self.reading(self.far, "-3.00", day=date(2024, 5, 5)))
+
+        assert ingest(readings, batch_size=2) == (5, 1)
+        assert RainfallStation.objects.count() == 5
+        assert RainfallStation.objects.trusted().count() == 4
+        assert RainfallStation.objects.get(registration_date=date(2024, 5, 5)).qc_flags == QCFlag.NEGATIVE
+
+    def test_recheck_stored_readings(self):
+        """Test recheck actualiza las marcas de lecturas ya guardadas"""
+        for day, value in [(1, "4.00"), (2, "-1.00"), (3, "70.00")]:
+            RainfallStationFactory(
+                station=self.far, registration_date=date(2024, 5, day), value=Decimal(value)
+            )
+
+        assert recheck(date(2024, 5, 1), date(2024, 5, 31), batch_size=8) == (3, 2)
+        assert list(
+            RainfallStation.objects.order_by("registration_date").values_list("qc_flags", flat=True)
+        ) == [0, QCFlag.NEGATIVE, QCFlag.ABOVE_NORMAL]
+
+
+@pytest.mark.django_db
+class TestRainfallStatistics:
+    """Tests de acumulados móviles, de temporada y SPI"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Configuración inicial para cada test"""
+        cache.clear()
+        self.station = StationFactory()
+        RainfallStation.objects.bulk_create(
+            RainfallStation(
+                station=self.station,
+                registration_date=date(2024, 1, day),
+                value=Decimal(day),
+            )
+            for day in range(1, 11)
+        )
+
+    def totals(self, start, end, windows):
+        (station,) = statistics.rolling([self.station.id], start, end, windows)["stations"]
+        return station["totals"]
+
+    def test_rolling_totals(self):
+        """Test los acumulados móviles suman los últimos N días"""
+        totals = self.totals(date(2024, 1, 9), date(2024, 1, 10), [1, 3])
+
+        assert totals == {1: [9.0, 10.0], 3: [24.0, 27.0]}
+
+    def test_rolling_requires_coverage(self):
+        """Test una ventana con pocos días reportados no tiene total"""
+        RainfallStation.objects.filter(registration_date=date(2024, 1, 9)).delete()
+
+        totals = self.totals(date(2024, 1, 10), date(2024, 1, 10), [3, 10])
+
+        # 2 de 3 días < 80 %, 9 de 10 días >= 80 %.
+        assert totals == {3: [None], 10: [46.0]}
+
+    def test_cumulative_resets_each_season(self):
+        """Test el acumulado de temporada vuelve a empezar en season_start"""
+        (station,) = statistics.cumulative(
+            [self.station.id], date(2024, 1, 4), date(2024, 1, 6), (1, 5)
+        )["stations"]
+
+        assert station["cumulative"] == [None, 5.0, 11.0]
+
+    def test_results_are_cached_per_station(self, django_assert_num_queries):
+        """Test la segunda consulta sale de la caché sin tocar la base de datos"""
+        self.totals(date(2024, 1, 10), date(2024, 1, 10), [3])
+
+        with django_assert_num_queries(0):
+            assert self.totals(date(2024, 1, 10), date(2024, 1, 10), [3]) == {3: [27.0]}
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda station: RainfallStation.objects.filter(
+                registration_date=date(2024, 1, 10)
+            ).update(value=Decimal("20.00")),
+            lambda station: RainfallStation.objects.get(
+                registration_date=date(2024, 1, 10)
+            ).delete(),
+            lambda station: RainfallStationFactory(
+                station=station, registration_date=date(2024, 1, 11), value=Decimal("5.00")
+            ),
+        ],
+        ids=["update", "delete", "save"],
+    )
+    def test_writes_invalidate_cache(self, write):
+        """Test cualquier escritura de lecturas de la estación invalida la caché"""
+        before = self.totals(date(2024, 1, 10), date(2024, 1, 11), [3])
+
+        write(self.station)
+
+        assert self.totals(date(2024, 1, 10), date(2024, 1, 11), [3]) != before
+
+    def test_commit_discards_reads_during_transaction(self, django_capture_on_commit_callbacks):
+        """Test lo que otra petición guarda en caché antes del commit no sobrevive al commit"""
+        day = date(2024, 1, 10)
+        params = {"start": day, "end": day, "windows": [3], "trusted": True}
+        stale = {self.station.id: {"id": self.station.id, "totals": {3: [27.0]}}}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                readings = RainfallStation.objects.filter(registration_date=day)
+                readings.update(value=Decimal("20.00"))
+                # Otra conexión aún ve la lectura anterior y la guarda con la versión vigente.
+                statistics.cached_per_station(
+                    "rolling", params, [self.station.id], lambda missing: stale
+                )
+
+        assert self.totals(day, day, [3]) == {3: [37.0]}
+
+    def test_spi(self):
+        """Test el SPI ordena los años de seco a lluvioso y centra la mediana en 0"""
+        RainfallStation.objects.bulk_create(
+            RainfallStation(
+                station=self.station,
+                registration_date=date(year, 3, day),
+                value=Decimal(year - 2009),
+            )
+            for year in range(2010, 2021)
+            for day in range(1, 32)
+        )
+
+        result = statistics.spi([self.station.id], date(2010, 3, 1), date(2020, 3, 31), 1)
+        (station,) = result["stations"]
+        march = [value for month, value in zip(result["months"], station["spi"]) if month.month == 3]
+
+        assert march == sorted(march)
+        assert abs(march[5]) < 0.3
+        assert march[0] < -1 < 1 < march[-1]
+        # Febrero no tiene lecturas: sin SPI.
+        assert station["spi"][-2] is None
+
+    def test_gamma_cdf(self):
+        """Test la función gamma incompleta coincide con las formas cerradas"""
+        x = np.array([0.1, 0.5, 1.0, 2.0, 5.0, 20.0])
+
+        assert np.allclose(statistics.gamma_cdf(x, 1), 1 - np.exp(-x))
+        assert np.allclose(statistics.gamma_cdf(x, 2), 1 - np.exp(-x) * (1 + x))
+
+
+@pytest.mark.django_db
+class TestRainfallPartitions:
+    """Tests para las particiones anuales de RainfallStation"""
+
+    def test_noop_without_postgresql(self):
+        """Test en SQLite la tabla no se particiona y las funciones no hacen nada"""
+        assert ensure_partitions([2024, 2025]) == []
+        assert drain_default_partition() == []
+        assert partition_stats() == []
+
+    def test_save_keeps_working(self):
+        """Test guardar lecturas de años nuevos no requiere particiones previas"""
+        rainfall = RainfallStationFactory(registration_date=date(1990, 3, 4))
+
+        assert RainfallStation.objects.get(pk=rainfall.pk).year == 1990
+
+
+@pytest.mark.django_db
+class TestRainfallOrganization:
+    """Tests de la organización copiada de la estación en RainfallStation"""
+
+    def test_copied_on_every_write_path(self):
+        """Test save, bulk_create y bulk_update copian la organización de la estación"""
+        station = StationFactory()
+        other = StationFactory()
+        saved = RainfallStationFactory(station=station)
+        (bulk,) = RainfallStation.objects.bulk_create(
+            [RainfallStation(station=station, registration_date=date(2022, 3, 5))]
+        )
+        bulk.station = other
+        RainfallStation.objects.bulk_update([bulk], ["station"])
+
+        assert saved.organization_id == station.organization_id
+        assert RainfallStation.objects.get(pk=bulk.pk).organization_id == other.organization_id
+
+    def test_follows_moved_station(self):
+        """Test mover una estación o una lectura actualiza la organización de las lecturas"""
+        station = StationFactory()
+        other = StationFactory()
+        first = RainfallStationFactory(station=station, registration_date=date(2024, 1, 1))
+        second = RainfallStationFactory(station=station, registration_date=date(2024, 1, 2))
+
+        station.organization = other.organization
+        station.save()
+        RainfallStation.objects.filter(pk=first.pk).update(station=StationFactory())
+        first.refresh_from_db()
+        second.refresh_from_db()
+
+        assert second.organization_id == other.organization_id
+        assert first.organization_id == first.station.organization_id != other.organization_id
+
+    def test_follows_station_queryset_writes(self):
+        """Test update y bulk_update de estaciones copian la organización a sus lecturas"""
+        station, moved = StationFactory(), StationFactory()
+        other, unchanged = StationFactory(), StationFactory()
+        readings = [
+            RainfallStationFactory(station=each, registration_date=date(2024, 1, 1))
+            for each in (station, moved, unchanged)
+        ]
+
+        Station.objects.filter(pk=station.pk).update(organization=other.organization)
+        moved.organization = other.organization
+        Station.objects.bulk_update([moved, unchanged], ["organization"])
+
+        assert [
+            RainfallStation.objects.get(pk=reading.pk).organization_id for reading in readings
+        ] == [other.organization_id, other.organization_id, unchanged.organization_id]
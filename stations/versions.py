@@ -0,0 +1,71 @@
+"""
+Per-station cache versions of the rainfall series.
+
+Anything cached from a station's readings includes the station's version in
+its key. Every write path of ``RainfallStation`` (model ``save``/``delete``
+and the queryset's ``update``/``delete``/``bulk_create``/``bulk_update``)
+calls ``invalidate``, which gives the station a new version, so stale entries
+are never read again and simply expire.
+
+A write inside a transaction is invisible to other connections until it
+commits, and a request computing statistics meanwhile caches the old rows
+under whatever version it saw. ``invalidate`` therefore bumps the version at
+once (for reads within the transaction) and again on commit, which orphans
+anything cached in between.
+
+The ``Station`` table itself has one version (``table_version``), renewed
+the same way by every write path of ``Station``, for what is cached from
+all stations at once.
+"""
+
+import uuid
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+VERSION_KEY = "rainfall-version:{}"
+TABLE_KEY = "station-table-version"
+
+
+def station_versions(station_ids):
+    """Current version of every station in ``station_ids``."""
+    keys = {VERSION_KEY.format(pk): pk for pk in station_ids}
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    # A version evicted from the cache is replaced, never reset, so entries
+    # cached under it cannot come back. ``add`` keeps a version another
+    # process set meanwhile; if ours is culled at once it is still unique.
+    for key, version in missing.items():
+        cache.add(key, version, timeout=None)
+    versions.update({**missing, **cache.get_many(missing)})
+    return {pk: versions[key] for key, pk in keys.items()}
+
+
+def bump(station_ids):
+    cache.set_many({VERSION_KEY.format(pk): uuid.uuid4().hex for pk in station_ids}, timeout=None)
+
+
+def invalidate(station_ids, using=DEFAULT_DB_ALIAS):
+    station_ids = {pk for pk in station_ids if pk is not None}
+    if station_ids:
+        bump(station_ids)
+        transaction.on_commit(lambda: bump(station_ids), using=using)
+
+
+def table_version():
+    """Current version of the ``Station`` table."""
+    version = cache.get(TABLE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(TABLE_KEY, version, timeout=None)
+        version = cache.get(TABLE_KEY, version)
+    return version
+
+
+def bump_table():
+    cache.set(TABLE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_table(using=DEFAULT_DB_ALIAS):
+    bump_table()
+    transaction.on_commit(bump_table, using=using)
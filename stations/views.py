@@ -1,3 +1,13 @@
-from django.shortcuts import render
+from core.async_views import AsyncReadOnlyView
+from stations.serializers import RainfallStationSerializer, StationSerializer
+from stations.viewsets import RainfallStationViewSet, StationViewSet
 
-# Create your views here.
+
+class StationAsyncView(AsyncReadOnlyView):
+    viewset_class = StationViewSet
+    serializer_class = StationSerializer
+
+
+class RainfallStationAsyncView(AsyncReadOnlyView):
+    viewset_class = RainfallStationViewSet
+    serializer_class = RainfallStationSerializer
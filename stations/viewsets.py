@@ -1,19 +1,37 @@
-from rest_framework import viewsets, filters
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 
+from organizations.scoping import OrganizationScopeFilter, scope_queryset
+from stations import completeness, quality, statistics, timeseries
+from stations.filters import RainfallStationFilter
 from stations.models import Station, EquipmentStation, RainfallStation
+from stations.renderers import NpzRenderer
 from stations.serializers import (
     StationSerializer,
     EquipmentStationSerializer,
     RainfallStationSerializer,
+    RainfallReportQuerySerializer,
+    RainfallBulkSerializer,
+    RainfallMatrixQuerySerializer,
+    RainfallStatisticsQuerySerializer,
 )
 
 
 class StationViewSet(viewsets.ModelViewSet):
-    queryset = Station.objects.all()
+    queryset = Station.objects.select_related("organization")
     serializer_class = StationSerializer
+    organization_field = "organization"
 
     filter_backends = [
+        OrganizationScopeFilter,
         DjangoFilterBackend,
         filters.OrderingFilter,
         filters.SearchFilter,
@@ -31,8 +49,10 @@ class StationViewSet(viewsets.ModelViewSet):
 class EquipmentStationViewSet(viewsets.ModelViewSet):
     queryset = EquipmentStation.objects.all()
     serializer_class = EquipmentStationSerializer
+    organization_field = "station__organization"
 
     filter_backends = [
+        OrganizationScopeFilter,
         DjangoFilterBackend,
         filters.OrderingFilter,
         filters.SearchFilter,
@@ -50,16 +70,160 @@ class EquipmentStationViewSet(viewsets.ModelViewSet):
 class RainfallStationViewSet(viewsets.ModelViewSet):
     queryset = RainfallStation.objects.all()
     serializer_class = RainfallStationSerializer
+    # The reading's own copy of the station's organization: no join.
+    organization_field = "organization"
 
     filter_backends = [
+        OrganizationScopeFilter,
         DjangoFilterBackend,
         filters.OrderingFilter,
         filters.SearchFilter,
     ]
-    filterset_fields = ["station", "month", "year"]
+    filterset_class = RainfallStationFilter
     ordering_fields = ["id", "registration_date", "created"]
 
     def paginate_queryset(self, queryset):
         if "paginator" in self.request.query_params:
             return None
         return super().paginate_queryset(queryset)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create many readings at once, quality-checked in batches."""
+        serializer = RainfallBulkSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        readings = [
+            RainfallStation(
+                station_id=item["station"],
+                registration_date=item["registration_date"],
+                value=item.get("value"),
+            )
+            for item in serializer.validated_data
+        ]
+        station_ids = {reading.station_id for reading in readings}
+        stations = scope_queryset(Station.objects.all(), request.user, "organization")
+        unknown = station_ids - set(
+            stations.filter(pk__in=station_ids).values_list("pk", flat=True)
+        )
+        if unknown:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={"station": [f"Unknown station ids: {sorted(unknown)}"]},
+            )
+        with transaction.atomic():
+            created, flagged = quality.ingest(readings)
+        return Response(
+            status=status.HTTP_201_CREATED, data={"created": created, "flagged": flagged}
+        )
+
+    @action(detail=False)
+    def completeness(self, request):
+        """Station × month matrix of days reported, in percent."""
+        query = RainfallReportQuerySerializer(
+            data=request.query_params, context={"request": request}
+        )
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data["start"], query.validated_data["end"]
+        data = completeness.completeness(start, end, query.stations())
+        return Response(status=status.HTTP_200_OK, data={"start": start, "end": end, **data})
+
+    @action(detail=False)
+    def gaps(self, request):
+        """Runs of consecutive days without a reading, per station."""
+        query = RainfallReportQuerySerializer(
+            data=request.query_params, context={"request": request}
+        )
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data["start"], query.validated_data["end"]
+        return Response(
+            status=status.HTTP_200_OK, data=completeness.find_gaps(start, end, query.stations()),
+        )
+
+    @action(detail=False, renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, NpzRenderer])
+    def matrix(self, request):
+        """
+        Dense station × date matrix of daily values in one response, as
+        columnar JSON or, with ``?format=npz``, a NumPy archive.
+        """
+        query = RainfallMatrixQuerySerializer(
+            data=request.query_params, context={"request": request}
+        )
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data["start"], query.validated_data["end"]
+        stations = query.stations()
+        error = self.too_many_cells(stations, start, end)
+        if error:
+            return error
+
+        matrix = timeseries.rainfall_matrix(start, end, stations, query.validated_data["trusted"])
+        if request.accepted_renderer.format == NpzRenderer.format:
+            return Response(status=status.HTTP_200_OK, data=matrix)
+        return Response(
+            status=status.HTTP_200_OK,
+            data={
+                "dates": np.datetime_as_string(matrix["dates"]).tolist(),
+                "stations": matrix["stations"].tolist(),
+                "shape": list(matrix["values"].shape),
+                # Row-major, null where there is no reading.
+                "values": np.where(matrix["mask"], None, matrix["values"]).ravel().tolist(),
+            },
+        )
+
+    def statistics_query(self, request):
+        """Validated statistics parameters and the selected station ids."""
+        query = RainfallStatisticsQuerySerializer(
+            data=request.query_params, context={"request": request}
+        )
+        query.is_valid(raise_exception=True)
+        stations = query.stations()
+        if stations is None:
+            stations = Station.objects.all()
+        return query.validated_data, list(stations.order_by("pk").values_list("pk", flat=True))
+
+    def too_many_cells(self, stations, start, end):
+        """
+        400 if the station × date matrix from ``start`` (the first day read,
+        look-back included) to ``end`` exceeds ``RAINFALL_MATRIX_MAX_CELLS``.
+        """
+        if timeseries.matrix_cells(start, end, stations) <= settings.RAINFALL_MATRIX_MAX_CELLS:
+            return None
+        return Response(
+            status=status.HTTP_400_BAD_REQUEST,
+            data={"end": [f"More than {settings.RAINFALL_MATRIX_MAX_CELLS} cells requested."]},
+        )
+
+    @action(detail=False)
+    def rolling(self, request):
+        """Rolling N-day totals (``?window=30&window=60``, 30/60/90 by default)."""
+        params, station_ids = self.statistics_query(request)
+        lookback = timedelta(days=max(params["window"]) - 1)
+        error = self.too_many_cells(station_ids, params["start"] - lookback, params["end"])
+        if error:
+            return error
+        data = statistics.rolling(
+            station_ids, params["start"], params["end"], params["window"], params["trusted"]
+        )
+        return Response(status=status.HTTP_200_OK, data=data)
+
+    @action(detail=False)
+    def cumulative(self, request):
+        """Season-to-date rainfall (``?season_start=MM-DD``)."""
+        params, station_ids = self.statistics_query(request)
+        # Read from the start of the season of ``start``.
+        first = statistics.season_first_day(params["start"], params["season_start"])
+        error = self.too_many_cells(station_ids, first, params["end"])
+        if error:
+            return error
+        data = statistics.cumulative(
+            station_ids, params["start"], params["end"], params["season_start"], params["trusted"]
+        )
+        return Response(status=status.HTTP_200_OK, data=data)
+
+    @action(detail=False)
+    def spi(self, request):
+        """Standardized precipitation index of ``?scale=`` months (3 by default)."""
+        params, station_ids = self.statistics_query(request)
+        data = statistics.spi(
+            station_ids, params["start"], params["end"], params["scale"], params["trusted"]
+        )
+        return Response(status=status.HTTP_200_OK, data=data)